@@ -2,44 +2,117 @@
 
 from __future__ import annotations
 
-from rointesdk.rointe_api import ApiResponse, RointeAPI
+from datetime import timedelta
+from functools import partial
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-
-from .const import CONF_INSTALLATION, CONF_PASSWORD, CONF_USERNAME, DOMAIN, PLATFORMS
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    CONF_ENERGY_REFRESH_INTERVAL,
+    CONF_INSTALLATION,
+    CONF_PASSWORD,
+    CONF_STREAMING,
+    CONF_USERNAME,
+    DEFAULT_ENERGY_REFRESH_INTERVAL,
+    DOMAIN,
+    PLATFORMS,
+    STATISTICS_IMPORT_INTERVAL,
+)
 from .coordinator import RointeDataUpdateCoordinator
 from .device_manager import RointeDeviceManager
+from .hub import async_acquire_hub, async_release_hub
+from .services import async_setup_services
+from .snapshot import RointeSnapshotStore
+from .statistics import RointeStatisticsImporter
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Rointe Heaters from a config entry."""
 
-    rointe_api = RointeAPI(entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD])
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Rointe Heaters services."""
+
+    async_setup_services(hass)
+    return True
 
-    # Login to the Rointe API.
-    login_result: ApiResponse = await hass.async_add_executor_job(
-        rointe_api.initialize_authentication
-    )
 
-    if not login_result.success:
-        raise ConfigEntryNotReady("Unable to connect to the Rointe API")
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Rointe Heaters from a config entry."""
+
+    hub = async_acquire_hub(hass, entry)
+    entry.async_on_unload(partial(async_release_hub, hass, entry))
 
     rointe_device_manager = RointeDeviceManager(
         username=entry.data[CONF_USERNAME],
         password=entry.data[CONF_PASSWORD],
         installation_id=entry.data[CONF_INSTALLATION],
         hass=hass,
-        rointe_api=rointe_api,
+        rointe_api=hub.rointe_api,
+        firmware_cache=hub.firmware_cache,
+        request_scheduler=hub.request_scheduler,
     )
 
-    rointe_coordinator = RointeDataUpdateCoordinator(hass, rointe_device_manager)
+    rointe_coordinator = RointeDataUpdateCoordinator(
+        hass,
+        rointe_device_manager,
+        energy_interval=timedelta(
+            minutes=entry.options.get(
+                CONF_ENERGY_REFRESH_INTERVAL, DEFAULT_ENERGY_REFRESH_INTERVAL
+            )
+        ),
+        streaming=entry.options.get(CONF_STREAMING, False),
+        snapshot_store=RointeSnapshotStore(hass, entry.entry_id),
+    )
+
+    # Create the entities from the last known state if there's one, so startup
+    # doesn't wait on the cloud.
+    restored = await rointe_coordinator.async_restore_snapshot()
+
+    if not restored:
+        # Authenticate with the stored refresh token, or log in if there's none.
+        if await hub.rointe_api.async_get_auth_token() is None:
+            if hub.rointe_api.credentials_rejected:
+                raise ConfigEntryAuthFailed("Rointe rejected the account's password")
+
+            raise ConfigEntryNotReady("Unable to connect to the Rointe API")
+
+        await rointe_coordinator.async_config_entry_first_refresh()
 
-    await rointe_coordinator.async_config_entry_first_refresh()
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = rointe_coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if restored:
+        entry.async_create_background_task(
+            hass, rointe_coordinator.async_refresh(), "rointe first refresh"
+        )
+
+    if "recorder" in hass.config.components:
+        statistics_importer = RointeStatisticsImporter(hass, rointe_device_manager)
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, statistics_importer.async_import, STATISTICS_IMPORT_INTERVAL
+            )
+        )
+        entry.async_create_background_task(
+            hass, statistics_importer.async_import(), "rointe statistics import"
+        )
+
+    loaded_options = dict(entry.options)
+
+    async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Reload the config entry when its options change."""
+
+        # Entry data updates, such as new tokens, don't need a reload.
+        if entry.options != loaded_options:
+            await hass.config_entries.async_reload(entry.entry_id)
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
     return True
 
 
@@ -50,3 +123,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored device snapshot of a deleted entry."""
+
+    await RointeSnapshotStore(hass, entry.entry_id).async_remove()
@@ -0,0 +1,671 @@
+"""Asyncio client for the Rointe cloud API."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+import re
+from typing import Any
+
+import aiohttp
+from rointesdk.device import RointeDevice, ScheduleMode
+from rointesdk.dto import EnergyConsumptionData
+from rointesdk.rointe_api import ApiResponse
+from rointesdk.settings import (
+    AUTH_TIMEOUT_SECONDS,
+    ENERGY_STATS_MAX_TRIES,
+    FIREBASE_DEFAULT_URL,
+    FIREBASE_DEVICE_DATA_PATH_BY_ID,
+    FIREBASE_DEVICE_ENERGY_PATH_BY_ID,
+    FIREBASE_DEVICES_PATH_BY_ID,
+    FIREBASE_GLOBAL_SETTINGS_PATH,
+    FIREBASE_INSTALLATIONS_PATH,
+)
+from rointesdk.utils import build_update_map
+
+from homeassistant.util import dt as dt_util
+
+from .auth import RointeTokenManager
+from .const import DEVICES_CACHE_TTL, INSTALLATIONS_CACHE_TTL
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=AUTH_TIMEOUT_SECONDS)
+
+NO_ENERGY_STATS = "No energy stats found."
+
+# Hours read when only the latest energy stats are needed. The last hour is
+# usually still in progress.
+ENERGY_STATS_LATEST_HOURS = 2
+
+FIREBASE_DEVICES_PATH = "/devices.json"
+
+# Errors worth retrying: network errors, timeouts, throttling and server errors.
+TRANSIENT_ERROR_PATTERN = re.compile(
+    r"^(Network|Communications) error|timed out$|returned:? (429|5\d\d)$"
+    r"|held back while throttled$"
+)
+
+# Firebase rejects queries it can't run, like those on a field without an
+# index, with a 400.
+REJECTED_QUERY_PATTERN = re.compile(r"returned 400$")
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Return the delay of a `Retry-After` header, in seconds."""
+
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (IndexError, TypeError, ValueError):
+        return None
+
+    # Dates in the `-0000` zone are parsed as naive, but they're UTC.
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=dt_util.UTC)
+
+    return max((retry_at - dt_util.utcnow()).total_seconds(), 0)
+
+
+def is_throttled(response: ApiResponse) -> bool:
+    """Return True if a failed response was throttled by the cloud.
+
+    The data of a throttled response is the `Retry-After` delay, if any.
+    """
+
+    return (
+        not response.success
+        and bool(response.error_message)
+        and response.error_message.endswith(str(HTTPStatus.TOO_MANY_REQUESTS.value))
+    )
+
+
+def is_transient_error(response: ApiResponse) -> bool:
+    """Return True if a failed response may succeed when retried."""
+
+    return not response.success and bool(
+        response.error_message
+        and TRANSIENT_ERROR_PATTERN.search(response.error_message)
+    )
+
+
+def is_rejected_query(response: ApiResponse) -> bool:
+    """Return True if the cloud refused to run a query."""
+
+    return not response.success and bool(
+        response.error_message and REJECTED_QUERY_PATTERN.search(response.error_message)
+    )
+
+
+def _sync_timestamp() -> int:
+    """Return the value for the `last_sync_datetime_app` field."""
+    return round(dt_util.utcnow().timestamp() * 1000)
+
+
+def temp_body(new_temp: float) -> dict[str, Any]:
+    """Return the data node update setting a target temperature."""
+    return {"temp": new_temp, "mode": "manual", "power": True}
+
+
+def preset_body(device: RointeDevice, preset_mode: str) -> dict[str, Any]:
+    """Return the data node update setting a preset."""
+
+    preset_temps = {
+        "comfort": device.comfort_temp,
+        "eco": device.eco_temp,
+        "ice": device.ice_temp,
+    }
+
+    if preset_mode not in preset_temps:
+        return {}
+
+    return {
+        "power": True,
+        "mode": "manual",
+        "temp": preset_temps[preset_mode],
+        "status": preset_mode,
+    }
+
+
+class RointeAsyncAPI:
+    """Rointe API client running on the event loop.
+
+    Implements the subset of `rointesdk.rointe_api.RointeAPI` used by the
+    integration on top of an aiohttp session, returning the same `ApiResponse`s.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        token_manager: RointeTokenManager,
+        base_url: str = FIREBASE_DEFAULT_URL,
+    ) -> None:
+        """Initialize the API client.
+
+        `base_url` points the client at a different Firebase database, such as a
+        local stand-in for profiling.
+        """
+
+        self.session = session
+        self.token_manager = token_manager
+        self.base_url = base_url
+
+        # The installations are read in one request for all installations of the
+        # account, which is shared by concurrent calls and briefly reused.
+        self._installations: ApiResponse | None = None
+        self._installations_fetched_at: datetime | None = None
+        self._installations_request: asyncio.Future[ApiResponse] | None = None
+
+        # The same goes for the bulk device reads of the polls.
+        self._devices: ApiResponse | None = None
+        self._devices_fetched_at: datetime | None = None
+        self._devices_request: asyncio.Future[ApiResponse] | None = None
+        self._writes = 0
+
+    @property
+    def local_id(self) -> str | None:
+        """Return the Firebase user ID of the account."""
+        return self.token_manager.local_id
+
+    @property
+    def credentials_rejected(self) -> bool:
+        """Return True if the cloud rejected the account's password."""
+        return self.token_manager.credentials_rejected
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> tuple[int, Any]:
+        """Send a request and return its status code and decoded JSON body.
+
+        The body of a throttled request is its `Retry-After` delay instead.
+        """
+
+        async with self.session.request(
+            method, url, timeout=REQUEST_TIMEOUT, **kwargs
+        ) as response:
+            if response.status == HTTPStatus.TOO_MANY_REQUESTS:
+                return response.status, _parse_retry_after(
+                    response.headers.get("Retry-After")
+                )
+
+            if response.status != 200:
+                return response.status, None
+
+            return response.status, await response.json(content_type=None)
+
+    async def initialize_authentication(self) -> ApiResponse:
+        """Log in with the account's username and password."""
+        return await self.token_manager.async_login()
+
+    def is_logged_in(self) -> bool:
+        """Check if the login was successful."""
+        return self.token_manager.is_logged_in()
+
+    async def async_get_auth_token(self) -> str | None:
+        """Return a valid authentication token, refreshing it if needed."""
+        return await self.token_manager.async_get_auth_token()
+
+    async def _get(self, path: str, name: str, **params: str) -> ApiResponse:
+        """Authenticated GET on a Firebase path."""
+
+        if not (auth_token := await self.async_get_auth_token()):
+            return ApiResponse(False, None, "Invalid authentication.")
+
+        try:
+            status, response_json = await self._request(
+                "GET",
+                f"{self.base_url}{path}",
+                params={"auth": auth_token, **params},
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return ApiResponse(False, None, f"Network error {e}")
+
+        if status == HTTPStatus.TOO_MANY_REQUESTS:
+            return ApiResponse(False, response_json, f"{name}() returned {status}")
+
+        if status != 200:
+            return ApiResponse(False, None, f"{name}() returned {status}")
+
+        return ApiResponse(True, response_json, None)
+
+    async def _patch(
+        self, path: str, body: dict[str, Any], stamp: bool = True
+    ) -> ApiResponse:
+        """Authenticated PATCH on a Firebase path."""
+
+        if not (auth_token := await self.async_get_auth_token()):
+            return ApiResponse(False, None, "Invalid authentication.")
+
+        if stamp:
+            body["last_sync_datetime_app"] = _sync_timestamp()
+
+        # Device reads from before the write are no longer shared.
+        self._writes += 1
+        self._devices_fetched_at = None
+
+        try:
+            status, response_json = await self._request(
+                "PATCH",
+                f"{self.base_url}{path}",
+                params={"auth": auth_token},
+                json=body,
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return ApiResponse(False, None, f"Communications error {e}")
+
+        if status == HTTPStatus.TOO_MANY_REQUESTS:
+            return ApiResponse(False, response_json, f"PATCH {path} returned {status}")
+
+        if status != 200:
+            return ApiResponse(False, None, f"PATCH {path} returned {status}")
+
+        return ApiResponse(True, None, None)
+
+    async def _get_user_installations(self, name: str) -> ApiResponse:
+        """Retrieve the raw installations owned by the user."""
+
+        if (
+            self._installations is not None
+            and self._installations_fetched_at is not None
+            and dt_util.utcnow() - self._installations_fetched_at
+            < INSTALLATIONS_CACHE_TTL
+        ):
+            return self._installations
+
+        if self._installations_request is None:
+            self._installations_request = asyncio.ensure_future(
+                self._fetch_user_installations(name)
+            )
+
+        request = self._installations_request
+
+        try:
+            response = await asyncio.shield(request)
+        finally:
+            if self._installations_request is request and request.done():
+                self._installations_request = None
+
+        return response
+
+    async def _fetch_user_installations(self, name: str) -> ApiResponse:
+        """Request the raw installations owned by the user."""
+
+        response = await self._get(
+            FIREBASE_INSTALLATIONS_PATH,
+            name,
+            orderBy='"userid"',
+            equalTo=f'"{self.local_id}"',
+        )
+
+        if response.success and not response.data:
+            return ApiResponse(False, None, "No Rointe installations found.")
+
+        if response.success:
+            self._installations = response
+            self._installations_fetched_at = dt_util.utcnow()
+
+        return response
+
+    async def get_installations(self) -> ApiResponse:
+        """Retrieve the client's installations."""
+
+        response = await self._get_user_installations("get_installations")
+
+        if not response.success:
+            return response
+
+        return ApiResponse(
+            True,
+            {key: value["location"] for key, value in response.data.items()},
+            None,
+        )
+
+    async def get_installation_by_id(self, installation_id: str) -> ApiResponse:
+        """Retrieve a specific installation by ID."""
+
+        response = await self._get_user_installations("get_installation_by_id")
+
+        if not response.success:
+            return response
+
+        if installation_id not in response.data:
+            return ApiResponse(False, None, "No Rointe installation found.")
+
+        return ApiResponse(True, response.data[installation_id], None)
+
+    async def get_installation_devices(self, installation_id: str) -> ApiResponse:
+        """Retrieve all devices present in an installation."""
+
+        installation_response = await self.get_installation_by_id(installation_id)
+
+        if not installation_response.success:
+            return installation_response
+
+        detected_devices: list[str] = []
+
+        for zone_data in installation_response.data["zones"].values():
+            detected_devices.extend(self._extract_devices(zone_data))
+
+        return ApiResponse(True, detected_devices, None)
+
+    def _extract_devices(self, zone_data: dict[str, Any]) -> list[str]:
+        """Parse a single zone block recursively."""
+
+        if not zone_data:
+            return []
+
+        zone_devices: list[str] = []
+
+        if devices := zone_data.get("devices"):
+            zone_devices.extend(list(devices.keys()))
+
+        if sub_zones := zone_data.get("zones"):
+            for sub_zone_data in sub_zones.values():
+                zone_devices.extend(self._extract_devices(sub_zone_data))
+
+        return zone_devices
+
+    async def get_latest_firmware(self) -> ApiResponse:
+        """Retrieve the latest firmware available for each device type."""
+
+        response = await self._get(FIREBASE_GLOBAL_SETTINGS_PATH, "get_latest_firmware")
+
+        if not response.success:
+            return response
+
+        if not response.data:
+            return ApiResponse(False, None, "Global Settings is empty.")
+
+        return ApiResponse(True, build_update_map(response.data), None)
+
+    async def get_device(self, device_id: str) -> ApiResponse:
+        """Retrieve device data."""
+
+        return await self._get(
+            FIREBASE_DEVICES_PATH_BY_ID.format(device_id), "get_device"
+        )
+
+    async def get_device_data(self, device_id: str) -> ApiResponse:
+        """Retrieve the data node of a device, without its firmware and hardware info."""
+
+        return await self._get(
+            FIREBASE_DEVICE_DATA_PATH_BY_ID.format(device_id), "get_device_data"
+        )
+
+    async def get_devices(
+        self, device_ids: list[str], shared: bool = False
+    ) -> ApiResponse:
+        """Retrieve the data of several devices of the user in one request.
+
+        Queries the devices node by owner, the same way installations are read.
+        The data maps each of the requested device IDs that was returned to its
+        data, so devices missing from it have to be read on their own.
+
+        Device documents don't say which installation they belong to, so the
+        query returns the devices of every installation of the account. With
+        `shared` set, a read in flight or from the last `DEVICES_CACHE_TTL` is
+        reused instead, so installations of the same account polling together
+        make a single request. Otherwise each read carries the devices of the
+        whole account, which is still one request instead of one per device.
+        """
+
+        if shared:
+            response = await self._get_user_devices()
+        else:
+            response = await self._fetch_user_devices()
+
+        if not response.success:
+            return response
+
+        return ApiResponse(
+            True,
+            {
+                device_id: device_data
+                for device_id, device_data in (response.data or {}).items()
+                if device_id in device_ids and device_data
+            },
+            None,
+        )
+
+    async def _get_user_devices(self) -> ApiResponse:
+        """Retrieve the raw devices owned by the user, sharing recent reads."""
+
+        if (
+            self._devices is not None
+            and self._devices_fetched_at is not None
+            and dt_util.utcnow() - self._devices_fetched_at < DEVICES_CACHE_TTL
+        ):
+            return self._devices
+
+        if self._devices_request is None:
+            self._devices_request = asyncio.ensure_future(self._fetch_user_devices())
+
+        request = self._devices_request
+
+        try:
+            response = await asyncio.shield(request)
+        finally:
+            if self._devices_request is request and request.done():
+                self._devices_request = None
+
+        return response
+
+    async def _fetch_user_devices(self) -> ApiResponse:
+        """Request the raw devices owned by the user."""
+
+        fetched_at = dt_util.utcnow()
+        writes = self._writes
+        response = await self._get(
+            FIREBASE_DEVICES_PATH,
+            "get_devices",
+            orderBy='"userid"',
+            equalTo=f'"{self.local_id}"',
+        )
+
+        if response.success and writes == self._writes:
+            self._devices = response
+            self._devices_fetched_at = fetched_at
+
+        return response
+
+    async def get_latest_energy_stats(self, device_id: str) -> ApiResponse:
+        """Retrieve the latest energy consumption values.
+
+        Only the last `ENERGY_STATS_LATEST_HOURS` hours of today's stats are
+        requested, and the newest complete one with values is returned. If
+        there's none, the rest of the day is read, then yesterday. Stats older
+        than `ENERGY_STATS_MAX_TRIES` hours are ignored.
+        """
+
+        now = dt_util.now()
+        oldest_start = now.replace(minute=0, second=0, microsecond=0) - timedelta(
+            hours=ENERGY_STATS_MAX_TRIES - 1
+        )
+
+        days = [now.date()]
+
+        if oldest_start.date() != now.date():
+            days.append(oldest_start.date())
+
+        for day in days:
+            response = await self.get_day_energy_stats(device_id, day, latest=True)
+
+            if not response.success:
+                return response
+
+            complete = [stats for stats in response.data if stats.end <= now]
+
+            if not complete and (
+                day != now.date() or now.hour >= ENERGY_STATS_LATEST_HOURS
+            ):
+                # The latest hours have no values yet, but earlier ones may.
+                response = await self.get_day_energy_stats(device_id, day)
+
+                if not response.success:
+                    return response
+
+                complete = [stats for stats in response.data if stats.end <= now]
+
+            if complete:
+                if complete[-1].start < oldest_start:
+                    break
+
+                return ApiResponse(True, complete[-1], None)
+
+        return ApiResponse(False, None, NO_ENERGY_STATS)
+
+    async def get_day_energy_stats(
+        self, device_id: str, day: date, latest: bool = False
+    ) -> ApiResponse:
+        """Retrieve the hourly energy stats of a device for a given day.
+
+        The data is a list of `EnergyConsumptionData`, one per hour with values,
+        sorted by start time. Days without values return an empty list. With
+        `latest` set only the last `ENERGY_STATS_LATEST_HOURS` hours are requested.
+        """
+
+        # Sample path /history_statistics/device_id/daily/2022/01/21/energy.json
+        path = "{}{}/energy.json".format(
+            FIREBASE_DEVICE_ENERGY_PATH_BY_ID.format(device_id),
+            day.strftime("%Y/%m/%d"),
+        )
+
+        if latest:
+            # Hours are keyed as HH0000, so key order is time order.
+            response = await self._get(
+                path,
+                "get_day_energy_stats",
+                orderBy='"$key"',
+                limitToLast=str(ENERGY_STATS_LATEST_HOURS),
+            )
+        else:
+            response = await self._get(path, "get_day_energy_stats")
+
+        if not response.success:
+            return response
+
+        day_start = dt_util.start_of_local_day(day)
+        created = dt_util.now()
+        stats = []
+
+        for key, values in sorted((response.data or {}).items()):
+            if not values or "kw_h" not in values:
+                continue
+
+            try:
+                # Hours are keyed as HH0000, in local time.
+                start = day_start.replace(hour=int(key[:2]))
+            except ValueError:
+                continue
+
+            stats.append(
+                EnergyConsumptionData(
+                    created=created,
+                    start=start,
+                    end=start + timedelta(hours=1),
+                    kwh=float(values["kw_h"]),
+                    effective_power=float(values.get("effective_power", 0)),
+                )
+            )
+
+        return ApiResponse(True, stats, None)
+
+    async def set_device_temp(
+        self, device: RointeDevice, new_temp: float
+    ) -> ApiResponse:
+        """Set the device target temperature."""
+
+        return await self._patch(
+            FIREBASE_DEVICE_DATA_PATH_BY_ID.format(device.id), temp_body(new_temp)
+        )
+
+    async def set_device_preset(
+        self, device: RointeDevice, preset_mode: str
+    ) -> ApiResponse:
+        """Set the preset."""
+
+        return await self._patch(
+            FIREBASE_DEVICE_DATA_PATH_BY_ID.format(device.id),
+            preset_body(device, preset_mode),
+        )
+
+    async def set_devices_data(self, bodies: dict[str, dict[str, Any]]) -> ApiResponse:
+        """Update the data node of several devices in one multi-path PATCH.
+
+        `bodies` maps each device ID to the body it would get on its own.
+        """
+
+        timestamp = _sync_timestamp()
+        body: dict[str, Any] = {}
+
+        for device_id, device_body in bodies.items():
+            for key, value in {
+                **device_body,
+                "last_sync_datetime_app": timestamp,
+            }.items():
+                body[f"devices/{device_id}/data/{key}"] = value
+
+        return await self._patch("/.json", body, stamp=False)
+
+    async def set_device_mode(
+        self, device: RointeDevice, hvac_mode: str
+    ) -> ApiResponse:
+        """Set the HVAC mode."""
+
+        path = FIREBASE_DEVICE_DATA_PATH_BY_ID.format(device.id)
+
+        if hvac_mode == "off":
+            # This depends if the device is in Auto or Manual modes.
+            if device.mode == "auto":
+                return await self._patch(
+                    path, {"power": False, "mode": "auto", "status": "off"}
+                )
+
+            # When turning the device off, we need to set the temperature first.
+            response = await self._patch(path, {"temp": 20})
+
+            if not response.success:
+                return response
+
+            # Then we can turn the device off.
+            return await self._patch(
+                path, {"power": False, "mode": "manual", "status": "off"}
+            )
+
+        if hvac_mode == "heat":
+            response = await self._patch(path, {"temp": device.comfort_temp})
+
+            if not response.success:
+                return response
+
+            return await self._patch(
+                path, {"mode": "manual", "power": True, "status": "none"}
+            )
+
+        if hvac_mode == "auto":
+            current_mode: ScheduleMode = device.get_current_schedule_mode()
+
+            # When changing modes we need to send the proper temperature also.
+            if current_mode == ScheduleMode.COMFORT:
+                body = {"temp": device.comfort_temp}
+            elif current_mode == ScheduleMode.ECO:
+                body = {"temp": device.eco_temp}
+            elif device.ice_mode:
+                body = {"temp": device.ice_temp}
+            else:
+                body = {"temp": 20}
+
+            response = await self._patch(path, body)
+
+            if not response.success:
+                return response
+
+            # and then set AUTO mode.
+            return await self._patch(path, {"mode": "auto", "power": True})
+
+        return ApiResponse(False, None, f"Invalid HVAC Mode {hvac_mode}.")
@@ -0,0 +1,374 @@
+"""Authentication token manager for the Rointe cloud API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import Any
+
+import aiohttp
+from rointesdk.rointe_api import ApiResponse
+from rointesdk.settings import (
+    AUTH_HOST,
+    AUTH_REFRESH_ENDPOINT,
+    AUTH_TIMEOUT_SECONDS,
+    AUTH_VERIFY_URL,
+    FIREBASE_APP_KEY,
+)
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import AUTH_RETRY_MAX, AUTH_RETRY_MIN, LOGGER, TOKEN_REFRESH_MARGIN
+
+AUTH_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=AUTH_TIMEOUT_SECONDS)
+
+TokenUpdateCallback = Callable[[str, str], None]
+
+# Firebase errors of a login with a wrong email or password. Firebase answers
+# other errors, such as TOO_MANY_ATTEMPTS_TRY_LATER, with a 400 as well.
+CREDENTIALS_ERRORS = (
+    "EMAIL_NOT_FOUND",
+    "INVALID_PASSWORD",
+    "INVALID_LOGIN_CREDENTIALS",
+)
+
+
+class RointeTokenManager:
+    """Keep a valid Firebase ID token for the Rointe API.
+
+    The ID token is refreshed on the event loop `TOKEN_REFRESH_MARGIN` ahead of its
+    expiry, on a timer and whenever it's requested within that margin. Concurrent
+    requests share a single renewal, and its outcome.
+
+    After a failed renewal no new one is attempted for `AUTH_RETRY_MIN`, doubling
+    with each consecutive failure up to `AUTH_RETRY_MAX`. If Firebase rejects the
+    password, `credentials_rejected` is set and no login is attempted again until
+    the password is updated.
+
+    The password is only used when there's no refresh token or Firebase rejects
+    it. `on_token_update` is called with the refresh token and local ID whenever
+    they change, so they can be persisted.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        username: str,
+        password: str,
+        refresh_token: str | None = None,
+        local_id: str | None = None,
+        on_token_update: TokenUpdateCallback | None = None,
+    ) -> None:
+        """Initialize the token manager."""
+        self.hass = hass
+        self.session = session
+        self.username = username
+        self.password = password
+        self.refresh_token = refresh_token
+        self.local_id = local_id
+        self.on_token_update = on_token_update
+
+        self.auth_token: str | None = None
+        self.auth_token_expire_date: datetime | None = None
+
+        self.credentials_rejected = False
+
+        self._lock = asyncio.Lock()
+        self._renewal: asyncio.Future[None] | None = None
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+
+        # Consecutive failed renewals, and when the next one may be attempted.
+        self._failures = 0
+        self._retry_at: datetime | None = None
+
+    def is_logged_in(self) -> bool:
+        """Check if the login was successful."""
+        return self.auth_token is not None and self.refresh_token is not None
+
+    def _token_is_valid(self) -> bool:
+        """Return True if the ID token hasn't expired."""
+        return (
+            self.auth_token is not None
+            and self.auth_token_expire_date is not None
+            and self.auth_token_expire_date > dt_util.utcnow()
+        )
+
+    def _token_is_fresh(self) -> bool:
+        """Return True if the ID token is valid beyond the refresh margin."""
+        return (
+            self.auth_token is not None
+            and self.auth_token_expire_date is not None
+            and self.auth_token_expire_date - TOKEN_REFRESH_MARGIN > dt_util.utcnow()
+        )
+
+    async def async_get_auth_token(self) -> str | None:
+        """Return a valid ID token, refreshing it first if needed.
+
+        Returns None if there's no valid token and it can't be renewed now.
+        """
+
+        if self._token_is_fresh():
+            return self.auth_token
+
+        if self.credentials_rejected or (
+            self._retry_at is not None and dt_util.utcnow() < self._retry_at
+        ):
+            return self.auth_token if self._token_is_valid() else None
+
+        if self._renewal is None or self._renewal.done():
+            self._renewal = asyncio.ensure_future(self._async_renew())
+
+        renewal = self._renewal
+
+        try:
+            await asyncio.shield(renewal)
+        finally:
+            if self._renewal is renewal and renewal.done():
+                self._renewal = None
+
+        return self.auth_token if self._token_is_valid() else None
+
+    async def async_login(self) -> ApiResponse:
+        """Log in with the username and password."""
+
+        async with self._lock:
+            return await self._async_login()
+
+    @callback
+    def async_update_password(self, password: str) -> None:
+        """Use a new password, allowing logins again if the old one was rejected."""
+
+        self.password = password
+        self.credentials_rejected = False
+        self._failures = 0
+        self._retry_at = None
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the scheduled token refresh."""
+
+        if self._unsub_refresh:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+    async def _async_renew(self) -> None:
+        """Refresh the ID token, logging in again if the refresh token is rejected."""
+
+        async with self._lock:
+            # A login may have completed while we waited.
+            if self._token_is_fresh():
+                return
+
+            result = await self._async_renew_token()
+
+        if result.success:
+            return
+
+        if self.credentials_rejected:
+            LOGGER.error("Rointe rejected the password of %s", self.username)
+            return
+
+        delay = min(AUTH_RETRY_MIN * 2**self._failures, AUTH_RETRY_MAX)
+        self._failures += 1
+        self._retry_at = dt_util.utcnow() + delay
+
+        LOGGER.warning(
+            "Unable to renew the authentication token, retrying in %s: %s",
+            delay,
+            result.error_message,
+        )
+
+    async def _async_renew_token(self) -> ApiResponse:
+        """Exchange the refresh token, or the password if rejected, for an ID token."""
+
+        if self.refresh_token:
+            result = await self._async_refresh()
+
+            # Only log in again if Firebase rejected the refresh token.
+            if result.success or result.data not in (400, 401, 403):
+                return result
+
+            LOGGER.debug("Refresh token rejected, logging in again")
+
+        return await self._async_login()
+
+    async def _async_login(self) -> ApiResponse:
+        """Exchange the username and password for an ID token.
+
+        A failed response carries the HTTP status as data if Firebase answered.
+        """
+
+        payload = {
+            "email": self.username,
+            "password": self.password,
+            "returnSecureToken": "true",
+        }
+
+        try:
+            status, response_json = await self._request(
+                f"{AUTH_HOST}{AUTH_VERIFY_URL}?key={FIREBASE_APP_KEY}", payload
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return ApiResponse(False, None, f"Network error {e}")
+
+        if status != 200:
+            error = _firebase_error(response_json)
+
+            if status == HTTPStatus.BAD_REQUEST and error in CREDENTIALS_ERRORS:
+                self._clear_tokens()
+                self.credentials_rejected = True
+
+            error_message = f"Authentication returned: {status}"
+
+            if error:
+                error_message += f" ({error})"
+
+            return ApiResponse(False, status, error_message)
+
+        if not response_json or "idToken" not in response_json:
+            return ApiResponse(
+                False, None, "Authentication returned invalid or empty response"
+            )
+
+        self._set_tokens(
+            response_json["idToken"],
+            response_json["refreshToken"],
+            int(response_json["expiresIn"]),
+            response_json["localId"],
+        )
+
+        return ApiResponse(True, None, None)
+
+    async def _async_refresh(self) -> ApiResponse:
+        """Exchange the refresh token for a new ID token.
+
+        A failed response carries the HTTP status as data if Firebase answered.
+        """
+
+        payload = {"grant_type": "refresh_token", "refresh_token": self.refresh_token}
+
+        try:
+            status, response_json = await self._request(
+                f"{AUTH_REFRESH_ENDPOINT}?key={FIREBASE_APP_KEY}", payload
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return ApiResponse(False, None, f"Network error {e}")
+
+        if status != 200 or not response_json or "id_token" not in response_json:
+            return ApiResponse(False, status, f"Token refresh returned: {status}")
+
+        self._set_tokens(
+            response_json["id_token"],
+            response_json["refresh_token"],
+            int(response_json["expires_in"]),
+            response_json.get("user_id", self.local_id),
+        )
+
+        return ApiResponse(True, None, None)
+
+    async def _request(self, url: str, payload: dict[str, Any]) -> tuple[int, Any]:
+        """Post to an auth endpoint and return the status code and JSON body."""
+
+        async with self.session.post(
+            url, data=payload, timeout=AUTH_REQUEST_TIMEOUT
+        ) as response:
+            if response.status != 200:
+                # Firebase Auth explains its errors in the body.
+                try:
+                    return response.status, await response.json(content_type=None)
+                except ValueError:
+                    return response.status, None
+
+            return response.status, await response.json(content_type=None)
+
+    def _set_tokens(
+        self, auth_token: str, refresh_token: str, expires_in: int, local_id: str
+    ) -> None:
+        """Store new tokens and schedule the next refresh."""
+
+        tokens_changed = (refresh_token, local_id) != (
+            self.refresh_token,
+            self.local_id,
+        )
+
+        self.auth_token = auth_token
+        self.auth_token_expire_date = dt_util.utcnow() + timedelta(seconds=expires_in)
+        self.refresh_token = refresh_token
+        self.local_id = local_id
+
+        self.credentials_rejected = False
+        self._failures = 0
+        self._retry_at = None
+
+        self._schedule_refresh()
+
+        if tokens_changed and self.on_token_update:
+            self.on_token_update(refresh_token, local_id)
+
+    def _clear_tokens(self) -> None:
+        """Forget the current tokens."""
+
+        self.auth_token = None
+        self.auth_token_expire_date = None
+        self.refresh_token = None
+        self.async_stop()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule a refresh of the ID token ahead of its expiry."""
+
+        self.async_stop()
+
+        delay = (
+            self.auth_token_expire_date - TOKEN_REFRESH_MARGIN - dt_util.utcnow()
+        ).total_seconds()
+
+        self._unsub_refresh = async_call_later(
+            self.hass, max(delay, 0), self._async_scheduled_refresh
+        )
+
+    async def _async_scheduled_refresh(self, _now: datetime) -> None:
+        """Refresh the ID token from the timer, retrying with backoff on failure."""
+
+        self._unsub_refresh = None
+
+        LOGGER.debug("Refreshing the authentication token")
+
+        await self.async_get_auth_token()
+
+        if (
+            self._token_is_fresh()
+            or self.credentials_rejected
+            or self._retry_at is None
+            or self._unsub_refresh is not None
+        ):
+            return
+
+        self._unsub_refresh = async_call_later(
+            self.hass,
+            max((self._retry_at - dt_util.utcnow()).total_seconds(), 0),
+            self._async_scheduled_refresh,
+        )
+
+
+def _firebase_error(response_json: Any) -> str | None:
+    """Return the error code of a Firebase Auth error response.
+
+    Messages can carry details after the code, as in "TOO_MANY_ATTEMPTS_TRY_LATER :
+    Access to this account has been temporarily disabled".
+    """
+
+    try:
+        message = response_json["error"]["message"]
+    except (KeyError, TypeError):
+        return None
+
+    if not isinstance(message, str):
+        return None
+
+    return message.split(":", 1)[0].strip()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 from rointesdk.device import RointeDevice
@@ -173,44 +174,55 @@ class RointeHaClimate(RointeRadiatorEntity, ClimateEntity):
         # Round to the nearest half value.
         rounded_temp = round(target_temperature * 2) / 2
 
-        if not await self.device_manager.send_command(
-            self._radiator, RointeCommand.SET_TEMP, rounded_temp
-        ):
-            raise HomeAssistantError(
-                f"Failed to set temperature for {self._radiator.name}"
-            )
-
-        await self._signal_thermostat_update()
+        await self._async_send_command(
+            RointeCommand.SET_TEMP,
+            rounded_temp,
+            f"Failed to set temperature for {self._radiator.name}",
+        )
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
 
         LOGGER.debug("Setting HVAC mode to %s", hvac_mode)
 
-        if not await self.device_manager.send_command(
-            self._radiator, RointeCommand.SET_HVAC_MODE, hvac_mode
-        ):
-            raise HomeAssistantError(
-                f"Failed to set HVAC mode for {self._radiator.name}"
-            )
-
-        await self._signal_thermostat_update()
+        await self._async_send_command(
+            RointeCommand.SET_HVAC_MODE,
+            hvac_mode,
+            f"Failed to set HVAC mode for {self._radiator.name}",
+        )
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set new target preset mode."""
         LOGGER.debug("Setting preset mode: %s", preset_mode)
 
-        if not await self.device_manager.send_command(
-            self._radiator, RointeCommand.SET_PRESET, preset_mode
-        ):
-            raise HomeAssistantError(
-                f"Failed to set HVAC preset for {self._radiator.name}"
-            )
+        await self._async_send_command(
+            RointeCommand.SET_PRESET,
+            preset_mode,
+            f"Failed to set HVAC preset for {self._radiator.name}",
+        )
+
+    async def _async_send_command(
+        self, command: RointeCommand, arg: Any, error_message: str
+    ) -> None:
+        """Send a command, showing its optimistic state while it's queued."""
+
+        command_task = self.device_manager.queue_command(self._device, command, arg)
+
+        if command_task is None:
+            raise HomeAssistantError(error_message)
+
+        self.coordinator.async_update_device_listeners(self._radiator.id)
+        self.coordinator.async_note_command()
+
+        if not await asyncio.shield(command_task):
+            # Show the radiator as unavailable instead of the optimistic state.
+            self.coordinator.async_update_device_listeners(self._radiator.id)
+            raise HomeAssistantError(error_message)
 
         await self._signal_thermostat_update()
 
     async def _signal_thermostat_update(self):
         """Signal a radiator change."""
 
-        # Update the data
-        await self.coordinator.async_refresh()
+        # Re-read only this radiator and update its entities.
+        await self.coordinator.async_refresh_device(self._radiator.id)
@@ -2,16 +2,36 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from typing import Any
 
-from rointesdk.rointe_api import RointeAPI
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
 
-from .const import CONF_INSTALLATION, CONF_PASSWORD, CONF_USERNAME, DOMAIN, LOGGER
+from .api import RointeAsyncAPI
+from .auth import RointeTokenManager
+from .const import (
+    CONF_ENERGY_REFRESH_INTERVAL,
+    CONF_FIRMWARE_CACHE_TTL,
+    CONF_INSTALLATION,
+    CONF_LOCAL_ID,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_PASSWORD,
+    CONF_REFRESH_TOKEN,
+    CONF_STREAMING,
+    CONF_USERNAME,
+    DEFAULT_ENERGY_REFRESH_INTERVAL,
+    DEFAULT_FIRMWARE_CACHE_TTL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DOMAIN,
+    LOGGER,
+)
+from .hub import ACCOUNT_OPTIONS
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
@@ -20,6 +40,8 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+STEP_REAUTH_DATA_SCHEMA = vol.Schema({vol.Required(CONF_PASSWORD): cv.string})
+
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle the config flow for Rointe Heaters."""
@@ -30,6 +52,15 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Config flow init."""
         self.step_user_data: dict[str, Any] | None = None
         self.step_user_installations: dict[str, Any] | None = None
+        self.reauth_entry: config_entries.ConfigEntry | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -41,11 +72,16 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 step_id="user", data_schema=STEP_USER_DATA_SCHEMA
             )
 
-        rointe_api = RointeAPI(user_input[CONF_USERNAME], user_input[CONF_PASSWORD])
-
-        login_error_code = await self.hass.async_add_executor_job(
-            rointe_api.initialize_authentication
+        session = async_get_clientsession(self.hass)
+        token_manager = RointeTokenManager(
+            self.hass, session, user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
         )
+        rointe_api = RointeAsyncAPI(session, token_manager)
+
+        login_error_code = await rointe_api.initialize_authentication()
+
+        # The entry keeps its own tokens fresh once set up.
+        token_manager.async_stop()
 
         if not login_error_code.success or not rointe_api.is_logged_in():
             LOGGER.error(
@@ -57,9 +93,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors={"base": "invalid_auth"},
             )
 
-        installations_response = await self.hass.async_add_executor_job(
-            rointe_api.get_installations
-        )
+        installations_response = await rointe_api.get_installations()
 
         if not installations_response.success:
             LOGGER.error(
@@ -76,7 +110,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         installations = installations_response.data
 
         # If we get this far then we have logged in and determined the local_id. Go the next step.
-        self.step_user_data = user_input
+        self.step_user_data = {
+            **user_input,
+            CONF_REFRESH_TOKEN: token_manager.refresh_token,
+            CONF_LOCAL_ID: token_manager.local_id,
+        }
         self.step_user_installations = installations
 
         return await self.async_step_installation()
@@ -108,6 +146,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             CONF_INSTALLATION: user_input[CONF_INSTALLATION],
             CONF_USERNAME: self.step_user_data[CONF_USERNAME],
             CONF_PASSWORD: self.step_user_data[CONF_PASSWORD],
+            CONF_REFRESH_TOKEN: self.step_user_data[CONF_REFRESH_TOKEN],
+            CONF_LOCAL_ID: self.step_user_data[CONF_LOCAL_ID],
         }
 
         LOGGER.debug(
@@ -119,3 +159,127 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description="Rointe",
             data=user_data,
         )
+
+    async def async_step_reauth(self, entry_data: Mapping[str, Any]) -> FlowResult:
+        """Handle the cloud rejecting the account's password."""
+
+        self.reauth_entry = self.hass.config_entries.async_get_entry(
+            self.context["entry_id"]
+        )
+
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Ask for the new password of the account."""
+
+        assert self.reauth_entry is not None
+
+        errors: dict[str, str] = {}
+        username = self.reauth_entry.data[CONF_USERNAME]
+
+        if user_input is not None:
+            session = async_get_clientsession(self.hass)
+            token_manager = RointeTokenManager(
+                self.hass, session, username, user_input[CONF_PASSWORD]
+            )
+
+            login_response = await token_manager.async_login()
+            token_manager.async_stop()
+
+            if login_response.success:
+                credentials = {
+                    CONF_PASSWORD: user_input[CONF_PASSWORD],
+                    CONF_REFRESH_TOKEN: token_manager.refresh_token,
+                    CONF_LOCAL_ID: token_manager.local_id,
+                }
+
+                # The other installations of the account share its password.
+                for entry in self._async_current_entries(include_ignore=False):
+                    if (
+                        entry is not self.reauth_entry
+                        and entry.data[CONF_USERNAME] == username
+                    ):
+                        self.hass.config_entries.async_update_entry(
+                            entry, data={**entry.data, **credentials}
+                        )
+
+                return self.async_update_reload_and_abort(
+                    self.reauth_entry, data={**self.reauth_entry.data, **credentials}
+                )
+
+            LOGGER.error(
+                "Error during authentication: %s", login_response.error_message
+            )
+            errors["base"] = "invalid_auth"
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=STEP_REAUTH_DATA_SCHEMA,
+            description_placeholders={"username": username},
+            errors=errors,
+        )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the options flow for Rointe Heaters."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the integration options."""
+
+        if user_input is not None:
+            # The other installations of the account share its hub options.
+            account_options = {key: user_input[key] for key in ACCOUNT_OPTIONS}
+
+            for entry in self.hass.config_entries.async_entries(DOMAIN):
+                if (
+                    entry.entry_id != self._config_entry.entry_id
+                    and entry.data[CONF_USERNAME]
+                    == self._config_entry.data[CONF_USERNAME]
+                ):
+                    self.hass.config_entries.async_update_entry(
+                        entry, options={**entry.options, **account_options}
+                    )
+
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._config_entry.options
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_FIRMWARE_CACHE_TTL,
+                        default=options.get(
+                            CONF_FIRMWARE_CACHE_TTL, DEFAULT_FIRMWARE_CACHE_TTL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=168)),
+                    vol.Required(
+                        CONF_ENERGY_REFRESH_INTERVAL,
+                        default=options.get(
+                            CONF_ENERGY_REFRESH_INTERVAL,
+                            DEFAULT_ENERGY_REFRESH_INTERVAL,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+                    vol.Required(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=options.get(
+                            CONF_MAX_CONCURRENT_REQUESTS,
+                            DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                    vol.Required(
+                        CONF_STREAMING,
+                        default=options.get(CONF_STREAMING, False),
+                    ): bool,
+                }
+            ),
+        )
@@ -1,5 +1,6 @@
 """Constants for the Rointe Heaters integration."""
 
+from datetime import timedelta
 from enum import StrEnum
 import logging
 
@@ -13,6 +14,76 @@ PLATFORMS: list[Platform] = [Platform.CLIMATE, Platform.SENSOR, Platform.UPDATE]
 CONF_USERNAME = "rointe_username"
 CONF_PASSWORD = "rointe_password"
 CONF_INSTALLATION = "rointe_installation"
+CONF_REFRESH_TOKEN = "refresh_token"
+CONF_LOCAL_ID = "local_id"
+CONF_FIRMWARE_CACHE_TTL = "firmware_cache_ttl"
+CONF_ENERGY_REFRESH_INTERVAL = "energy_refresh_interval"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_STREAMING = "streaming"
+
+DEFAULT_FIRMWARE_CACHE_TTL = 12  # hours
+DEFAULT_ENERGY_REFRESH_INTERVAL = 5  # minutes
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+FIRMWARE_CACHE_RETRY_INTERVAL = timedelta(minutes=10)
+
+REQUEST_TIMEOUT = 20  # seconds
+REQUEST_START_JITTER = 0.25  # seconds
+REQUEST_RETRY_BACKOFF = 1  # seconds, doubled on every retry.
+
+# Requests per second allowed by the rate limiter, and how many may burst at once.
+RATE_LIMIT_PER_SECOND = 5
+RATE_LIMIT_BURST = 20
+
+# Requests are held back this long after the cloud throttles one, doubled every
+# consecutive time, unless its Retry-After asks for longer.
+THROTTLE_BACKOFF_MIN = 30  # seconds
+THROTTLE_BACKOFF_MAX = 900  # seconds
+
+# Installations fetched for one installation are reused by the others for this long.
+INSTALLATIONS_CACHE_TTL = timedelta(seconds=30)
+
+# Devices read in bulk for one installation's poll are reused by the polls of
+# the others for this long, unless a command was sent since.
+DEVICES_CACHE_TTL = timedelta(seconds=10)
+
+# Delay before the device snapshot is written after a change.
+SNAPSHOT_SAVE_DELAY = 60  # seconds
+
+# Authentication tokens are refreshed this long before they expire.
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# After a failed token refresh or login, no new attempt is made for this long,
+# doubling with each consecutive failure up to the maximum.
+AUTH_RETRY_MIN = timedelta(seconds=30)
+AUTH_RETRY_MAX = timedelta(minutes=15)
+
+# Hourly energy statistics are imported this often, going back this many days
+# the first time, and written in batches of up to this many hours.
+STATISTICS_IMPORT_INTERVAL = timedelta(hours=1)
+STATISTICS_BACKFILL_DAYS = 30
+STATISTICS_IMPORT_BATCH_SIZE = 168
+
+# An hour of energy stats is only imported once it ended this long ago, as the
+# devices report it late.
+STATISTICS_HOUR_SETTLE_TIME = timedelta(minutes=30)
+
+# Imported hours this recent are re-read and overwritten on each import, in case
+# the devices reported them late or incomplete.
+STATISTICS_REIMPORT_WINDOW = timedelta(days=1)
+
+# Devices keep their last known state for this long while reads fail.
+DEVICE_UNAVAILABLE_GRACE_PERIOD = timedelta(minutes=5)
+
+# Commands sent to a device within this window are merged into one cloud write.
+COMMAND_COALESCE_WINDOW = 0.5  # seconds
+
+STREAM_READ_TIMEOUT = 90  # seconds, Firebase sends a keep-alive every 30s.
+STREAM_RETRY_MIN = 5  # seconds
+STREAM_RETRY_MAX = 300  # seconds
+
+# Each streamed device holds a connection open, on a connection pool of their
+# own. Installations with more devices are polled instead.
+STREAM_MAX_DEVICES = 50
 
 ROINTE_MANUFACTURER = "Rointe"
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -11,25 +12,62 @@ from rointesdk.device import RointeDevice
 
 from homeassistant.components.sensor import SensorEntityDescription
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-
-from .const import DOMAIN, LOGGER, PLATFORMS
-from .device_manager import RointeDeviceManager
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DEFAULT_ENERGY_REFRESH_INTERVAL,
+    DOMAIN,
+    LOGGER,
+    PLATFORMS,
+    RointeCommand,
+    RointeOperationMode,
+)
+from .device_manager import RointeDeviceManager, RointeDeviceState
+from .snapshot import RointeSnapshotStore
+from .stream import RointeDeviceStream
 
 ROINTE_API_REFRESH_INTERVAL = timedelta(seconds=15)
 
+# Polling backs off up to this interval while all devices are stable.
+ROINTE_MAX_REFRESH_INTERVAL = timedelta(minutes=5)
+
+# Longest interval while a device is heating towards its target temperature.
+ROINTE_TRANSITION_REFRESH_INTERVAL = timedelta(minutes=1)
+
+# Poll at the fastest interval for this long after a command.
+ROINTE_COMMAND_ACTIVITY_WINDOW = timedelta(minutes=2)
+
+# Poll at the fastest interval this close to a schedule change.
+ROINTE_SCHEDULE_BOUNDARY_WINDOW = timedelta(minutes=3)
+
+# Difference between the probe and target temperatures of a transitioning device.
+ROINTE_TRANSITION_TEMP_DELTA = 1.0
+
+# Upper bound on the time it takes for added or removed devices to be noticed.
+ROINTE_INSTALLATION_REFRESH_INTERVAL = timedelta(minutes=10)
+
+# Devices read one by one get their whole document, including the firmware
+# info, this often. Other polls only read their data node.
+ROINTE_DEVICE_INFO_REFRESH_INTERVAL = timedelta(minutes=30)
+
+# Polling interval while device state is being streamed. Polls still pick up
+# energy stats, firmware changes and added or removed devices.
+ROINTE_STREAMING_REFRESH_INTERVAL = timedelta(minutes=5)
+
 
 @dataclass
 class RointeSensorEntityDescriptionMixin:
     """Define a description mixin for Rointe sensor entities."""
 
-    last_reset_fn: Callable[[RointeDevice], datetime | None]
-    name_fn: Callable[[RointeDevice], str]
-    value_fn: Callable[[RointeDevice], StateType]
+    last_reset_fn: Callable[[RointeDeviceState], datetime | None]
+    name_fn: Callable[[RointeDeviceState], str]
+    value_fn: Callable[[RointeDeviceState], StateType]
 
 
 @dataclass
@@ -39,15 +77,78 @@ class RointeSensorEntityDescription(
     """Define an object to describe Rointe sensor entities."""
 
 
+@dataclass
+class RointeRefreshTier:
+    """A slice of the device data refreshed on its own cadence."""
+
+    interval: timedelta
+    last_refresh: datetime | None = None
+
+    def is_due(self, now: datetime) -> bool:
+        """Return True if the tier must be refreshed on this tick."""
+        return self.last_refresh is None or now - self.last_refresh >= self.interval
+
+    def mark_refreshed(self, now: datetime) -> None:
+        """Record a refresh of this tier."""
+        self.last_refresh = now
+
+
 class RointeDataUpdateCoordinator(DataUpdateCoordinator[dict[str, RointeDevice]]):
-    """Rointe data coordinator."""
+    """Rointe data coordinator.
+
+    Device state is refreshed on every tick while energy stats, the list of
+    installation devices and the device firmware info are only refreshed once
+    their tier is due. The firmware map follows the firmware cache TTL.
+
+    The polling interval adapts to activity. It drops to the fastest interval
+    after a command and around schedule changes, is held at a minute while a
+    device heats towards its target, and otherwise doubles on every poll without
+    changes up to `ROINTE_MAX_REFRESH_INTERVAL`.
+
+    When streaming is enabled device state is pushed by a Firebase event stream and
+    polling slows down, going back to the adaptive interval if the stream drops.
+    """
 
     def __init__(
-        self, hass: HomeAssistant, device_manager: RointeDeviceManager
+        self,
+        hass: HomeAssistant,
+        device_manager: RointeDeviceManager,
+        energy_interval: timedelta = timedelta(minutes=DEFAULT_ENERGY_REFRESH_INTERVAL),
+        streaming: bool = False,
+        snapshot_store: RointeSnapshotStore | None = None,
     ) -> None:
         """Initialize Rointe data updater."""
         self.device_manager = device_manager
+        self.snapshot_store = snapshot_store
         self.unregistered_keys: dict[str, dict[str, RointeDevice]] = {}
+        self.energy_tier = RointeRefreshTier(energy_interval)
+        self.installation_tier = RointeRefreshTier(ROINTE_INSTALLATION_REFRESH_INTERVAL)
+        self.device_info_tier = RointeRefreshTier(ROINTE_DEVICE_INFO_REFRESH_INTERVAL)
+        self.stream: RointeDeviceStream | None = None
+
+        # Devices whose state changed on the last update. Only their entities are
+        # notified.
+        self.changed_device_ids: set[str] = set()
+        self._notified_update_success: bool | None = None
+
+        # Installation totals, recomputed when any device changes.
+        self.total_power: float | None = None
+        self.total_energy: float | None = None
+        self.total_energy_start: datetime | None = None
+
+        self._last_command: datetime | None = None
+
+        # device_id -> listeners added with that device ID as their context.
+        self._device_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._device_refreshes: dict[str, asyncio.Task] = {}
+
+        if streaming:
+            self.stream = RointeDeviceStream(
+                hass,
+                device_manager.rointe_api,
+                self._async_handle_stream_event,
+                self._async_handle_stream_connection,
+            )
 
         super().__init__(
             hass,
@@ -61,7 +162,42 @@ class RointeDataUpdateCoordinator(DataUpdateCoordinator[dict[str, RointeDevice]]
     async def _async_update_data(self) -> dict[str, RointeDevice]:
         """Fetch data from API."""
 
-        new_devices = await self.device_manager.update()
+        now = dt_util.utcnow()
+        refresh_energy = self.energy_tier.is_due(now)
+        refresh_installation = self.installation_tier.is_due(now)
+        refresh_device_info = self.device_info_tier.is_due(now)
+
+        new_devices = await self.device_manager.update(
+            refresh_energy=refresh_energy,
+            refresh_installation=refresh_installation,
+            full_read=refresh_device_info,
+        )
+
+        if self.device_manager.rointe_api.credentials_rejected:
+            raise ConfigEntryAuthFailed("Rointe rejected the account's password")
+
+        if refresh_energy:
+            self.energy_tier.mark_refreshed(now)
+
+        if refresh_installation:
+            self.installation_tier.mark_refreshed(now)
+
+        if refresh_device_info:
+            self.device_info_tier.mark_refreshed(now)
+
+        self.changed_device_ids = self.device_manager.pop_changed_device_ids()
+
+        if self.changed_device_ids or new_devices:
+            self._update_totals()
+
+            if self.snapshot_store:
+                self.snapshot_store.async_schedule_save(self.device_manager.snapshot)
+
+        LOGGER.debug(
+            "%s of %s devices changed",
+            len(self.changed_device_ids),
+            len(self.device_manager.rointe_devices),
+        )
 
         for platform in PLATFORMS:
             self.unregistered_keys[platform].update(
@@ -75,8 +211,268 @@ class RointeDataUpdateCoordinator(DataUpdateCoordinator[dict[str, RointeDevice]]
         for device in new_devices.values():
             device_update_info(self.hass, device)
 
+        if self.stream:
+            self.stream.async_track_devices(list(self.device_manager.rointe_devices))
+
+        # Don't poll again until the cloud stops throttling requests.
+        update_interval = max(
+            self._next_update_interval(now),
+            timedelta(seconds=self.device_manager.request_scheduler.throttle_remaining),
+        )
+
+        if update_interval != self.update_interval:
+            LOGGER.debug("Polling interval set to %s", update_interval)
+            self.update_interval = update_interval
+
         return new_devices
 
+    def _next_update_interval(self, now: datetime) -> timedelta:
+        """Return the polling interval following the last update."""
+
+        if self.stream and self.stream.connected:
+            return ROINTE_STREAMING_REFRESH_INTERVAL
+
+        if (
+            self._last_command is not None
+            and now - self._last_command < ROINTE_COMMAND_ACTIVITY_WINDOW
+        ):
+            return ROINTE_API_REFRESH_INTERVAL
+
+        devices = [
+            device
+            for device in self.device_manager.rointe_devices.values()
+            if device.hass_available
+        ]
+        local_now = dt_util.as_local(now)
+
+        if any(_near_schedule_boundary(device, local_now) for device in devices):
+            return ROINTE_API_REFRESH_INTERVAL
+
+        update_interval = min(
+            self.update_interval or ROINTE_API_REFRESH_INTERVAL,
+            ROINTE_MAX_REFRESH_INTERVAL,
+        )
+
+        if not self.changed_device_ids:
+            update_interval = min(update_interval * 2, ROINTE_MAX_REFRESH_INTERVAL)
+
+        if any(_is_transitioning(device) for device in devices):
+            update_interval = min(update_interval, ROINTE_TRANSITION_REFRESH_INTERVAL)
+
+        return update_interval
+
+    @callback
+    def async_note_command(self) -> None:
+        """Go back to the fastest polling interval after a command."""
+
+        self._last_command = dt_util.utcnow()
+
+        if self.stream and self.stream.connected:
+            return
+
+        if self.device_manager.request_scheduler.throttle_remaining:
+            return
+
+        if self.update_interval != ROINTE_API_REFRESH_INTERVAL:
+            self.update_interval = ROINTE_API_REFRESH_INTERVAL
+            self._schedule_refresh()
+
+    async def async_restore_snapshot(self) -> bool:
+        """Load the devices from the stored snapshot, without reaching the cloud.
+
+        Returns True if any device was restored, in which case the devices are
+        ready for the platforms to create their entities.
+        """
+
+        if not self.snapshot_store:
+            return False
+
+        if not (snapshot := await self.snapshot_store.async_load()):
+            return False
+
+        if not (restored := self.device_manager.restore(snapshot)):
+            return False
+
+        self.device_manager.pop_changed_device_ids()
+
+        for platform in PLATFORMS:
+            self.unregistered_keys[platform].update(restored)
+
+        self.data = restored
+        self._update_totals()
+
+        return True
+
+    def _update_totals(self) -> None:
+        """Sum the power and energy consumption of the installation's devices.
+
+        The energy total only covers the devices reporting the latest hourly
+        cycle, so it resets along with theirs.
+        """
+
+        energy_data = [
+            device.energy_data
+            for device in self.device_manager.rointe_devices.values()
+            if device.hass_available and device.energy_data
+        ]
+
+        if not energy_data:
+            self.total_power = self.total_energy = self.total_energy_start = None
+            return
+
+        self.total_power = sum(data.effective_power for data in energy_data)
+        self.total_energy_start = max(data.start for data in energy_data)
+        self.total_energy = sum(
+            data.kwh for data in energy_data if data.start == self.total_energy_start
+        )
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> CALLBACK_TYPE:
+        """Listen for data updates.
+
+        Listeners with a device ID as their context are only notified when that
+        device changed, or when the coordinator's status did.
+        """
+
+        remove_listener = super().async_add_listener(update_callback, context)
+
+        if context is None:
+            return remove_listener
+
+        listeners = self._device_listeners.setdefault(context, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_device_listener() -> None:
+            """Remove the device listener."""
+            remove_listener()
+            listeners.remove(update_callback)
+
+            if not listeners:
+                self._device_listeners.pop(context, None)
+
+        return remove_device_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the listeners of the devices that changed on the last update."""
+
+        if self.last_update_success != self._notified_update_success:
+            # Availability of every entity follows the coordinator status.
+            self._notified_update_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None:
+                update_callback()
+
+        for device_id in self.changed_device_ids:
+            self.async_update_device_listeners(device_id)
+
+    @callback
+    def async_update_device_listeners(self, device_id: str) -> None:
+        """Notify the listeners of a single device."""
+
+        for update_callback in list(self._device_listeners.get(device_id, [])):
+            update_callback()
+
+    async def async_refresh_device(self, device_id: str) -> None:
+        """Re-read a single device and update only its entities.
+
+        Concurrent calls for the same device share a single request.
+        """
+
+        if (refresh_task := self._device_refreshes.get(device_id)) is None:
+            refresh_task = self.hass.async_create_task(
+                self._async_refresh_device(device_id)
+            )
+            self._device_refreshes[device_id] = refresh_task
+
+        await asyncio.shield(refresh_task)
+
+    async def _async_refresh_device(self, device_id: str) -> None:
+        """Re-read a single device and notify its listeners."""
+
+        try:
+            await self.device_manager.update_device(device_id)
+        finally:
+            self._device_refreshes.pop(device_id, None)
+
+        self.async_update_device_listeners(device_id)
+
+    async def async_refresh_devices(self, device_ids: list[str]) -> None:
+        """Re-read several devices in one pass and update only their entities."""
+
+        await self.device_manager.update_devices(device_ids)
+
+        for device_id in device_ids:
+            self.async_update_device_listeners(device_id)
+
+    async def async_send_bulk_command(
+        self, device_ids: list[str], command: RointeCommand, arg: Any
+    ) -> dict[str, bool]:
+        """Send a command to several devices followed by a single refresh."""
+
+        devices = [
+            self.device_manager.rointe_devices[device_id]
+            for device_id in device_ids
+            if device_id in self.device_manager.rointe_devices
+        ]
+
+        command_task = self.device_manager.queue_bulk_command(devices, command, arg)
+
+        if command_task is None:
+            return {device.id: False for device in devices}
+
+        # Show the optimistic state while the command is sent.
+        for device in devices:
+            self.async_update_device_listeners(device.id)
+
+        self.async_note_command()
+
+        results = await asyncio.shield(command_task)
+        await self.async_refresh_devices([device.id for device in devices])
+
+        return results
+
+    async def async_shutdown(self) -> None:
+        """Stop the device stream and cancel any scheduled refresh."""
+
+        await super().async_shutdown()
+
+        if self.stream:
+            self.stream.async_stop()
+
+    @callback
+    def _async_handle_stream_event(
+        self, device_id: str, event: str, path: str, data: Any
+    ) -> None:
+        """Apply a streamed device change and notify the entities."""
+
+        if self.device_manager.apply_stream_event(device_id, event, path, data):
+            # Not `async_set_updated_data`, which would push back the next poll
+            # on every event and starve the energy tier.
+            self.async_update_device_listeners(device_id)
+
+    @callback
+    def _async_handle_stream_connection(self, connected: bool) -> None:
+        """Adjust the polling interval to the stream connection state."""
+
+        if self._shutdown_requested:
+            return
+
+        LOGGER.debug("Device stream %s", "connected" if connected else "disconnected")
+
+        if connected:
+            self.update_interval = ROINTE_STREAMING_REFRESH_INTERVAL
+            return
+
+        self.update_interval = ROINTE_API_REFRESH_INTERVAL
+        self.hass.async_create_task(self.async_request_refresh())
+
     @callback
     def add_entities_for_seen_keys(
         self,
@@ -141,6 +537,44 @@ class RointeDataUpdateCoordinator(DataUpdateCoordinator[dict[str, RointeDevice]]
             async_add_entities(new_entities)
 
 
+def _is_transitioning(device: RointeDevice) -> bool:
+    """Return True if a device is heating towards a distant target temperature."""
+
+    return (
+        device.power
+        and abs(device.temp_probe - device.temp) >= ROINTE_TRANSITION_TEMP_DELTA
+    )
+
+
+def _near_schedule_boundary(device: RointeDevice, now: datetime) -> bool:
+    """Return True if the schedule of a device in auto mode is about to change.
+
+    Also True shortly after a change, until the device reports its new state.
+    """
+
+    if device.mode != RointeOperationMode.AUTO:
+        return False
+
+    hour_start = now.replace(minute=0, second=0, microsecond=0)
+
+    if now - hour_start < ROINTE_SCHEDULE_BOUNDARY_WINDOW:
+        boundary = hour_start
+    elif hour_start + timedelta(hours=1) - now < ROINTE_SCHEDULE_BOUNDARY_WINDOW:
+        boundary = hour_start + timedelta(hours=1)
+    else:
+        return False
+
+    previous = boundary - timedelta(hours=1)
+
+    try:
+        return (
+            device.schedule[previous.weekday()][previous.hour]
+            != device.schedule[boundary.weekday()][boundary.hour]
+        )
+    except (IndexError, KeyError, TypeError):
+        return False
+
+
 @callback
 def device_update_info(hass: HomeAssistant, rointe_device: RointeDevice) -> None:
     """Update device registry info."""
@@ -3,19 +3,35 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable, Coroutine
+from copy import deepcopy
+from dataclasses import dataclass
 from datetime import datetime
+from functools import partial
+import json
+import time
 from typing import Any
 
 from rointesdk.device import RointeDevice, ScheduleMode
 from rointesdk.dto import EnergyConsumptionData
 from rointesdk.model import RointeProduct
-from rointesdk.rointe_api import ApiResponse, RointeAPI
+from rointesdk.rointe_api import ApiResponse
 from rointesdk.utils import get_product_by_type_version
 
 from homeassistant.components.climate import PRESET_COMFORT, PRESET_ECO, HVACMode
-from homeassistant.core import HomeAssistant
-
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .api import (
+    NO_ENERGY_STATS,
+    RointeAsyncAPI,
+    is_rejected_query,
+    preset_body,
+    temp_body,
+)
 from .const import (
+    COMMAND_COALESCE_WINDOW,
+    DEVICE_UNAVAILABLE_GRACE_PERIOD,
     LOGGER,
     PRESET_ROINTE_ICE,
     RADIATOR_DEFAULT_TEMPERATURE,
@@ -24,6 +40,136 @@ from .const import (
     RointeOperationMode,
     RointePreset,
 )
+from .firmware_cache import RointeFirmwareCache
+from .scheduler import RointeRequestScheduler
+
+
+# Retries of transient errors, per endpoint.
+INSTALLATION_DEVICES_RETRIES = 2
+DEVICE_RETRIES = 1
+ENERGY_STATS_RETRIES = 1
+
+# Device data fields read into the device state. Sync timestamps are left out as
+# they change on every write without affecting any entity.
+FINGERPRINT_DATA_KEYS = (
+    "name",
+    "type",
+    "product_version",
+    "nominal_power",
+    "power",
+    "status",
+    "mode",
+    "temp",
+    "temp_calc",
+    "temp_probe",
+    "comfort",
+    "eco",
+    "ice",
+    "um_max_temp",
+    "um_min_temp",
+    "user_mode",
+    "ice_mode",
+    "schedule",
+    "schedule_day",
+    "schedule_hour",
+)
+
+
+# Device data fields kept from the raw payloads, everything `RointeDevice` reads.
+DEVICE_DATA_KEYS = (
+    *FINGERPRINT_DATA_KEYS,
+    "last_sync_datetime_app",
+    "last_sync_datetime_device",
+)
+
+
+def _trim_payload(device_data: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of a device payload with only the fields the devices read."""
+
+    data = device_data.get("data") or {}
+    firmware_data = device_data.get("firmware")
+
+    trimmed: dict[str, Any] = {
+        "data": {key: data[key] for key in DEVICE_DATA_KEYS if key in data}
+    }
+
+    if "serialnumber" in device_data:
+        trimmed["serialnumber"] = device_data["serialnumber"]
+
+    if firmware_data is not None:
+        trimmed["firmware"] = {
+            "firmware_version_device": firmware_data.get("firmware_version_device")
+        }
+
+    return trimmed
+
+
+def _payload_fingerprint(
+    device_data: dict[str, Any],
+    energy_stats: EnergyConsumptionData | None,
+    latest_fw: str | None,
+) -> int:
+    """Return a hash of the parts of a device payload the entities depend on."""
+
+    data = device_data.get("data") or {}
+    firmware_data = device_data.get("firmware") or {}
+
+    relevant = {key: data.get(key) for key in FINGERPRINT_DATA_KEYS}
+    relevant["firmware_version_device"] = firmware_data.get("firmware_version_device")
+    relevant["latest_fw"] = latest_fw
+
+    if energy_stats:
+        relevant["energy"] = [
+            energy_stats.start.isoformat(),
+            energy_stats.end.isoformat(),
+            energy_stats.kwh,
+            energy_stats.effective_power,
+        ]
+
+    return hash(json.dumps(relevant, sort_keys=True, default=str))
+
+
+async def _no_response() -> None:
+    """Placeholder for a request that is skipped on this tick."""
+    return None
+
+
+def _is_missing_device(response: ApiResponse) -> bool:
+    """Return True if a `get_device` response means the device doesn't exist."""
+
+    # Firebase answers reads of missing paths with an empty body.
+    if response.success:
+        return not response.data
+
+    return bool(response.error_message) and response.error_message.endswith("404")
+
+
+def _merge_stream_data(
+    device_data: dict[str, Any], event: str, path: str, data: Any
+) -> dict[str, Any]:
+    """Return a copy of a device's data node with a streamed change applied."""
+
+    keys = [key for key in path.split("/") if key]
+
+    if not keys:
+        return data if event == "put" else {**device_data, **data}
+
+    device_data = deepcopy(device_data)
+    node = device_data
+
+    for key in keys[:-1]:
+        node = node[int(key)] if isinstance(node, list) else node.setdefault(key, {})
+
+    key = int(keys[-1]) if isinstance(node, list) else keys[-1]
+
+    if event == "patch":
+        node[key].update(data)
+    elif data is None:
+        del node[key]
+    else:
+        node[key] = data
+
+    return device_data
 
 
 def determine_latest_firmware(
@@ -63,6 +209,67 @@ def determine_latest_firmware(
     return current_firmware
 
 
+@dataclass(frozen=True, slots=True)
+class RointeDeviceState:
+    """Immutable state of a device, as read by its entities.
+
+    A new state with a higher version is published every time the device changes,
+    so entities never see a device halfway through an update.
+    """
+
+    version: int
+    id: str
+    name: str
+    type: str
+    product_version: str
+    rointe_product: RointeProduct | None
+    hass_available: bool
+    power: bool
+    mode: str
+    preset: str
+    temp: float
+    temp_probe: float
+    comfort_temp: float
+    eco_temp: float
+    ice_temp: float
+    user_mode_supported: bool
+    user_mode: bool
+    um_min_temp: float
+    um_max_temp: float
+    energy_data: EnergyConsumptionData | None
+    firmware_version: str | None
+    latest_firmware_version: str | None
+
+    @classmethod
+    def from_device(cls, device: RointeDevice, version: int) -> RointeDeviceState:
+        """Return the current state of a device."""
+
+        return cls(
+            version=version,
+            id=device.id,
+            name=device.name,
+            type=device.type,
+            product_version=device.product_version,
+            rointe_product=device.rointe_product,
+            hass_available=device.hass_available,
+            power=device.power,
+            mode=device.mode,
+            preset=device.preset,
+            temp=device.temp,
+            temp_probe=device.temp_probe,
+            comfort_temp=device.comfort_temp,
+            eco_temp=device.eco_temp,
+            ice_temp=device.ice_temp,
+            user_mode_supported=device.user_mode_supported(),
+            user_mode=device.user_mode,
+            um_min_temp=device.um_min_temp,
+            um_max_temp=device.um_max_temp,
+            energy_data=device.energy_data,
+            firmware_version=device.firmware_version,
+            latest_firmware_version=device.latest_firmware_version,
+        )
+
+
 class RointeDeviceManager:
     """Device Manager."""
 
@@ -72,99 +279,306 @@ class RointeDeviceManager:
         password: str,
         installation_id: str,
         hass: HomeAssistant,
-        rointe_api: RointeAPI,
+        rointe_api: RointeAsyncAPI,
+        firmware_cache: RointeFirmwareCache,
+        request_scheduler: RointeRequestScheduler,
     ) -> None:
         """Initialize the device manager."""
         self.username = username
         self.password = password
         self.installation_id = installation_id
         self.rointe_api = rointe_api
+        self.firmware_cache = firmware_cache
+        self.request_scheduler = request_scheduler
 
         self.hass = hass
-        self.auth_token = None
-        self.auth_token_expire_date: datetime | None = None
 
         self.rointe_devices: dict[str, RointeDevice] = {}
 
+        # device_id -> last published state of the device, read by the entities.
+        self.device_states: dict[str, RointeDeviceState] = {}
+        self._state_version = 0
+
+        # Installation device IDs, None until fetched or after a device went missing.
+        self._device_ids: list[str] | None = None
+
+        # Whether the devices are read in one request. Turned off if the backend
+        # rejects the bulk read.
+        self._bulk_read = True
+
+        # device_id -> command waiting to be sent.
+        self._pending_commands: dict[str, _PendingCommand] = {}
+
+        # Last raw payload of each device, used as the base for streamed changes.
+        self._device_payloads: dict[str, dict[str, Any]] = {}
+
+        # device_id -> fingerprint of the payload last applied to the device.
+        self._fingerprints: dict[str, int] = {}
+
+        # Duration and number of requests of the last update.
+        self.last_update_duration: float | None = None
+        self.last_update_requests: int | None = None
+        self._update_requests = 0
+
+        # device_id -> last time the device was read successfully.
+        self._last_good: dict[str, datetime] = {}
+
+        # Devices whose state or availability changed since the last update.
+        self.changed_device_ids: set[str] = set()
+
+        # device_id -> (firmware map version, device firmware, latest firmware)
+        self._latest_fw_cache: dict[str, tuple[int, str | None, str | None]] = {}
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return the last known state of the devices, for persisting."""
+
+        snapshot: dict[str, dict[str, Any]] = {}
+
+        for device_id, device in self.rointe_devices.items():
+            if (payload := self._device_payloads.get(device_id)) is None:
+                continue
+
+            energy_data = device.energy_data
+            last_good = self._last_good.get(device_id)
+
+            snapshot[device_id] = {
+                "payload": payload,
+                "energy": {
+                    "start": energy_data.start.isoformat(),
+                    "end": energy_data.end.isoformat(),
+                    "kwh": energy_data.kwh,
+                    "effective_power": energy_data.effective_power,
+                    "created": energy_data.created.isoformat(),
+                }
+                if energy_data
+                else None,
+                "latest_fw": device.latest_firmware_version,
+                "last_good": last_good.isoformat() if last_good else None,
+            }
+
+        return snapshot
+
+    def restore(self, snapshot: dict[str, dict[str, Any]]) -> dict[str, RointeDevice]:
+        """Create the devices from a snapshot taken by `snapshot`.
+
+        Returns the restored devices.
+        """
+
+        restored: dict[str, RointeDevice] = {}
+
+        for device_id, device_snapshot in snapshot.items():
+            try:
+                payload = device_snapshot["payload"]
+
+                if energy := device_snapshot["energy"]:
+                    energy_data = EnergyConsumptionData(
+                        start=dt_util.parse_datetime(energy["start"]),
+                        end=dt_util.parse_datetime(energy["end"]),
+                        kwh=energy["kwh"],
+                        effective_power=energy["effective_power"],
+                        created=dt_util.parse_datetime(energy["created"]),
+                    )
+                else:
+                    energy_data = None
+
+                device = self._add_or_update_device(
+                    payload, energy_data, device_id, device_snapshot["latest_fw"]
+                )
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                LOGGER.warning("Ignoring invalid snapshot of %s: %s", device_id, e)
+                continue
+
+            if device is None:
+                continue
+
+            # The restored state is only as recent as the snapshot.
+            if last_good := dt_util.parse_datetime(device_snapshot["last_good"] or ""):
+                self._last_good[device_id] = last_good
+            else:
+                self._last_good.pop(device_id, None)
+
+            self.rointe_devices[device_id] = device
+            restored[device_id] = device
+
+        LOGGER.debug("Restored %s devices from snapshot", len(restored))
+
+        return restored
+
     def _fail_all_devices(self):
-        """Set all devices as unavailable."""
+        """Record a failed read of all devices."""
 
         if self.rointe_devices:
             for device in self.rointe_devices.values():
-                device.hass_available = False
+                self._device_failed(device)
 
-    async def update(self) -> dict[str, list[RointeDevice]]:
-        """Retrieve the devices from the user's installation.
+    def _device_failed(self, device: RointeDevice) -> None:
+        """Record a failed read of a device.
 
-        Returns a list of newly discovered devices.
+        The device keeps its last known state until it has gone without a
+        successful read for longer than the grace period.
         """
 
-        LOGGER.debug("Device manager updating")
+        last_good = self._last_good.get(device.id)
 
-        installation_devices_response: ApiResponse = (
-            await self.hass.async_add_executor_job(
-                self.rointe_api.get_installation_devices, self.installation_id
+        if (
+            last_good is not None
+            and dt_util.utcnow() - last_good < DEVICE_UNAVAILABLE_GRACE_PERIOD
+        ):
+            LOGGER.debug(
+                "Serving cached state for %s, last read at %s", device.name, last_good
             )
+            return
+
+        self._set_available(device, False)
+
+    def _set_available(self, device: RointeDevice, available: bool) -> None:
+        """Set the availability of a device, recording the change."""
+
+        if device.hass_available != available:
+            device.hass_available = available
+            self._device_changed(device)
+
+    def _device_changed(self, device: RointeDevice) -> None:
+        """Record a change of a device and publish its new state."""
+
+        self._state_version += 1
+        self.device_states[device.id] = RointeDeviceState.from_device(
+            device, self._state_version
         )
+        self.changed_device_ids.add(device.id)
+
+    def pop_changed_device_ids(self) -> set[str]:
+        """Return and reset the IDs of devices that changed since the last call."""
 
-        if not installation_devices_response.success:
-            LOGGER.error(
-                "Unable to get zone devices. Error: %s",
-                installation_devices_response.error_message,
+        changed_device_ids = self.changed_device_ids
+        self.changed_device_ids = set()
+
+        return changed_device_ids
+
+    async def update(
+        self,
+        refresh_energy: bool = True,
+        refresh_installation: bool = True,
+        full_read: bool = True,
+    ) -> dict[str, list[RointeDevice]]:
+        """Retrieve the devices from the user's installation.
+
+        Energy stats are only requested when `refresh_energy` is set (and for newly
+        seen devices), otherwise the last known values are kept.
+
+        Devices read one by one only have their data node requested unless
+        `full_read` is set (or they're newly seen). Their firmware and hardware
+        info is then kept from the last full read.
+
+        The installation's device IDs are only requested when
+        `refresh_installation` is set or a device went missing, otherwise the
+        cached ones are used.
+
+        Returns a list of newly discovered devices.
+        """
+
+        started_at = time.monotonic()
+        self._update_requests = 0
+
+        try:
+            return await self._async_update(
+                refresh_energy, refresh_installation, full_read
             )
-            self._fail_all_devices()
-            return {}
+        finally:
+            self.last_update_duration = time.monotonic() - started_at
+            self.last_update_requests = self._update_requests
 
-        user_device_ids: list[str] = installation_devices_response.data
-        discovered_devices: dict[str, list[RointeDevice]] = {}
+    def _run_request(
+        self,
+        request: Callable[[], Coroutine[Any, Any, ApiResponse]],
+        name: str,
+        retries: int,
+    ) -> Coroutine[Any, Any, ApiResponse]:
+        """Run a request of the current update through the scheduler."""
 
-        # device_id -> (base data future, energy data future)
-        device_data_futures: dict[str, tuple[asyncio.Future, asyncio.Future]] = {}
-        pending_futures: list[asyncio.Future] = []
+        self._update_requests += 1
 
-        # Firmware data.
-        firmware_map_future: asyncio.Future = self.hass.async_add_executor_job(
-            self.rointe_api.get_latest_firmware
-        )
+        return self.request_scheduler.run(request, name, retries=retries)
 
-        pending_futures.append(firmware_map_future)
+    async def _async_update(
+        self, refresh_energy: bool, refresh_installation: bool, full_read: bool
+    ) -> dict[str, list[RointeDevice]]:
+        """Retrieve the devices from the user's installation."""
 
-        # Dispatch API calls for all devices, in all zones. Each device requires a call
-        # to retrieve its base data and another one for energy data.
-        for device_id in user_device_ids:
-            LOGGER.debug("Found device ID: %s", device_id)
-            futures = (
-                self.hass.async_add_executor_job(self.rointe_api.get_device, device_id),
-                self.hass.async_add_executor_job(
-                    self.rointe_api.get_latest_energy_stats, device_id
+        LOGGER.debug("Device manager updating")
+
+        if refresh_installation or self._device_ids is None:
+            installation_devices_response: ApiResponse = await self._run_request(
+                partial(
+                    self.rointe_api.get_installation_devices,
+                    self.installation_id,
                 ),
+                "get_installation_devices",
+                retries=INSTALLATION_DEVICES_RETRIES,
             )
 
-            pending_futures.extend([futures[0], futures[1]])
-            device_data_futures[device_id] = futures
+            if not installation_devices_response.success and self._device_ids:
+                # Carry on with the devices we know about.
+                LOGGER.warning(
+                    "Unable to get zone devices, using the cached ones. Error: %s",
+                    installation_devices_response.error_message,
+                )
+            elif not installation_devices_response.success:
+                LOGGER.error(
+                    "Unable to get zone devices. Error: %s",
+                    installation_devices_response.error_message,
+                )
+                self._fail_all_devices()
+                return {}
+            elif self._device_ids is not None and set(self._device_ids) != set(
+                installation_devices_response.data
+            ):
+                LOGGER.debug("Installation devices changed")
 
-        # Gather all futures.
-        await asyncio.gather(*pending_futures)
+            if installation_devices_response.success:
+                self._device_ids = installation_devices_response.data
 
-        # Firmware data result.
-        firmware_map_response: ApiResponse = firmware_map_future.result()
+        user_device_ids: list[str] = self._device_ids
+        discovered_devices: dict[str, list[RointeDevice]] = {}
 
-        if firmware_map_response.success and firmware_map_response.data:
-            firmware_map: dict[RointeProduct, dict[str, str]] | None = (
-                firmware_map_response.data
-            )
-        else:
-            LOGGER.error(
-                "Unable to fetch firmware map: %s",
-                firmware_map_response.error_message,
-            )
-            firmware_map = None
+        # Dispatch API calls for all devices, in all zones. The base data of all
+        # devices is read at once and, on energy ticks, each device requires another
+        # call for energy data. The scheduler bounds how many of them are in flight.
+        energy_data_requests: list[Coroutine[Any, Any, ApiResponse | None]] = []
+
+        for device_id in user_device_ids:
+            LOGGER.debug("Found device ID: %s", device_id)
 
-        # Process all completed device data futures.
-        for device_id, device_futures in device_data_futures.items():
-            base_data_response: ApiResponse = device_futures[0].result()
-            energy_data_response: ApiResponse = device_futures[1].result()
+            if refresh_energy or device_id not in self.rointe_devices:
+                energy_data_requests.append(
+                    self._run_request(
+                        partial(self.rointe_api.get_latest_energy_stats, device_id),
+                        "get_latest_energy_stats",
+                        retries=ENERGY_STATS_RETRIES,
+                    )
+                )
+            else:
+                energy_data_requests.append(_no_response())
+
+        # Run all requests. The firmware map comes from the cache and only hits
+        # the API once it's missing or stale.
+        firmware_map, base_data_responses, energy_data_responses = await asyncio.gather(
+            self.firmware_cache.async_get_firmware_map(),
+            self._async_get_devices(user_device_ids, full_read, shared=True),
+            asyncio.gather(*energy_data_requests),
+        )
 
+        LOGGER.debug(
+            "Request queue wait: last %.3fs, average %.3fs, max %.3fs",
+            self.request_scheduler.last_wait,
+            self.request_scheduler.average_wait,
+            self.request_scheduler.max_wait,
+        )
+
+        # Process all device responses.
+        for device_id, base_data_response, energy_data_response in zip(
+            user_device_ids, base_data_responses, energy_data_responses
+        ):
             if not base_data_response.success:
                 LOGGER.warning(
                     "Failed getting device status for %s. Error: %s",
@@ -172,6 +586,11 @@ class RointeDeviceManager:
                     base_data_response.error_message,
                 )
 
+            if _is_missing_device(base_data_response):
+                # Re-validate the installation's devices on the next update.
+                LOGGER.debug("Device %s not found", device_id)
+                self._device_ids = None
+
             new_device = await self._process_api_data(
                 base_data_response, device_id, energy_data_response, firmware_map
             )
@@ -182,18 +601,145 @@ class RointeDeviceManager:
 
         return discovered_devices
 
+    async def _async_get_devices(
+        self, device_ids: list[str], full_read: bool, shared: bool = False
+    ) -> list[ApiResponse]:
+        """Read the base data of the devices, in one request if possible.
+
+        Devices missing from the bulk read, or all of them if it fails, are read
+        one by one. With `shared` set, the bulk read may be shared with the polls
+        of other installations of the account. Returns the response of each
+        device ID.
+        """
+
+        responses: dict[str, ApiResponse] = {}
+
+        if self._bulk_read and len(device_ids) > 1:
+            bulk_response: ApiResponse = await self._run_request(
+                partial(self.rointe_api.get_devices, device_ids, shared=shared),
+                "get_devices",
+                retries=DEVICE_RETRIES,
+            )
+
+            if bulk_response.success and bulk_response.data:
+                responses = {
+                    device_id: ApiResponse(True, device_data, None)
+                    for device_id, device_data in bulk_response.data.items()
+                }
+            elif is_rejected_query(bulk_response):
+                LOGGER.info(
+                    "Bulk device read unavailable, reading devices one by one: %s",
+                    bulk_response.error_message,
+                )
+                self._bulk_read = False
+            else:
+                # Throttled, not authenticated or no devices returned. Read the
+                # devices one by one this time.
+                LOGGER.debug(
+                    "Bulk device read failed: %s",
+                    bulk_response.error_message or "no devices returned",
+                )
+
+        missing_ids = [
+            device_id for device_id in device_ids if device_id not in responses
+        ]
+
+        missing_responses: list[ApiResponse] = await asyncio.gather(
+            *(
+                self._async_get_device(device_id, full_read, retries=DEVICE_RETRIES)
+                for device_id in missing_ids
+            )
+        )
+        responses.update(zip(missing_ids, missing_responses))
+
+        return [responses[device_id] for device_id in device_ids]
+
+    async def _async_get_device(
+        self, device_id: str, full_read: bool, retries: int = 0
+    ) -> ApiResponse:
+        """Read the base data of a single device.
+
+        Unless `full_read` is set, only the data node of a known device is read
+        and merged into its last payload. Firebase can't project the fields of a
+        document, but the data node leaves out the firmware and hardware info.
+        """
+
+        if full_read or (payload := self._device_payloads.get(device_id)) is None:
+            return await self._run_request(
+                partial(self.rointe_api.get_device, device_id),
+                "get_device",
+                retries=retries,
+            )
+
+        response: ApiResponse = await self._run_request(
+            partial(self.rointe_api.get_device_data, device_id),
+            "get_device_data",
+            retries=retries,
+        )
+
+        if not response.success or not response.data:
+            return response
+
+        return ApiResponse(True, {**payload, "data": response.data}, None)
+
+    async def update_device(self, device_id: str) -> bool:
+        """Re-read the state of a single known device.
+
+        Energy stats and the firmware map are left as they are. Return True if the
+        device was updated.
+        """
+
+        if device_id not in self.rointe_devices:
+            return False
+
+        LOGGER.debug("Device manager updating device %s", device_id)
+
+        base_data_response = await self._async_get_device(device_id, full_read=False)
+
+        await self._process_api_data(
+            base_data_response, device_id, None, self.firmware_cache.firmware_map
+        )
+
+        return base_data_response.success
+
+    async def update_devices(self, device_ids: list[str]) -> None:
+        """Re-read the state of several known devices, in one request if possible.
+
+        Energy stats and the firmware map are left as they are.
+        """
+
+        device_ids = [
+            device_id for device_id in device_ids if device_id in self.rointe_devices
+        ]
+
+        if not device_ids:
+            return
+
+        LOGGER.debug("Device manager updating %s devices", len(device_ids))
+
+        base_data_responses = await self._async_get_devices(device_ids, full_read=False)
+
+        for device_id, base_data_response in zip(device_ids, base_data_responses):
+            await self._process_api_data(
+                base_data_response, device_id, None, self.firmware_cache.firmware_map
+            )
+
     async def _process_api_data(
         self,
         base_data_response: ApiResponse,
         device_id: str,
-        energy_data_response: ApiResponse,
+        energy_data_response: ApiResponse | None,
         firmware_map: dict[RointeProduct, dict[str, str]] | None,
     ) -> RointeDevice | None:
-        """Process the data related to a single device."""
+        """Process the data related to a single device.
+
+        A missing or failed `energy_data_response` keeps the device's current
+        energy data, unless the device has no recent energy stats.
+        """
 
         LOGGER.debug("Processing data for device ID: %s", device_id)
 
-        if base_data_response.success:
+        if base_data_response.success and base_data_response.data:
             base_data = base_data_response.data
         else:
             LOGGER.warning(
@@ -202,24 +748,63 @@ class RointeDeviceManager:
                 base_data_response.error_message,
             )
 
-            # Mark the device as unavailable on our existing devices cache.
+            # Mark the device as unavailable on our existing devices cache, once
+            # past the grace period.
             if device_id in self.rointe_devices:
-                self.rointe_devices[device_id].hass_available = False
+                self._device_failed(self.rointe_devices[device_id])
 
             return None
 
-        if energy_data_response.success:
+        if energy_data_response is not None and energy_data_response.success:
             energy_data = energy_data_response.data
-        else:
+        elif (
+            energy_data_response is not None
+            and energy_data_response.error_message == NO_ENERGY_STATS
+        ):
             energy_data = None
+        else:
+            # Not requested on this tick, or failed. Keep the last known stats.
+            energy_data = (
+                self.rointe_devices[device_id].energy_data
+                if device_id in self.rointe_devices
+                else None
+            )
 
         if firmware_map:
-            latest_fw = determine_latest_firmware(base_data_response.data, firmware_map)
+            latest_fw = self._determine_latest_firmware(
+                device_id, base_data, firmware_map
+            )
         else:
             latest_fw = None
 
         return self._add_or_update_device(base_data, energy_data, device_id, latest_fw)
 
+    def _determine_latest_firmware(
+        self,
+        device_id: str,
+        device_data: dict[str, Any],
+        firmware_map: dict[RointeProduct, dict[str, str]],
+    ) -> str | None:
+        """Determine the latest FW for a device, reusing the previous result.
+
+        The result only changes when the firmware map or the device's firmware does.
+        """
+
+        firmware_data = device_data.get("firmware") or {}
+        current_firmware = firmware_data.get("firmware_version_device", None)
+        map_version = self.firmware_cache.version
+
+        if (cached := self._latest_fw_cache.get(device_id)) and cached[:2] == (
+            map_version,
+            current_firmware,
+        ):
+            return cached[2]
+
+        latest_fw = determine_latest_firmware(device_data, firmware_map)
+        self._latest_fw_cache[device_id] = (map_version, current_firmware, latest_fw)
+
+        return latest_fw
+
     def _add_or_update_device(
         self,
         device_data,
@@ -238,15 +823,27 @@ class RointeDeviceManager:
             LOGGER.error("Device ID %s has no valid data. Ignoring", device_id)
             return None
 
+        fingerprint = _payload_fingerprint(device_data, energy_stats, latest_fw)
+        self._last_good[device_id] = dt_util.utcnow()
+
         # Existing device, update it.
         if device_id in self.rointe_devices:
             target_device = self.rointe_devices[device_id]
+            self._device_payloads[device_id] = _trim_payload(device_data)
 
             if not target_device.hass_available:
                 LOGGER.debug("Restoring device %s", target_device.name)
-                target_device.hass_available = True
+                self._set_available(target_device, True)
+
+            if self._fingerprints.get(device_id) == fingerprint:
+                LOGGER.debug(
+                    "Device [%s] unchanged", device_data_data.get("name", "N/A")
+                )
+                return None
 
             target_device.update_data(device_data, energy_stats, latest_fw)
+            self._fingerprints[device_id] = fingerprint
+            self._device_changed(target_device)
 
             LOGGER.debug(
                 "Updating existing device [%s]",
@@ -273,145 +870,383 @@ class RointeDeviceManager:
             else "N/A",
         )
 
-        return RointeDevice(
+        self._device_payloads[device_id] = _trim_payload(device_data)
+        self._fingerprints[device_id] = fingerprint
+
+        device = RointeDevice(
             device_info=device_data,
             device_id=device_id,
             energy_data=energy_stats,
             latest_fw=latest_fw,
         )
+        self._device_changed(device)
+
+        return device
+
+    def apply_stream_event(
+        self, device_id: str, event: str, path: str, data: Any
+    ) -> bool:
+        """Apply a streamed `put` or `patch` on a device's data node.
+
+        Return True if the device was updated.
+        """
+
+        device = self.rointe_devices.get(device_id)
+        payload = self._device_payloads.get(device_id)
+
+        if device is None or payload is None:
+            return False
+
+        try:
+            new_payload = {
+                **payload,
+                "data": _merge_stream_data(payload["data"], event, path, data),
+            }
+            device.update_data(
+                new_payload, device.energy_data, device.latest_firmware_version
+            )
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+            LOGGER.warning("Ignoring invalid stream data for %s: %s", device_id, e)
+            return False
+
+        self._device_payloads[device_id] = _trim_payload(new_payload)
+        self._fingerprints[device_id] = _payload_fingerprint(
+            new_payload, device.energy_data, device.latest_firmware_version
+        )
+        self._device_changed(device)
+
+        return True
 
     async def send_command(
         self, device: RointeDevice, command: RointeCommand, arg
     ) -> bool:
         """Send command to the device."""
 
+        if (command_task := self.queue_command(device, command, arg)) is None:
+            return False
+
+        return await asyncio.shield(command_task)
+
+    @callback
+    def queue_command(
+        self, device: RointeDevice, command: RointeCommand, arg
+    ) -> asyncio.Task[bool] | None:
+        """Apply a command to the device state and queue it for sending.
+
+        Commands sent to the same device within `COMMAND_COALESCE_WINDOW` are
+        merged into a single cloud write of the last one. Returns the task doing
+        that write, shared by all the merged commands, or None if the command isn't
+        supported.
+        """
+
+        if command not in COMMAND_STATE_HANDLERS:
+            LOGGER.warning("Ignoring unsupported command: %s", command)
+            return None
+
         LOGGER.debug(
-            "Sending command [%s] to device ID [%s]. Args: %s",
+            "Queueing command [%s] to device ID [%s]. Args: %s",
             command,
             device.name,
             arg,
         )
 
-        if command == RointeCommand.SET_TEMP:
-            return await self._set_device_temp(device, arg)
+        self._apply_optimistic_state(device, command, arg)
 
-        if command == RointeCommand.SET_PRESET:
-            return await self._set_device_preset(device, arg)
+        if (pending := self._pending_commands.get(device.id)) is not None:
+            LOGGER.debug("Coalescing command [%s] for [%s]", command, device.name)
+            pending.command = command
+            pending.arg = arg
+            return pending.task
+
+        pending = _PendingCommand(command, arg)
+        pending.task = self.hass.async_create_task(
+            self._async_flush_command(device, pending)
+        )
+        self._pending_commands[device.id] = pending
 
-        if command == RointeCommand.SET_HVAC_MODE:
-            return await self._set_device_mode(device, arg)
+        return pending.task
 
-        LOGGER.warning("Ignoring unsupported command: %s", command)
-        return False
+    async def _async_flush_command(
+        self, device: RointeDevice, pending: _PendingCommand
+    ) -> bool:
+        """Wait for the coalescing window to close and send the last command."""
 
-    async def _set_device_temp(self, device: RointeDevice, new_temp: float) -> bool:
-        """Set device temperature."""
+        await asyncio.sleep(COMMAND_COALESCE_WINDOW)
 
-        result: ApiResponse = await self.hass.async_add_executor_job(
-            self.rointe_api.set_device_temp, device, new_temp
+        if pending.replaced_by is not None:
+            # A bulk command was sent to the device instead.
+            return await pending.replaced_by
+
+        self._pending_commands.pop(device.id, None)
+
+        result: ApiResponse = await self.request_scheduler.run(
+            partial(
+                self._async_send_device_command, device, pending.command, pending.arg
+            ),
+            "send_command",
+            priority=True,
         )
 
         if not result.success:
-            LOGGER.debug("_set_device_temp failed: %s", result.error_message)
+            self._command_failed(device, pending.command, result)
+            return False
 
-            # Set the device as unavailable.
-            device.hass_available = False
+        return True
 
-            return False
+    def queue_bulk_command(
+        self, devices: list[RointeDevice], command: RointeCommand, arg
+    ) -> asyncio.Task[dict[str, bool]] | None:
+        """Apply the same command to the state of several devices and send it.
 
-        # Update the device internal status
-        device.temp = new_temp
-        device.mode = RointeOperationMode.MANUAL.value
-        device.power = True
+        Temperature and preset changes are merged into one multi-path update. If
+        the backend rejects it, or for hvac mode changes which need more than one
+        write per device, the commands are sent per device with bounded
+        concurrency. Returns the task sending them, resolving to the result of
+        each device ID, or None if the command isn't supported.
 
-        if new_temp == device.comfort_temp:
-            device.preset = RointePreset.COMFORT
-        elif new_temp == device.eco_temp:
-            device.preset = RointePreset.ECO
-        elif new_temp == device.ice_temp:
-            device.preset = RointePreset.ICE
-        else:
-            device.preset = RointePreset.NONE
+        Commands still waiting to be sent to the devices are replaced by this
+        one, resolving to its result, so they can't overwrite it.
+        """
 
-        return True
+        if command not in COMMAND_STATE_HANDLERS:
+            LOGGER.warning("Ignoring unsupported command: %s", command)
+            return None
 
-    async def _set_device_mode(self, device: RointeDevice, hvac_mode: str) -> bool:
-        """Set the device hvac mode."""
+        replaced: dict[str, _PendingCommand] = {}
 
-        result = await self.hass.async_add_executor_job(
-            self.rointe_api.set_device_mode, device, hvac_mode
+        for device in devices:
+            if (pending := self._pending_commands.pop(device.id, None)) is not None:
+                LOGGER.debug("Replacing command [%s] for [%s]", command, device.name)
+                pending.replaced_by = self.hass.loop.create_future()
+                replaced[device.id] = pending
+
+            self._apply_optimistic_state(device, command, arg)
+
+        return self.hass.async_create_task(
+            self._async_send_bulk_command(devices, command, arg, replaced)
         )
 
-        if not result.success:
-            LOGGER.debug("_set_device_mode failed: %s", result.error_message)
-            # Set the device as unavailable.
-            device.hass_available = False
-            return False
+    async def send_bulk_command(
+        self, devices: list[RointeDevice], command: RointeCommand, arg
+    ) -> dict[str, bool]:
+        """Send the same command to several devices.
 
-        # Update the device's internal status
-        if hvac_mode == HVACMode.OFF:
-            if device.mode == RointeOperationMode.MANUAL:
-                device.temp = RADIATOR_DEFAULT_TEMPERATURE
+        Returns the result of each device ID. See `queue_bulk_command`.
+        """
 
-            device.power = False
-            device.preset = HVACMode.OFF
+        if (command_task := self.queue_bulk_command(devices, command, arg)) is None:
+            return {device.id: False for device in devices}
 
-        elif hvac_mode == HVACMode.HEAT:
-            device.temp = device.comfort_temp
-            device.power = True
-            device.mode = RointeOperationMode.MANUAL.value
-            device.preset = RointePreset.NONE
-
-        elif hvac_mode == RointeOperationMode.MANUAL:
-            current_mode: ScheduleMode = device.get_current_schedule_mode()
-
-            # Set the appropriate temperature and preset according to the schedule.
-            if current_mode == ScheduleMode.COMFORT:
-                device.temp = device.comfort_temp
-                device.preset = RointePreset.COMFORT
-            elif current_mode == ScheduleMode.ECO:
-                device.temp = device.eco_temp
-                device.preset = RointePreset.ECO
-            elif device.ice_mode:
-                device.temp = device.ice_temp
-                device.preset = RointePreset.ICE
-            else:
-                device.temp = RADIATOR_DEFAULT_TEMPERATURE
+        return await command_task
 
-            device.power = True
-            device.mode = RointeOperationMode.MANUAL.value
+    async def _async_send_bulk_command(
+        self,
+        devices: list[RointeDevice],
+        command: RointeCommand,
+        arg,
+        replaced: dict[str, _PendingCommand],
+    ) -> dict[str, bool]:
+        """Send a bulk command, resolving the commands it replaced."""
 
-        return True
+        results: dict[str, bool] = {}
 
-    async def _set_device_preset(self, device: RointeDevice, preset: str) -> bool:
-        """Set device preset mode."""
+        try:
+            results = await self._async_write_bulk_command(devices, command, arg)
+        finally:
+            for device_id, pending in replaced.items():
+                pending.replaced_by.set_result(results.get(device_id, False))
+
+        return results
+
+    async def _async_write_bulk_command(
+        self, devices: list[RointeDevice], command: RointeCommand, arg
+    ) -> dict[str, bool]:
+        """Write a command already applied to several devices to the cloud."""
+
+        if command in MULTI_PATH_BODIES and len(devices) > 1:
+            LOGGER.debug(
+                "Sending command [%s] to %s devices. Args: %s",
+                command,
+                len(devices),
+                arg,
+            )
 
-        result = await self.hass.async_add_executor_job(
-            self.rointe_api.set_device_preset, device, preset
+            result: ApiResponse = await self.request_scheduler.run(
+                partial(
+                    self.rointe_api.set_devices_data,
+                    {
+                        device.id: MULTI_PATH_BODIES[command](device, arg)
+                        for device in devices
+                    },
+                ),
+                "set_devices_data",
+                priority=True,
+            )
+
+            if result.success:
+                return {device.id: True for device in devices}
+
+            LOGGER.debug(
+                "Multi-path update failed, sending commands per device: %s",
+                result.error_message,
+            )
+
+        results: list[ApiResponse] = await asyncio.gather(
+            *(
+                self.request_scheduler.run(
+                    partial(self._async_send_device_command, device, command, arg),
+                    "send_command",
+                    priority=True,
+                )
+                for device in devices
+            )
         )
 
-        if not result.success:
-            LOGGER.debug("_set_device_preset failed: %s", result.error_message)
+        for device, result in zip(devices, results):
+            if not result.success:
+                self._command_failed(device, command, result)
 
-            # Set the device as unavailable.
-            device.hass_available = False
-            return False
+        return {device.id: result.success for device, result in zip(devices, results)}
+
+    def _apply_optimistic_state(
+        self, device: RointeDevice, command: RointeCommand, arg
+    ) -> None:
+        """Apply the expected result of a command to the device state."""
+
+        COMMAND_STATE_HANDLERS[command](device, arg)
+        self._device_changed(device)
+
+        # The device state no longer matches the last payload, so the next read
+        # must be applied even if the payload didn't change.
+        self._fingerprints.pop(device.id, None)
+
+    async def _async_send_device_command(
+        self, device: RointeDevice, command: RointeCommand, arg
+    ) -> ApiResponse:
+        """Write a command to the cloud."""
+
+        LOGGER.debug(
+            "Sending command [%s] to device ID [%s]. Args: %s",
+            command,
+            device.name,
+            arg,
+        )
+
+        if command == RointeCommand.SET_TEMP:
+            return await self.rointe_api.set_device_temp(device, arg)
 
-        # Update the device internal status
-        if preset == PRESET_COMFORT:
-            device.power = True
+        if command == RointeCommand.SET_PRESET:
+            return await self.rointe_api.set_device_preset(device, arg)
+
+        return await self.rointe_api.set_device_mode(device, arg)
+
+    def _command_failed(
+        self, device: RointeDevice, command: RointeCommand, result: ApiResponse
+    ) -> None:
+        """Handle a command the cloud didn't accept."""
+
+        LOGGER.debug("Command [%s] failed: %s", command, result.error_message)
+
+        # Set the device as unavailable.
+        self._set_available(device, False)
+
+
+@dataclass
+class _PendingCommand:
+    """A command waiting for its coalescing window to close."""
+
+    command: RointeCommand
+    arg: Any
+    task: asyncio.Task[bool] | None = None
+
+    # Result of the bulk command sent instead, if one replaced this command.
+    replaced_by: asyncio.Future[bool] | None = None
+
+
+def _apply_device_temp(device: RointeDevice, new_temp: float) -> None:
+    """Apply a new target temperature to the device state."""
+
+    device.temp = new_temp
+    device.mode = RointeOperationMode.MANUAL.value
+    device.power = True
+
+    if new_temp == device.comfort_temp:
+        device.preset = RointePreset.COMFORT
+    elif new_temp == device.eco_temp:
+        device.preset = RointePreset.ECO
+    elif new_temp == device.ice_temp:
+        device.preset = RointePreset.ICE
+    else:
+        device.preset = RointePreset.NONE
+
+
+def _apply_device_mode(device: RointeDevice, hvac_mode: str) -> None:
+    """Apply a new hvac mode to the device state."""
+
+    if hvac_mode == HVACMode.OFF:
+        if device.mode == RointeOperationMode.MANUAL:
+            device.temp = RADIATOR_DEFAULT_TEMPERATURE
+
+        device.power = False
+        device.preset = HVACMode.OFF
+
+    elif hvac_mode == HVACMode.HEAT:
+        device.temp = device.comfort_temp
+        device.power = True
+        device.mode = RointeOperationMode.MANUAL.value
+        device.preset = RointePreset.NONE
+
+    elif hvac_mode == RointeOperationMode.MANUAL:
+        current_mode: ScheduleMode = device.get_current_schedule_mode()
+
+        # Set the appropriate temperature and preset according to the schedule.
+        if current_mode == ScheduleMode.COMFORT:
             device.temp = device.comfort_temp
-            device.mode = RointeOperationMode.MANUAL.value
             device.preset = RointePreset.COMFORT
-        elif preset == PRESET_ECO:
-            device.power = True
+        elif current_mode == ScheduleMode.ECO:
             device.temp = device.eco_temp
-            device.mode = RointeOperationMode.MANUAL.value
             device.preset = RointePreset.ECO
-        elif preset == PRESET_ROINTE_ICE:
-            device.power = True
+        elif device.ice_mode:
             device.temp = device.ice_temp
-            device.mode = RointeOperationMode.MANUAL.value
             device.preset = RointePreset.ICE
+        else:
+            device.temp = RADIATOR_DEFAULT_TEMPERATURE
 
-        return True
+        device.power = True
+        device.mode = RointeOperationMode.MANUAL.value
+
+
+def _apply_device_preset(device: RointeDevice, preset: str) -> None:
+    """Apply a new preset to the device state."""
+
+    if preset == PRESET_COMFORT:
+        device.power = True
+        device.temp = device.comfort_temp
+        device.mode = RointeOperationMode.MANUAL.value
+        device.preset = RointePreset.COMFORT
+    elif preset == PRESET_ECO:
+        device.power = True
+        device.temp = device.eco_temp
+        device.mode = RointeOperationMode.MANUAL.value
+        device.preset = RointePreset.ECO
+    elif preset == PRESET_ROINTE_ICE:
+        device.power = True
+        device.temp = device.ice_temp
+        device.mode = RointeOperationMode.MANUAL.value
+        device.preset = RointePreset.ICE
+
+
+COMMAND_STATE_HANDLERS: dict[RointeCommand, Callable[[RointeDevice, Any], None]] = {
+    RointeCommand.SET_TEMP: _apply_device_temp,
+    RointeCommand.SET_PRESET: _apply_device_preset,
+    RointeCommand.SET_HVAC_MODE: _apply_device_mode,
+}
+
+# Commands whose write is a single data node update, which can be merged with the
+# same command for other devices.
+MULTI_PATH_BODIES: dict[
+    RointeCommand, Callable[[RointeDevice, Any], dict[str, Any]]
+] = {
+    RointeCommand.SET_TEMP: lambda device, new_temp: temp_body(new_temp),
+    RointeCommand.SET_PRESET: preset_body,
+}
@@ -0,0 +1,75 @@
+"""Diagnostics support for the Rointe Heaters integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_INSTALLATION,
+    CONF_LOCAL_ID,
+    CONF_PASSWORD,
+    CONF_REFRESH_TOKEN,
+    CONF_USERNAME,
+    DOMAIN,
+)
+from .coordinator import RointeDataUpdateCoordinator
+
+TO_REDACT = {
+    CONF_INSTALLATION,
+    CONF_LOCAL_ID,
+    CONF_PASSWORD,
+    CONF_REFRESH_TOKEN,
+    CONF_USERNAME,
+    "mac",
+    "serialnumber",
+    "ssid",
+    "unique_id",
+    "userid",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+
+    coordinator: RointeDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    device_manager = coordinator.device_manager
+    scheduler = device_manager.request_scheduler
+    snapshot = device_manager.snapshot()
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "poll": {
+            "update_interval": str(coordinator.update_interval),
+            "last_update_success": coordinator.last_update_success,
+            "last_duration": device_manager.last_update_duration,
+            "last_requests": device_manager.last_update_requests,
+            "streaming": coordinator.stream.connected if coordinator.stream else None,
+        },
+        "scheduler": {
+            "max_concurrent": scheduler.max_concurrent,
+            "requests": scheduler.requests,
+            "queue_wait_last": scheduler.last_wait,
+            "queue_wait_average": scheduler.average_wait,
+            "queue_wait_max": scheduler.max_wait,
+            "throttled": scheduler.throttled,
+            "throttle_remaining": scheduler.throttle_remaining,
+        },
+        "endpoints": scheduler.metrics.as_dict(),
+        "firmware_map_fetched_at": device_manager.firmware_cache.fetched_at,
+        # Listed by index, the device IDs grant access to the devices.
+        "devices": [
+            {
+                "available": device.hass_available,
+                "payload": async_redact_data(
+                    snapshot.get(device_id, {}).get("payload"), TO_REDACT
+                ),
+            }
+            for device_id, device in device_manager.rointe_devices.items()
+        ],
+    }
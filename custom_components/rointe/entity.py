@@ -2,22 +2,25 @@
 
 from __future__ import annotations
 
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, ROINTE_MANUFACTURER
 from .coordinator import RointeDataUpdateCoordinator
-from .device_manager import RointeDevice, RointeDeviceManager
+from .device_manager import RointeDevice, RointeDeviceManager, RointeDeviceState
 
 
 class RointeBaseEntity(CoordinatorEntity):
     """Rointe entity base class."""
 
     def __init__(
-        self, coordinator: RointeDataUpdateCoordinator, unique_id: str
+        self,
+        coordinator: RointeDataUpdateCoordinator,
+        unique_id: str,
+        context: str | None = None,
     ) -> None:
         """Initialize the entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context)
         self._attr_unique_id = unique_id
 
     @property
@@ -26,8 +29,38 @@ class RointeBaseEntity(CoordinatorEntity):
         return self.coordinator.device_manager
 
 
+class RointeInstallationEntity(RointeBaseEntity):
+    """Base class for entities of a whole installation."""
+
+    def __init__(
+        self,
+        coordinator: RointeDataUpdateCoordinator,
+        installation_name: str,
+        unique_id: str,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator, unique_id)
+        self._installation_name = installation_name
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return a device description for device registry."""
+
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.device_manager.installation_id)},
+            manufacturer=ROINTE_MANUFACTURER,
+            name=self._installation_name,
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+
 class RointeRadiatorEntity(RointeBaseEntity):
-    """Base class for entities that support a Radiator device (climate and sensors)."""
+    """Base class for entities that support a Radiator device (climate and sensors).
+
+    The entity listens with its device ID as context, so the coordinator only
+    notifies it when its device changed. It reads the device's last published
+    state rather than the device itself.
+    """
 
     def __init__(
         self,
@@ -36,8 +69,18 @@ class RointeRadiatorEntity(RointeBaseEntity):
         unique_id: str,
     ) -> None:
         """Initialize the entity."""
-        super().__init__(coordinator, unique_id)
-        self._radiator = radiator
+        super().__init__(coordinator, unique_id, context=radiator.id)
+        self._device_id = radiator.id
+
+    @property
+    def _radiator(self) -> RointeDeviceState:
+        """Return the current state of the entity's device."""
+        return self.device_manager.device_states[self._device_id]
+
+    @property
+    def _device(self) -> RointeDevice:
+        """Return the entity's device, to send commands to."""
+        return self.device_manager.rointe_devices[self._device_id]
 
     @property
     def device_info(self) -> DeviceInfo:
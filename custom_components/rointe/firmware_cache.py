@@ -0,0 +1,153 @@
+"""Firmware map cache for the Rointe Heaters integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+from rointesdk.model import RointeProduct
+from rointesdk.rointe_api import ApiResponse
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import RointeAsyncAPI
+from .const import (
+    DEFAULT_FIRMWARE_CACHE_TTL,
+    DOMAIN,
+    FIRMWARE_CACHE_RETRY_INTERVAL,
+    LOGGER,
+)
+from .scheduler import RointeRequestScheduler
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.firmware_map"
+
+FirmwareMap = dict[RointeProduct, dict[str, str] | None]
+
+
+class RointeFirmwareCache:
+    """Cache the firmware update map.
+
+    The map is served from memory (or HA storage after a restart) and refreshed in
+    the background once it's older than the TTL, so polls never wait on it. The
+    refresh goes through the account's request scheduler like any other request.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rointe_api: RointeAsyncAPI,
+        request_scheduler: RointeRequestScheduler,
+        ttl: timedelta = timedelta(hours=DEFAULT_FIRMWARE_CACHE_TTL),
+    ) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.rointe_api = rointe_api
+        self.request_scheduler = request_scheduler
+        self.ttl = ttl
+
+        self.firmware_map: FirmwareMap | None = None
+        self.fetched_at: datetime | None = None
+
+        # Bumped every time the map contents change.
+        self.version = 0
+
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._loaded = False
+        self._last_attempt: datetime | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    async def async_load(self) -> None:
+        """Load the persisted firmware map, if any."""
+
+        self._loaded = True
+
+        if not (stored := await self._store.async_load()):
+            return
+
+        firmware_map: FirmwareMap = {}
+
+        for product_name, upgrade_map in stored.get("firmware_map", {}).items():
+            if product_name in RointeProduct.__members__:
+                firmware_map[RointeProduct[product_name]] = upgrade_map
+
+        if not firmware_map:
+            return
+
+        self.firmware_map = firmware_map
+        self.fetched_at = dt_util.parse_datetime(stored.get("fetched_at", ""))
+        self.version += 1
+
+        LOGGER.debug("Loaded firmware map fetched at %s", self.fetched_at)
+
+    async def async_get_firmware_map(self) -> FirmwareMap | None:
+        """Return the firmware map, refreshing it when missing or stale.
+
+        A missing map is fetched inline. A stale map is returned as-is while a
+        background task revalidates it.
+        """
+
+        if not self._loaded:
+            await self.async_load()
+
+        if self.firmware_map is None:
+            if self._can_attempt():
+                await self._async_refresh()
+        elif self._is_stale() and self._can_attempt() and not self._refreshing:
+            self._refresh_task = self.hass.async_create_background_task(
+                self._async_refresh(), "rointe firmware map refresh"
+            )
+
+        return self.firmware_map
+
+    @property
+    def _refreshing(self) -> bool:
+        """Return True if a background refresh is in progress."""
+        return self._refresh_task is not None and not self._refresh_task.done()
+
+    def _is_stale(self) -> bool:
+        """Return True if the cached map is older than the TTL."""
+        return self.fetched_at is None or dt_util.utcnow() - self.fetched_at > self.ttl
+
+    def _can_attempt(self) -> bool:
+        """Return True if enough time has passed since the last fetch attempt."""
+        return (
+            self._last_attempt is None
+            or dt_util.utcnow() - self._last_attempt > FIRMWARE_CACHE_RETRY_INTERVAL
+        )
+
+    async def _async_refresh(self) -> None:
+        """Fetch the firmware map from the API and persist it."""
+
+        self._last_attempt = dt_util.utcnow()
+
+        firmware_map_response: ApiResponse = await self.request_scheduler.run(
+            self.rointe_api.get_latest_firmware, "get_latest_firmware"
+        )
+
+        if not firmware_map_response.success or not firmware_map_response.data:
+            LOGGER.error(
+                "Unable to fetch firmware map: %s",
+                firmware_map_response.error_message,
+            )
+            return
+
+        self.fetched_at = dt_util.utcnow()
+
+        if firmware_map_response.data != self.firmware_map:
+            LOGGER.debug("Firmware map changed")
+            self.firmware_map = firmware_map_response.data
+            self.version += 1
+
+        await self._store.async_save(
+            {
+                "fetched_at": self.fetched_at.isoformat(),
+                "firmware_map": {
+                    product.name: upgrade_map
+                    for product, upgrade_map in self.firmware_map.items()
+                },
+            }
+        )
@@ -0,0 +1,152 @@
+"""Account-level resources shared by the Rointe Heaters config entries."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .api import RointeAsyncAPI
+from .auth import RointeTokenManager
+from .const import (
+    CONF_FIRMWARE_CACHE_TTL,
+    CONF_LOCAL_ID,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_PASSWORD,
+    CONF_REFRESH_TOKEN,
+    CONF_USERNAME,
+    DEFAULT_FIRMWARE_CACHE_TTL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DOMAIN,
+    LOGGER,
+)
+from .firmware_cache import RointeFirmwareCache
+from .scheduler import RointeRequestScheduler
+
+DATA_HUBS = f"{DOMAIN}_hubs"
+
+# Options applying to the hub, shared by all the entries of the account.
+ACCOUNT_OPTIONS = (CONF_FIRMWARE_CACHE_TTL, CONF_MAX_CONCURRENT_REQUESTS)
+
+
+class RointeAccountHub:
+    """The API client, firmware cache and request scheduler of a Rointe account.
+
+    There's a config entry per installation. All the entries of an account share
+    its hub, so the account keeps a single authenticated session, fetches the
+    firmware map once and all of its requests are bounded by one scheduler.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        username: str,
+        token_manager: RointeTokenManager,
+        rointe_api: RointeAsyncAPI,
+        firmware_cache: RointeFirmwareCache,
+        request_scheduler: RointeRequestScheduler,
+    ) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.username = username
+        self.token_manager = token_manager
+        self.rointe_api = rointe_api
+        self.firmware_cache = firmware_cache
+        self.request_scheduler = request_scheduler
+
+        # Config entries using this hub.
+        self.entry_ids: set[str] = set()
+
+    @callback
+    def async_apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply the account options of an entry."""
+
+        self.firmware_cache.ttl = timedelta(
+            hours=options.get(CONF_FIRMWARE_CACHE_TTL, DEFAULT_FIRMWARE_CACHE_TTL)
+        )
+        self.request_scheduler.max_concurrent = options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        )
+
+    @callback
+    def async_save_tokens(self, refresh_token: str, local_id: str) -> None:
+        """Persist the tokens in all entries so restarts skip the password login."""
+
+        for entry_id in self.entry_ids:
+            if entry := self.hass.config_entries.async_get_entry(entry_id):
+                self.hass.config_entries.async_update_entry(
+                    entry,
+                    data={
+                        **entry.data,
+                        CONF_REFRESH_TOKEN: refresh_token,
+                        CONF_LOCAL_ID: local_id,
+                    },
+                )
+
+
+@callback
+def async_acquire_hub(hass: HomeAssistant, entry: ConfigEntry) -> RointeAccountHub:
+    """Return the hub of the entry's account, creating it if needed.
+
+    The hub takes its firmware cache and scheduler options from the entry, so an
+    entry set up again after changing them applies them to the whole account.
+    """
+
+    hubs: dict[str, RointeAccountHub] = hass.data.setdefault(DATA_HUBS, {})
+    username = entry.data[CONF_USERNAME]
+
+    if (hub := hubs.get(username)) is None:
+        LOGGER.debug("Creating account hub for entry %s", entry.title)
+
+        session = async_get_clientsession(hass)
+        token_manager = RointeTokenManager(
+            hass,
+            session,
+            username,
+            entry.data[CONF_PASSWORD],
+            refresh_token=entry.data.get(CONF_REFRESH_TOKEN),
+            local_id=entry.data.get(CONF_LOCAL_ID),
+        )
+        rointe_api = RointeAsyncAPI(session, token_manager)
+        request_scheduler = RointeRequestScheduler()
+
+        hub = RointeAccountHub(
+            hass,
+            username,
+            token_manager,
+            rointe_api,
+            RointeFirmwareCache(hass, rointe_api, request_scheduler),
+            request_scheduler,
+        )
+        token_manager.on_token_update = hub.async_save_tokens
+        hubs[username] = hub
+    elif hub.token_manager.password != entry.data[CONF_PASSWORD]:
+        # The password was updated by a reauthentication.
+        hub.token_manager.async_update_password(entry.data[CONF_PASSWORD])
+
+    hub.async_apply_options(entry.options)
+    hub.entry_ids.add(entry.entry_id)
+
+    return hub
+
+
+@callback
+def async_release_hub(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Release the entry's hub, shutting it down once no entry uses it."""
+
+    hubs: dict[str, RointeAccountHub] = hass.data.get(DATA_HUBS, {})
+    username = entry.data[CONF_USERNAME]
+
+    if (hub := hubs.get(username)) is None:
+        return
+
+    hub.entry_ids.discard(entry.entry_id)
+
+    if not hub.entry_ids:
+        LOGGER.debug("Shutting down account hub")
+        hub.token_manager.async_stop()
+        hubs.pop(username)
@@ -0,0 +1,92 @@
+"""Request metrics for the Rointe Heaters integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+import math
+from typing import Any
+
+# Number of latency samples kept per endpoint.
+METRICS_SAMPLE_SIZE = 200
+
+
+def _percentile(samples: list[float], percent: float) -> float | None:
+    """Return the nearest-rank percentile of the samples."""
+
+    if not samples:
+        return None
+
+    samples = sorted(samples)
+    rank = max(math.ceil(percent / 100 * len(samples)), 1)
+
+    return samples[rank - 1]
+
+
+@dataclass
+class RointeEndpointMetrics:
+    """Request counts and recent latencies of a single endpoint."""
+
+    requests: int = 0
+    errors: int = 0
+    latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=METRICS_SAMPLE_SIZE)
+    )
+
+    def percentile(self, percent: float) -> float | None:
+        """Return a latency percentile of the recent requests, in seconds."""
+        return _percentile(list(self.latencies), percent)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dictionary."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_p50": self.percentile(50),
+            "latency_p95": self.percentile(95),
+        }
+
+
+class RointeMetrics:
+    """Count requests and errors and track their latency, per endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: dict[str, RointeEndpointMetrics] = {}
+
+    def record_request(self, endpoint: str, latency: float, success: bool) -> None:
+        """Record a completed request."""
+
+        metrics = self.endpoints.setdefault(endpoint, RointeEndpointMetrics())
+        metrics.requests += 1
+        metrics.latencies.append(latency)
+
+        if not success:
+            metrics.errors += 1
+
+    @property
+    def requests(self) -> int:
+        """Total number of requests."""
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        """Total number of failed requests."""
+        return sum(metrics.errors for metrics in self.endpoints.values())
+
+    def percentile(self, percent: float) -> float | None:
+        """Return a latency percentile of the recent requests to all endpoints."""
+        return _percentile(
+            [
+                latency
+                for metrics in self.endpoints.values()
+                for latency in metrics.latencies
+            ],
+            percent,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics of each endpoint as a dictionary."""
+        return {
+            endpoint: metrics.as_dict() for endpoint, metrics in self.endpoints.items()
+        }
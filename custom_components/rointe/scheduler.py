@@ -0,0 +1,252 @@
+"""Bounded-concurrency request scheduler for the Rointe API."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import contextlib
+import random
+import time
+
+from rointesdk.rointe_api import ApiResponse
+
+from .api import is_throttled, is_transient_error
+from .const import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    LOGGER,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_PER_SECOND,
+    REQUEST_RETRY_BACKOFF,
+    REQUEST_START_JITTER,
+    REQUEST_TIMEOUT,
+    THROTTLE_BACKOFF_MAX,
+    THROTTLE_BACKOFF_MIN,
+)
+from .metrics import RointeMetrics
+
+
+class RointeRequestScheduler:
+    """Run API requests with a bounded number of them in flight.
+
+    Each request starts after a small random delay, waits for a free slot and is
+    then given `timeout` seconds to complete. A request that times out resolves to
+    a failed `ApiResponse`, so one slow device doesn't fail the whole refresh.
+
+    Requests are also rate limited by a token bucket refilled with `rate` tokens
+    per second and holding up to `burst` of them. Priority requests, the commands,
+    skip the start delay and go ahead of any waiting regular request.
+
+    When the cloud throttles a request, the requests made during the `Retry-After`
+    delay or an exponential backoff, whichever is longer, fail without being sent.
+
+    Requests can be retried on transient errors, waiting `retry_backoff` seconds
+    before the first retry and twice as long before each following one. The slot
+    is released while waiting.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        timeout: float = REQUEST_TIMEOUT,
+        jitter: float = REQUEST_START_JITTER,
+        retry_backoff: float = REQUEST_RETRY_BACKOFF,
+        rate: float = RATE_LIMIT_PER_SECOND,
+        burst: int = RATE_LIMIT_BURST,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self.jitter = jitter
+        self.retry_backoff = retry_backoff
+        self.rate = rate
+        self.burst = burst
+
+        self._condition = asyncio.Condition()
+        self._in_flight = 0
+        self._waiting_priority = 0
+
+        # Rate limiter token bucket.
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+
+        # Cloud throttling.
+        self._throttled_until = 0.0
+        self._throttle_count = 0
+        self.throttled = 0
+
+        # Queue wait time metrics, in seconds.
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+        # Request count, error and latency metrics per request name.
+        self.metrics = RointeMetrics()
+
+    @property
+    def average_wait(self) -> float:
+        """Average time a request spent waiting for a free slot."""
+        return self.total_wait / self.requests if self.requests else 0.0
+
+    @property
+    def throttle_remaining(self) -> float:
+        """Seconds until requests stop being held back by cloud throttling."""
+        return max(self._throttled_until - time.monotonic(), 0.0)
+
+    async def run(
+        self,
+        request: Callable[[], Awaitable[ApiResponse]],
+        name: str,
+        retries: int = 0,
+        priority: bool = False,
+    ) -> ApiResponse:
+        """Run a request once a slot is available, retrying transient errors."""
+
+        if self.jitter and not priority:
+            await asyncio.sleep(random.uniform(0, self.jitter))
+
+        response = await self._run_once(request, name, priority)
+
+        for attempt in range(retries):
+            if not is_transient_error(response) or self.throttle_remaining:
+                break
+
+            delay = self.retry_backoff * 2**attempt
+            LOGGER.debug("Retrying %s in %ss: %s", name, delay, response.error_message)
+            await asyncio.sleep(delay)
+
+            response = await self._run_once(request, name, priority)
+
+        return response
+
+    async def _run_once(
+        self,
+        request: Callable[[], Awaitable[ApiResponse]],
+        name: str,
+        priority: bool,
+    ) -> ApiResponse:
+        """Run a single attempt of a request.
+
+        While the cloud throttles requests only priority ones are sent, still
+        limited by the token bucket, so user commands don't fail.
+        """
+
+        if self.throttle_remaining and not priority:
+            return self._held_back(name)
+
+        queued_at = time.monotonic()
+        await self._acquire(priority)
+
+        try:
+            started_at = time.monotonic()
+            self._record_wait(started_at - queued_at)
+
+            # Throttling may have started while the request was queued.
+            if self.throttle_remaining and not priority:
+                return self._held_back(name)
+
+            try:
+                async with asyncio.timeout(self.timeout):
+                    response = await request()
+            except TimeoutError:
+                LOGGER.warning("Request %s timed out after %ss", name, self.timeout)
+                response = ApiResponse(False, None, f"{name} timed out")
+
+            self.metrics.record_request(
+                name, time.monotonic() - started_at, response.success
+            )
+        finally:
+            await self._release()
+
+        if is_throttled(response):
+            self._throttle(name, response.data)
+        elif response.success:
+            self._throttle_count = 0
+
+        return response
+
+    async def _acquire(self, priority: bool) -> None:
+        """Wait for a free slot and a rate limiter token."""
+
+        async with self._condition:
+            if priority:
+                self._waiting_priority += 1
+
+            try:
+                while (delay := self._acquire_delay(priority)) != 0:
+                    # Without a delay, wait until a request completes.
+                    with contextlib.suppress(TimeoutError):
+                        async with asyncio.timeout(delay):
+                            await self._condition.wait()
+            finally:
+                # Regular requests held back by priority ones, which may have
+                # been cancelled, can go ahead once none are left.
+                if priority:
+                    self._waiting_priority -= 1
+
+                    if not self._waiting_priority:
+                        self._condition.notify_all()
+
+            self._tokens -= 1
+            self._in_flight += 1
+
+    def _acquire_delay(self, priority: bool) -> float | None:
+        """Return how long to wait before a request can start.
+
+        Returns 0 if it can start now, or None if it has to wait until a request
+        completes.
+        """
+
+        now = time.monotonic()
+
+        if self._in_flight >= self.max_concurrent or (
+            not priority and self._waiting_priority
+        ):
+            return None
+
+        self._tokens = min(
+            self._tokens + (now - self._refilled_at) * self.rate, self.burst
+        )
+        self._refilled_at = now
+
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+
+        return 0
+
+    async def _release(self) -> None:
+        """Free the slot of a completed request."""
+
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def _throttle(self, name: str, retry_after: float | None) -> None:
+        """Hold back all requests after the cloud throttled one."""
+
+        delay = max(
+            retry_after or 0,
+            min(THROTTLE_BACKOFF_MIN * 2**self._throttle_count, THROTTLE_BACKOFF_MAX),
+        )
+        self._throttle_count += 1
+        self.throttled += 1
+
+        LOGGER.warning("Request %s was throttled, backing off for %ss", name, delay)
+
+        self._throttled_until = max(self._throttled_until, time.monotonic() + delay)
+
+    def _held_back(self, name: str) -> ApiResponse:
+        """Return the response of a request not sent due to cloud throttling."""
+
+        LOGGER.debug(
+            "Holding back %s, throttled for %ss", name, self.throttle_remaining
+        )
+        return ApiResponse(False, None, f"{name} held back while throttled")
+
+    def _record_wait(self, wait: float) -> None:
+        """Record the time a request spent queued."""
+
+        self.requests += 1
+        self.total_wait += wait
+        self.last_wait = wait
+        self.max_wait = max(self.max_wait, wait)
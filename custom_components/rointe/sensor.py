@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
 
 from rointesdk.device import RointeDevice
@@ -9,10 +11,16 @@ from rointesdk.device import RointeDevice
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfEnergy, UnitOfPower, UnitOfTemperature
+from homeassistant.const import (
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -20,7 +28,7 @@ from homeassistant.helpers.typing import StateType
 
 from .const import DOMAIN
 from .coordinator import RointeDataUpdateCoordinator, RointeSensorEntityDescription
-from .entity import RointeRadiatorEntity
+from .entity import RointeInstallationEntity, RointeRadiatorEntity
 
 
 def _get_energy_last_reset(radiator) -> datetime | None:
@@ -83,6 +91,122 @@ SENSOR_DESCRIPTIONS = [
 ]
 
 
+@dataclass
+class RointeInstallationSensorEntityDescriptionMixin:
+    """Define a description mixin for Rointe installation sensor entities."""
+
+    name_suffix: str
+    value_fn: Callable[[RointeDataUpdateCoordinator], StateType]
+
+
+@dataclass
+class RointeInstallationSensorEntityDescription(
+    SensorEntityDescription, RointeInstallationSensorEntityDescriptionMixin
+):
+    """Define an object to describe Rointe installation sensor entities."""
+
+    last_reset_fn: Callable[[RointeDataUpdateCoordinator], datetime | None] = (
+        lambda coordinator: None
+    )
+
+
+def _get_latency_percentile(
+    coordinator: RointeDataUpdateCoordinator, percent: float
+) -> float | None:
+    """Return a request latency percentile, in seconds."""
+    return coordinator.device_manager.request_scheduler.metrics.percentile(percent)
+
+
+# Power and energy consumption of all the installation's devices.
+INSTALLATION_TOTAL_SENSOR_DESCRIPTIONS = [
+    RointeInstallationSensorEntityDescription(
+        key="total_energy_consumption",
+        name_suffix="Energy Consumption",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL,
+        value_fn=lambda coordinator: coordinator.total_energy,
+        last_reset_fn=lambda coordinator: coordinator.total_energy_start,
+    ),
+    RointeInstallationSensorEntityDescription(
+        key="total_power",
+        name_suffix="Effective Power",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.total_power,
+    ),
+]
+
+# Polling and request metrics. Their value changes on every poll, so all but the
+# poll duration are disabled by default.
+INSTALLATION_SENSOR_DESCRIPTIONS = [
+    RointeInstallationSensorEntityDescription(
+        key="poll_duration",
+        name_suffix="Last Poll Duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda coordinator: coordinator.device_manager.last_update_duration,
+    ),
+    RointeInstallationSensorEntityDescription(
+        key="poll_requests",
+        name_suffix="Requests Per Poll",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.device_manager.last_update_requests,
+    ),
+    RointeInstallationSensorEntityDescription(
+        key="request_errors",
+        name_suffix="Request Errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: (
+            coordinator.device_manager.request_scheduler.metrics.errors
+        ),
+    ),
+    RointeInstallationSensorEntityDescription(
+        key="request_latency_p50",
+        name_suffix="Request Latency p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _get_latency_percentile(coordinator, 50),
+    ),
+    RointeInstallationSensorEntityDescription(
+        key="request_latency_p95",
+        name_suffix="Request Latency p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: _get_latency_percentile(coordinator, 95),
+    ),
+    RointeInstallationSensorEntityDescription(
+        key="request_queue_wait",
+        name_suffix="Request Queue Wait",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=3,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: (
+            coordinator.device_manager.request_scheduler.average_wait
+        ),
+    ),
+]
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -95,6 +219,13 @@ async def async_setup_entry(
         async_add_entities, SENSOR_DESCRIPTIONS, RointeGenericSensor
     )
 
+    async_add_entities(
+        RointeInstallationSensor(coordinator, entry.title, description)
+        for description in (
+            INSTALLATION_TOTAL_SENSOR_DESCRIPTIONS + INSTALLATION_SENSOR_DESCRIPTIONS
+        )
+    )
+
 
 class RointeGenericSensor(RointeRadiatorEntity, SensorEntity):
     """Generic radiator sensor."""
@@ -130,3 +261,39 @@ class RointeGenericSensor(RointeRadiatorEntity, SensorEntity):
     def last_reset(self) -> datetime | None:
         """Return the last time the sensor was initialized, if relevant."""
         return self.entity_description.last_reset_fn(self._radiator)
+
+
+class RointeInstallationSensor(RointeInstallationEntity, SensorEntity):
+    """Installation-wide sensor."""
+
+    entity_description: RointeInstallationSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: RointeDataUpdateCoordinator,
+        installation_name: str,
+        description: RointeInstallationSensorEntityDescription,
+    ) -> None:
+        """Initialize an installation sensor."""
+        super().__init__(
+            coordinator,
+            installation_name,
+            unique_id=f"{coordinator.device_manager.installation_id}-{description.key}",
+        )
+
+        self.entity_description = description
+
+    @property
+    def name(self) -> str:
+        """Return the entity's name."""
+        return f"{self._installation_name} {self.entity_description.name_suffix}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the sensor value."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def last_reset(self) -> datetime | None:
+        """Return the last time the sensor was initialized, if relevant."""
+        return self.entity_description.last_reset_fn(self.coordinator)
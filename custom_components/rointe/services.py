@@ -0,0 +1,114 @@
+"""Services for the Rointe Heaters integration."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.climate import ATTR_PRESET_MODE, DOMAIN as CLIMATE_DOMAIN
+from homeassistant.const import ATTR_TEMPERATURE
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+
+from .climate import AVAILABLE_PRESETS, RADIATOR_TEMP_MAX, RADIATOR_TEMP_MIN
+from .const import DOMAIN, LOGGER, RointeCommand
+from .coordinator import RointeDataUpdateCoordinator
+
+SERVICE_SET_TEMPERATURE_BULK = "set_temperature_bulk"
+SERVICE_SET_PRESET_BULK = "set_preset_bulk"
+
+SET_TEMPERATURE_BULK_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Required(ATTR_TEMPERATURE): vol.All(
+            vol.Coerce(float), vol.Range(min=RADIATOR_TEMP_MIN, max=RADIATOR_TEMP_MAX)
+        ),
+    }
+)
+
+SET_PRESET_BULK_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Required(ATTR_PRESET_MODE): vol.In(AVAILABLE_PRESETS),
+    }
+)
+
+
+def _targeted_devices(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict[RointeDataUpdateCoordinator, list[str]]:
+    """Resolve the targeted climate entities to device IDs, grouped by entry."""
+
+    entity_registry = er.async_get(hass)
+    selected = async_extract_referenced_entity_ids(hass, call)
+    targets: dict[RointeDataUpdateCoordinator, list[str]] = defaultdict(list)
+
+    for entity_id in selected.referenced | selected.indirectly_referenced:
+        entry = entity_registry.async_get(entity_id)
+
+        if (
+            entry is None
+            or entry.platform != DOMAIN
+            or entry.domain != CLIMATE_DOMAIN
+            or entry.config_entry_id not in hass.data.get(DOMAIN, {})
+        ):
+            continue
+
+        # Climate entities use the radiator ID as their unique ID.
+        targets[hass.data[DOMAIN][entry.config_entry_id]].append(entry.unique_id)
+
+    return targets
+
+
+async def _async_send_bulk_command(
+    hass: HomeAssistant, call: ServiceCall, command: RointeCommand, arg: Any
+) -> None:
+    """Send a command to all targeted radiators."""
+
+    failed: list[str] = []
+
+    for coordinator, device_ids in _targeted_devices(hass, call).items():
+        LOGGER.debug("Bulk command [%s] for %s", command, device_ids)
+        results = await coordinator.async_send_bulk_command(device_ids, command, arg)
+        failed.extend(
+            coordinator.device_manager.rointe_devices[device_id].name
+            for device_id, success in results.items()
+            if not success
+        )
+
+    if failed:
+        raise HomeAssistantError(f"Failed to send {command} to {', '.join(failed)}")
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_set_temperature_bulk(call: ServiceCall) -> None:
+        """Set the target temperature of several radiators."""
+
+        # Round to the nearest half value.
+        rounded_temp = round(call.data[ATTR_TEMPERATURE] * 2) / 2
+
+        await _async_send_bulk_command(hass, call, RointeCommand.SET_TEMP, rounded_temp)
+
+    async def async_set_preset_bulk(call: ServiceCall) -> None:
+        """Set the preset of several radiators."""
+
+        await _async_send_bulk_command(
+            hass, call, RointeCommand.SET_PRESET, call.data[ATTR_PRESET_MODE]
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_TEMPERATURE_BULK,
+        async_set_temperature_bulk,
+        schema=SET_TEMPERATURE_BULK_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_PRESET_BULK,
+        async_set_preset_bulk,
+        schema=SET_PRESET_BULK_SCHEMA,
+    )
@@ -0,0 +1,43 @@
+"""Device snapshot storage for the Rointe Heaters integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.snapshot"
+
+DeviceSnapshot = dict[str, dict[str, Any]]
+
+
+class RointeSnapshotStore:
+    """Persist the last known state of the devices of an installation.
+
+    The snapshot lets the entities be created at startup before the cloud has
+    been reached. Saves are delayed so frequent changes result in a single write.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[DeviceSnapshot] = Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry_id}"
+        )
+
+    async def async_load(self) -> DeviceSnapshot:
+        """Return the stored snapshot, empty if there's none."""
+        return await self._store.async_load() or {}
+
+    @callback
+    def async_schedule_save(self, snapshot_fn: Callable[[], DeviceSnapshot]) -> None:
+        """Save the snapshot returned by `snapshot_fn` after a delay."""
+        self._store.async_delay_save(snapshot_fn, SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the stored snapshot."""
+        await self._store.async_remove()
@@ -0,0 +1,204 @@
+"""Long-term energy statistics importer for the Rointe Heaters integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from functools import partial
+
+from rointesdk.device import RointeDevice
+from rointesdk.rointe_api import ApiResponse
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+    statistics_during_period,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import (
+    DOMAIN,
+    LOGGER,
+    STATISTICS_BACKFILL_DAYS,
+    STATISTICS_HOUR_SETTLE_TIME,
+    STATISTICS_IMPORT_BATCH_SIZE,
+    STATISTICS_REIMPORT_WINDOW,
+)
+from .device_manager import RointeDeviceManager
+
+DAY_ENERGY_STATS_RETRIES = 1
+
+
+def energy_statistic_id(device_id: str) -> str:
+    """Return the ID of the energy statistic of a device."""
+    return f"{DOMAIN}:energy_{slugify(device_id)}"
+
+
+class RointeStatisticsImporter:
+    """Import the hourly energy consumption of the devices as statistics.
+
+    Each run continues from the last imported hour, so consumption during HA
+    downtime isn't lost, and overwrites the hours imported in the
+    `STATISTICS_REIMPORT_WINDOW` before it, which the devices may have reported
+    late. Devices without statistics get the last `STATISTICS_BACKFILL_DAYS`
+    days. Each day is a single request. Days that can't be read keep the hours
+    already imported, and the import stops at the first one with hours never
+    imported, so the next run continues from there.
+
+    Devices are imported one at a time, so the import, a backfill in particular,
+    uses a single slot of the request scheduler and leaves the rest to polls and
+    commands.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, device_manager: RointeDeviceManager
+    ) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self.device_manager = device_manager
+
+        self._lock = asyncio.Lock()
+
+    async def async_import(self, now: datetime | None = None) -> None:
+        """Import the hours missing from the statistics of every device."""
+
+        if self._lock.locked():
+            LOGGER.debug("Statistics import already running")
+            return
+
+        async with self._lock:
+            for device in list(self.device_manager.rointe_devices.values()):
+                await self._async_import_device(device)
+
+    async def _async_import_device(self, device: RointeDevice) -> None:
+        """Import the hours missing from the statistics of a device."""
+
+        statistic_id = energy_statistic_id(device.id)
+        end = dt_util.utcnow() - STATISTICS_HOUR_SETTLE_TIME
+        start, total, imported = await self._async_get_import_start(statistic_id, end)
+
+        if start is None:
+            return
+
+        metadata = StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{device.name} Energy Consumption",
+            source=DOMAIN,
+            statistic_id=statistic_id,
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        )
+
+        LOGGER.debug("Importing energy statistics of %s since %s", device.name, start)
+
+        statistics: list[StatisticData] = []
+        day = dt_util.as_local(start).date()
+        imported_until = max(imported) + timedelta(hours=1) if imported else start
+
+        while day <= dt_util.as_local(end).date():
+            response: ApiResponse = await self.device_manager.request_scheduler.run(
+                partial(
+                    self.device_manager.rointe_api.get_day_energy_stats, device.id, day
+                ),
+                "get_day_energy_stats",
+                retries=DAY_ENERGY_STATS_RETRIES,
+            )
+
+            if response.success:
+                hours = [
+                    (stats.start, stats.kwh)
+                    for stats in response.data
+                    if stats.start >= start and stats.end <= end
+                ]
+            elif dt_util.start_of_local_day(day + timedelta(days=1)) > imported_until:
+                # Stop before the hours never imported, the next run continues
+                # from there.
+                LOGGER.warning(
+                    "Unable to get the energy stats of %s for %s, importing them "
+                    "on the next run: %s",
+                    device.name,
+                    day,
+                    response.error_message,
+                )
+                break
+            else:
+                # Keep the hours already imported for the day, with their sums
+                # following the hours before.
+                LOGGER.debug(
+                    "Unable to get the energy stats of %s for %s: %s",
+                    device.name,
+                    day,
+                    response.error_message,
+                )
+                hours = [
+                    (hour_start, kwh)
+                    for hour_start, kwh in imported.items()
+                    if dt_util.as_local(hour_start).date() == day
+                ]
+
+            for hour_start, kwh in hours:
+                total += kwh
+                statistics.append(StatisticData(start=hour_start, state=kwh, sum=total))
+
+            if len(statistics) >= STATISTICS_IMPORT_BATCH_SIZE:
+                async_add_external_statistics(self.hass, metadata, statistics)
+                statistics = []
+
+            day += timedelta(days=1)
+
+        if statistics:
+            async_add_external_statistics(self.hass, metadata, statistics)
+
+    async def _async_get_import_start(
+        self, statistic_id: str, end: datetime
+    ) -> tuple[datetime | None, float, dict[datetime, float]]:
+        """Return the first hour to import and the energy sum before it.
+
+        Also returns the energy of the hours already imported from then on. The
+        first hour is None if no hour ended since the last import.
+        """
+
+        recorder = get_instance(self.hass)
+        last_stats = await recorder.async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+        )
+
+        if not (rows := last_stats.get(statistic_id)):
+            start = dt_util.start_of_local_day() - timedelta(
+                days=STATISTICS_BACKFILL_DAYS
+            )
+            return start, 0.0, {}
+
+        next_hour = dt_util.utc_from_timestamp(rows[0]["start"]) + timedelta(hours=1)
+
+        if next_hour + timedelta(hours=1) > end:
+            return None, 0.0, {}
+
+        start = next_hour - STATISTICS_REIMPORT_WINDOW
+        stats = await recorder.async_add_executor_job(
+            statistics_during_period,
+            self.hass,
+            start,
+            None,
+            {statistic_id},
+            "hour",
+            None,
+            {"state", "sum"},
+        )
+        window_rows = stats.get(statistic_id, [])
+        imported = {
+            dt_util.utc_from_timestamp(row["start"]): row.get("state") or 0.0
+            for row in window_rows
+        }
+
+        # The sum before the first hour re-read.
+        total = 0.0
+        if window_rows:
+            first = window_rows[0]
+            total = (first.get("sum") or 0.0) - (first.get("state") or 0.0)
+
+        return start, total, imported
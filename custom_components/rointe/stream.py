@@ -0,0 +1,223 @@
+"""Firebase event stream for Rointe devices."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import json
+from typing import Any
+
+import aiohttp
+from rointesdk.settings import FIREBASE_DEVICE_DATA_PATH_BY_ID
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.ssl import get_default_context
+
+from .api import RointeAsyncAPI
+from .const import (
+    LOGGER,
+    STREAM_MAX_DEVICES,
+    STREAM_READ_TIMEOUT,
+    STREAM_RETRY_MAX,
+    STREAM_RETRY_MIN,
+)
+
+StreamEventCallback = Callable[[str, str, str, Any], None]
+StreamConnectionCallback = Callable[[bool], None]
+
+
+class RointeDeviceStream:
+    """Subscribe to the data node of each device using Firebase event streams.
+
+    `put` and `patch` events are forwarded to `on_event` as
+    `(device_id, event, path, data)`. `on_connection_change` is called whenever
+    the stream goes from all devices connected to any device disconnected, or
+    back.
+
+    Malformed events are skipped, and so are events `on_event` ignores. Any
+    other error reading a device stream, like `on_event` raising, reopens it,
+    starting again from a full snapshot of the device.
+
+    The streams use a session of their own unless given one, so they don't take
+    the connections of the shared session polls and commands use. Up to
+    `STREAM_MAX_DEVICES` devices are streamed, larger installations aren't.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rointe_api: RointeAsyncAPI,
+        on_event: StreamEventCallback,
+        on_connection_change: StreamConnectionCallback,
+        session: aiohttp.ClientSession | None = None,
+    ) -> None:
+        """Initialize the stream."""
+        self.hass = hass
+        self.rointe_api = rointe_api
+        self._on_event = on_event
+        self._on_connection_change = on_connection_change
+        self._session = session
+        self._own_session: aiohttp.ClientSession | None = None
+        self._too_many_devices = False
+
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._connected_devices: set[str] = set()
+        self.connected = False
+
+    @callback
+    def async_track_devices(self, device_ids: list[str]) -> None:
+        """Start streaming new devices and stop streaming removed ones."""
+
+        too_many_devices = len(device_ids) > STREAM_MAX_DEVICES
+
+        if too_many_devices and not self._too_many_devices:
+            LOGGER.warning(
+                "Not streaming more than %s devices, polling them instead",
+                STREAM_MAX_DEVICES,
+            )
+
+        self._too_many_devices = too_many_devices
+
+        if too_many_devices:
+            device_ids = []
+
+        for device_id in set(self._tasks) - set(device_ids):
+            self._tasks.pop(device_id).cancel()
+            self._set_device_connected(device_id, False)
+
+        for device_id in device_ids:
+            if device_id not in self._tasks:
+                self._tasks[device_id] = self.hass.async_create_background_task(
+                    self._async_stream_device(device_id),
+                    f"rointe device stream {device_id}",
+                )
+
+        self._update_connected()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop all device streams."""
+
+        for task in self._tasks.values():
+            task.cancel()
+
+        self._tasks.clear()
+        self._connected_devices.clear()
+        self._update_connected()
+
+        if self._own_session:
+            self.hass.async_create_background_task(
+                self._own_session.close(), "rointe device stream session close"
+            )
+            self._own_session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the session of the streams, creating it if needed."""
+
+        if self._session:
+            return self._session
+
+        if self._own_session is None:
+            self._own_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=STREAM_MAX_DEVICES, ssl=get_default_context()
+                )
+            )
+
+        return self._own_session
+
+    async def _async_stream_device(self, device_id: str) -> None:
+        """Keep a device stream open, reconnecting with backoff."""
+
+        url = (
+            f"{self.rointe_api.base_url}"
+            f"{FIREBASE_DEVICE_DATA_PATH_BY_ID.format(device_id)}"
+        )
+        retry_delay = STREAM_RETRY_MIN
+
+        while True:
+            try:
+                if auth_token := await self.rointe_api.async_get_auth_token():
+                    async with self.session.get(
+                        url,
+                        params={"auth": auth_token},
+                        headers={"Accept": "text/event-stream"},
+                        timeout=aiohttp.ClientTimeout(sock_read=STREAM_READ_TIMEOUT),
+                    ) as response:
+                        if response.status == 200:
+                            LOGGER.debug("Stream connected for %s", device_id)
+                            self._set_device_connected(device_id, True)
+                            retry_delay = STREAM_RETRY_MIN
+                            await self._async_read_events(device_id, response)
+                        else:
+                            LOGGER.debug(
+                                "Stream for %s returned %s", device_id, response.status
+                            )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                LOGGER.debug("Stream for %s disconnected: %s", device_id, e)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Unexpected error in the stream of %s", device_id)
+            finally:
+                # Also runs when the stream is cancelled.
+                self._set_device_connected(device_id, False)
+
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, STREAM_RETRY_MAX)
+
+    async def _async_read_events(
+        self, device_id: str, response: aiohttp.ClientResponse
+    ) -> None:
+        """Read server-sent events until the stream ends or must be reopened."""
+
+        event: str | None = None
+
+        async for raw_line in response.content:
+            try:
+                line = raw_line.decode().rstrip("\r\n")
+            except UnicodeDecodeError:
+                LOGGER.warning("Invalid stream line for %s", device_id)
+                continue
+
+            if line.startswith("event:"):
+                event = line[6:].strip()
+                continue
+
+            if not line.startswith("data:"):
+                continue
+
+            if event in ("put", "patch"):
+                try:
+                    payload = json.loads(line[5:])
+                    path, data = payload["path"], payload["data"]
+                except (KeyError, TypeError, ValueError):
+                    LOGGER.warning("Invalid stream payload for %s", device_id)
+                    continue
+
+                self._on_event(device_id, event, path, data)
+
+            elif event in ("cancel", "auth_revoked"):
+                # Reconnect, fetching a new auth token if needed.
+                LOGGER.debug("Stream for %s received %s", device_id, event)
+                return
+
+    @callback
+    def _set_device_connected(self, device_id: str, connected: bool) -> None:
+        """Track the connection state of a single device."""
+
+        if connected:
+            self._connected_devices.add(device_id)
+        else:
+            self._connected_devices.discard(device_id)
+
+        self._update_connected()
+
+    @callback
+    def _update_connected(self) -> None:
+        """Notify when the overall connection state changes."""
+
+        connected = bool(self._tasks) and self._connected_devices >= set(self._tasks)
+
+        if connected != self.connected:
+            self.connected = connected
+            self._on_connection_change(connected)
@@ -0,0 +1 @@
+"""Tests for the Rointe Heaters integration."""
@@ -0,0 +1 @@
+"""Benchmarks for the Rointe Heaters integration."""
@@ -0,0 +1,223 @@
+"""Benchmarks of the Rointe Heaters integration against the fake cloud.
+
+Run with `pytest tests/benchmarks --benchmark -s`. The installation sizes, the
+latency and error rate of the fake cloud and the request rate limit are set with
+the `--benchmark-*` options.
+
+Each installation size is set up from scratch and measured on:
+
+- setup: the first refresh, reading every device with its energy stats.
+- poll: a fast poll, reading only the devices' data.
+- full: a full refresh of the devices, energy stats and installation.
+- command: setting the temperature of a radiator through its climate entity,
+  from the service call to the refreshed state.
+
+Updates report their wall time, fake cloud requests, the longest and total
+time the event loop was blocked and the peak memory allocated while repeating
+them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from functools import partial
+import statistics
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.rointe.const import DOMAIN
+from custom_components.rointe.coordinator import RointeDataUpdateCoordinator
+from custom_components.rointe.scheduler import RointeRequestScheduler
+from homeassistant.components.climate import (
+    ATTR_TEMPERATURE,
+    DOMAIN as CLIMATE_DOMAIN,
+    SERVICE_SET_TEMPERATURE,
+)
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from ..fake_cloud import FakeRointeCloud
+
+pytestmark = pytest.mark.benchmark
+
+COMMAND_SAMPLES = 5
+LOOP_MONITOR_INTERVAL = 0.005
+
+
+@dataclass
+class LoopBlockMonitor:
+    """Measure how long the event loop is blocked between two sleeps."""
+
+    interval: float = LOOP_MONITOR_INTERVAL
+    max_block: float = 0.0
+    total_block: float = 0.0
+    _task: asyncio.Task | None = field(default=None, repr=False)
+
+    async def __aenter__(self) -> LoopBlockMonitor:
+        """Start monitoring."""
+        self._task = asyncio.create_task(self._monitor())
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop monitoring."""
+        self._task.cancel()
+
+    async def _monitor(self) -> None:
+        """Sleep in a loop, recording how late each wakeup is."""
+
+        while True:
+            started_at = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            block = max(time.perf_counter() - started_at - self.interval, 0)
+            self.max_block = max(self.max_block, block)
+            self.total_block += block
+
+
+@dataclass
+class Measurement:
+    """The cost of one benchmarked operation."""
+
+    wall_time: float
+    requests: int
+    max_block: float
+    total_block: float
+    peak_memory: int
+
+    def __str__(self) -> str:
+        """Format the measurement as a report row."""
+        return (
+            f"{self.wall_time * 1000:9.1f} ms {self.requests:6d} req "
+            f"{self.max_block * 1000:7.1f} ms max block "
+            f"{self.total_block * 1000:8.1f} ms blocked "
+            f"{self.peak_memory / 1024:9.1f} KiB peak"
+        )
+
+
+async def measure(
+    cloud: FakeRointeCloud, operation: Callable[[], Awaitable], repeatable: bool = True
+) -> Measurement:
+    """Run an operation, measuring its cost.
+
+    Tracing allocations slows everything down, so repeatable operations are run
+    a second time to measure their memory.
+    """
+
+    requests = cloud.request_count
+
+    async with LoopBlockMonitor() as monitor:
+        started_at = time.perf_counter()
+        await operation()
+        wall_time = time.perf_counter() - started_at
+
+    requests = cloud.request_count - requests
+    peak_memory = 0
+
+    if repeatable:
+        tracemalloc.start()
+
+        try:
+            await operation()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return Measurement(
+        wall_time, requests, monitor.max_block, monitor.total_block, peak_memory
+    )
+
+
+def device_counts(config: pytest.Config) -> list[int]:
+    """Return the installation sizes to benchmark."""
+    return [int(count) for count in config.getoption("--benchmark-devices").split(",")]
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Benchmark each installation size."""
+
+    if "devices" in metafunc.fixturenames:
+        metafunc.parametrize("devices", device_counts(metafunc.config))
+
+
+async def test_benchmark(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    config_entry: MockConfigEntry,
+    pytestconfig: pytest.Config,
+    devices: int,
+) -> None:
+    """Benchmark an installation of `devices` radiators."""
+
+    cloud = FakeRointeCloud(
+        devices=devices,
+        latency=pytestconfig.getoption("--benchmark-latency"),
+        error_rate=pytestconfig.getoption("--benchmark-error-rate"),
+    )
+    cloud.register(aioclient_mock)
+
+    scheduler = RointeRequestScheduler
+    if (rate := pytestconfig.getoption("--benchmark-rate")) is not None:
+        scheduler = partial(RointeRequestScheduler, rate=rate, burst=max(int(rate), 1))
+
+    async def setup() -> None:
+        with patch("custom_components.rointe.hub.RointeRequestScheduler", scheduler):
+            assert await hass.config_entries.async_setup(config_entry.entry_id)
+            await hass.async_block_till_done()
+
+    # Debug mode slows down every callback, skewing the measurements.
+    asyncio.get_running_loop().set_debug(False)
+
+    results = {"setup": await measure(cloud, setup, repeatable=False)}
+
+    coordinator: RointeDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    device_manager = coordinator.device_manager
+
+    results["poll"] = await measure(
+        cloud,
+        partial(
+            device_manager.update,
+            refresh_energy=False,
+            refresh_installation=False,
+            full_read=False,
+        ),
+    )
+    results["full"] = await measure(cloud, device_manager.update)
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        CLIMATE_DOMAIN, DOMAIN, cloud.device_ids[0]
+    )
+    round_trips = []
+
+    for sample in range(COMMAND_SAMPLES):
+
+        async def set_temperature(temperature: float = 21 + sample / 2) -> None:
+            await hass.services.async_call(
+                CLIMATE_DOMAIN,
+                SERVICE_SET_TEMPERATURE,
+                {ATTR_ENTITY_ID: entity_id, ATTR_TEMPERATURE: temperature},
+                blocking=True,
+            )
+
+        round_trips.append(await measure(cloud, set_temperature, repeatable=False))
+
+    report = [
+        f"{devices} devices, {cloud.latency * 1000:.0f} ms latency, "
+        f"{cloud.error_rate:.0%} errors",
+        *(f"  {name:8s}{measurement}" for name, measurement in results.items()),
+        f"  command  {statistics.median(m.wall_time for m in round_trips) * 1000:9.1f}"
+        f" ms median {max(m.wall_time for m in round_trips) * 1000:9.1f} ms max "
+        f"{statistics.median(m.requests for m in round_trips):6.0f} req",
+    ]
+    print("\n" + "\n".join(report))
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,121 @@
+"""Fixtures for the Rointe Heaters tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.rointe.const import (
+    CONF_INSTALLATION,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DOMAIN,
+)
+from homeassistant.core import HomeAssistant
+
+from .fake_cloud import INSTALLATION_ID, FakeRointeCloud
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark options."""
+
+    group = parser.getgroup("rointe benchmarks")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        help="Run the benchmarks in tests/benchmarks.",
+    )
+    group.addoption(
+        "--benchmark-devices",
+        default="1,10,100,500",
+        help="Comma separated installation sizes to benchmark.",
+    )
+    group.addoption(
+        "--benchmark-latency",
+        type=float,
+        default=0.05,
+        help="Latency of each fake cloud request, in seconds.",
+    )
+    group.addoption(
+        "--benchmark-error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of fake cloud requests failing with a 503.",
+    )
+    group.addoption(
+        "--benchmark-rate",
+        type=float,
+        default=None,
+        help="Override the request rate limit, in requests per second.",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip the benchmarks unless requested."""
+
+    if config.getoption("--benchmark"):
+        return
+
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable the custom integration in all tests."""
+
+
+@pytest.fixture
+def fake_cloud(aioclient_mock: AiohttpClientMocker) -> FakeRointeCloud:
+    """Return a fake cloud with a small installation."""
+
+    cloud = FakeRointeCloud()
+    cloud.register(aioclient_mock)
+
+    return cloud
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Return the config entry of the fake installation."""
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Home",
+        unique_id=INSTALLATION_ID,
+        data={
+            CONF_USERNAME: "user@example.com",
+            CONF_PASSWORD: "password",
+            CONF_INSTALLATION: INSTALLATION_ID,
+        },
+    )
+    entry.add_to_hass(hass)
+
+    return entry
+
+
+@pytest.fixture
+async def init_integration(
+    hass: HomeAssistant, fake_cloud: FakeRointeCloud, config_entry: MockConfigEntry
+) -> AsyncGenerator[MockConfigEntry, None]:
+    """Set up the integration against the fake cloud."""
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    yield config_entry
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
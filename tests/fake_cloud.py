@@ -0,0 +1,298 @@
+"""Fake Rointe cloud for tests and benchmarks.
+
+Serves the Firebase auth and database endpoints used by the integration through
+`aioclient_mock`, so the whole integration runs against it unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from datetime import date
+import random
+import re
+from typing import Any
+
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+from rointesdk.settings import AUTH_HOST, AUTH_REFRESH_ENDPOINT, FIREBASE_DEFAULT_URL
+from yarl import URL
+
+from homeassistant.util import dt as dt_util
+
+INSTALLATION_ID = "installation-1"
+LOCAL_ID = "local-id"
+DEVICES_PER_ZONE = 10
+
+DEVICE_PATH = re.compile(r"^/devices/([^/]+)(/data)?\.json$")
+ENERGY_PATH = re.compile(
+    r"^/history_statistics/([^/]+)/daily/(\d{4})/(\d{2})/(\d{2})/energy\.json$"
+)
+
+
+def device_id(index: int) -> str:
+    """Return the ID of the fake device at `index`."""
+    return f"device-{index}"
+
+
+def device_document(index: int, local_id: str = LOCAL_ID) -> dict[str, Any]:
+    """Return the document of a radiator as stored in Firebase."""
+
+    return {
+        "userid": local_id,
+        "serialnumber": f"SN{index:05d}",
+        "firmware": {"firmware_version_device": "1.0"},
+        "data": {
+            "type": "radiator",
+            "product_version": "v2",
+            "name": f"Radiator {index}",
+            "nominal_power": 1000,
+            "power": True,
+            "status": "comfort",
+            "mode": "manual",
+            "temp": 20.0,
+            "temp_calc": 20.0,
+            "temp_probe": 19.5 + index % 4,
+            "comfort": 21.0,
+            "eco": 18.0,
+            "ice": 7.0,
+            "ice_mode": False,
+            "schedule": ["C" * 24] * 7,
+            "last_sync_datetime_app": 1700000000000,
+            "last_sync_datetime_device": 1700000000000,
+        },
+    }
+
+
+class FakeRointeCloud:
+    """A Rointe account with one installation of `devices` radiators.
+
+    Every request waits `latency` seconds and then fails with a 503 with
+    probability `error_rate`. Request kinds listed in `errors` always fail with
+    the given status instead, with the Firebase Auth error of `auth_errors` for a
+    400 of the login or refresh. PATCHes are applied to the stored devices, so later
+    reads return the written values.
+
+    `requests` counts the requests of each kind: login, refresh, installations,
+    firmware, devices, device, device_data, energy, patch and multi_patch.
+    """
+
+    def __init__(
+        self,
+        devices: int = 3,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        base_url: str = FIREBASE_DEFAULT_URL,
+    ) -> None:
+        """Initialize the fake cloud."""
+        self.latency = latency
+        self.error_rate = error_rate
+        self.base_url = base_url
+
+        self.device_ids = [device_id(index) for index in range(devices)]
+        self.documents: dict[str, dict[str, Any]] = {
+            device_id(index): device_document(index) for index in range(devices)
+        }
+
+        # Whether the devices can be queried by owner in one request.
+        self.bulk_read = True
+
+        # Request kind -> status returned instead of a response.
+        self.errors: dict[str, int] = {}
+
+        # Request kind -> message of the Firebase Auth error answered with a 400.
+        self.auth_errors: dict[str, str] = {
+            "login": "INVALID_LOGIN_CREDENTIALS",
+            "refresh": "INVALID_REFRESH_TOKEN",
+        }
+
+        self.requests: Counter[str] = Counter()
+
+        self._random = random.Random(seed)
+        self._base_path = URL(base_url).path.rstrip("/")
+
+    @property
+    def request_count(self) -> int:
+        """Total number of requests received."""
+        return sum(self.requests.values())
+
+    def register(self, aioclient_mock: AiohttpClientMocker) -> None:
+        """Answer the requests to the auth hosts and the database."""
+
+        for host in (AUTH_HOST, AUTH_REFRESH_ENDPOINT, self.base_url):
+            pattern = re.compile(f"^{re.escape(host)}")
+
+            for method in ("get", "post", "patch"):
+                aioclient_mock.request(method, pattern, side_effect=self._async_handle)
+
+    def installation(self) -> dict[str, Any]:
+        """Return the installation, with the devices split in zones."""
+
+        zones: dict[str, Any] = {}
+
+        for start in range(0, len(self.device_ids), DEVICES_PER_ZONE):
+            zones[f"zone-{start // DEVICES_PER_ZONE}"] = {
+                "devices": {
+                    device_id: True
+                    for device_id in self.device_ids[start : start + DEVICES_PER_ZONE]
+                }
+            }
+
+        return {"location": "Home", "userid": LOCAL_ID, "zones": zones}
+
+    def energy_day(self, device_id: str, day: date) -> dict[str, Any]:
+        """Return the hourly energy stats of a device for a day."""
+
+        now = dt_util.now()
+
+        if day > now.date():
+            return {}
+
+        last_hour = now.hour if day == now.date() else 23
+
+        return {
+            f"{hour:02d}0000": {"kw_h": 0.25, "effective_power": 250}
+            for hour in range(last_hour + 1)
+        }
+
+    async def _async_handle(
+        self, method: str, url: URL, data: Any
+    ) -> AiohttpClientMockResponse:
+        """Answer a request."""
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        kind, handler = self._route(method.upper(), url)
+        self.requests[kind] += 1
+
+        if (status := self.errors.get(kind)) is not None or (
+            self.error_rate and self._random.random() < self.error_rate
+        ):
+            body = None
+
+            if status == 400 and kind in self.auth_errors:
+                body = {"error": {"code": 400, "message": self.auth_errors[kind]}}
+
+            return AiohttpClientMockResponse(
+                method, url, status=status or 503, json=body
+            )
+
+        status, body = handler(url, data)
+
+        return AiohttpClientMockResponse(method, url, status=status, json=body)
+
+    def _route(self, method: str, url: URL) -> tuple[str, Any]:
+        """Return the kind and handler of a request."""
+
+        if str(url).startswith(AUTH_REFRESH_ENDPOINT):
+            return "refresh", self._token
+
+        if str(url).startswith(AUTH_HOST):
+            return "login", self._token
+
+        path = url.path.removeprefix(self._base_path)
+
+        if path == "/installations2.json":
+            return "installations", self._get_installations
+
+        if path == "/global_settings.json":
+            return "firmware", self._get_firmware
+
+        if path == "/devices.json":
+            return "devices", self._get_devices
+
+        if path == "/.json" and method == "PATCH":
+            return "multi_patch", self._multi_patch
+
+        if match := DEVICE_PATH.match(path):
+            if method == "PATCH":
+                return "patch", self._patch_device
+
+            return ("device_data" if match[2] else "device"), self._get_device
+
+        if ENERGY_PATH.match(path):
+            return "energy", self._get_energy
+
+        return "unknown", lambda url, data: (404, None)
+
+    def _token(self, url: URL, data: Any) -> tuple[int, Any]:
+        """Answer a login or token refresh."""
+
+        if "refresh_token" in (data or {}):
+            return 200, {
+                "id_token": "id-token",
+                "refresh_token": "refresh-token",
+                "expires_in": "3600",
+                "user_id": LOCAL_ID,
+            }
+
+        return 200, {
+            "idToken": "id-token",
+            "refreshToken": "refresh-token",
+            "expiresIn": "3600",
+            "localId": LOCAL_ID,
+        }
+
+    def _get_installations(self, url: URL, data: Any) -> tuple[int, Any]:
+        """Answer the installations query."""
+        return 200, {INSTALLATION_ID: self.installation()}
+
+    def _get_firmware(self, url: URL, data: Any) -> tuple[int, Any]:
+        """Answer the global settings request."""
+        return 200, {
+            "radiator": {"v2": {"end_user": {"1.0": {"firmware_new_version": "1.1"}}}}
+        }
+
+    def _get_devices(self, url: URL, data: Any) -> tuple[int, Any]:
+        """Answer the devices query by owner."""
+
+        if not self.bulk_read:
+            return 400, None
+
+        return 200, self.documents
+
+    def _get_device(self, url: URL, data: Any) -> tuple[int, Any]:
+        """Answer the read of a device or its data node."""
+
+        match = DEVICE_PATH.match(url.path.removeprefix(self._base_path))
+
+        if (document := self.documents.get(match[1])) is None:
+            return 200, None
+
+        return 200, document["data"] if match[2] else document
+
+    def _patch_device(self, url: URL, data: Any) -> tuple[int, Any]:
+        """Apply a PATCH to the data node of a device."""
+
+        match = DEVICE_PATH.match(url.path.removeprefix(self._base_path))
+
+        if (document := self.documents.get(match[1])) is None or not match[2]:
+            return 400, None
+
+        document["data"].update(data)
+
+        return 200, data
+
+    def _multi_patch(self, url: URL, data: Any) -> tuple[int, Any]:
+        """Apply a multi-path PATCH to the data nodes of several devices."""
+
+        for path, value in data.items():
+            _, device_id, _, key = path.split("/", 3)
+            self.documents[device_id]["data"][key] = value
+
+        return 200, data
+
+    def _get_energy(self, url: URL, data: Any) -> tuple[int, Any]:
+        """Answer the read of a day of energy stats."""
+
+        match = ENERGY_PATH.match(url.path.removeprefix(self._base_path))
+        hours = self.energy_day(match[1], date(*map(int, match.groups()[1:])))
+
+        if limit := url.query.get("limitToLast"):
+            hours = dict(sorted(hours.items())[-int(limit) :])
+
+        return 200, hours or None
@@ -0,0 +1,125 @@
+"""Tests for the Rointe Heaters API client."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from email.utils import format_datetime
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from custom_components.rointe.api import RointeAsyncAPI, _parse_retry_after
+from custom_components.rointe.auth import RointeTokenManager
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+
+from .fake_cloud import FakeRointeCloud, device_id
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("", None),
+        ("120", 120),
+        ("-5", 0),
+        ("not a date", None),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0),
+        # Dates in the -0000 zone are parsed as naive datetimes.
+        ("Wed, 21 Oct 2015 07:28:00 -0000", 0),
+    ],
+)
+def test_parse_retry_after(value: str | None, expected: float | None) -> None:
+    """Test parsing the delays and dates of `Retry-After` headers."""
+    assert _parse_retry_after(value) == expected
+
+
+@pytest.mark.parametrize("usegmt", [True, False])
+def test_parse_retry_after_future_date(usegmt: bool) -> None:
+    """Test a `Retry-After` date is turned into the delay until then."""
+
+    retry_at = dt_util.utcnow() + timedelta(minutes=2)
+    value = format_datetime(retry_at, usegmt=usegmt)
+
+    if not usegmt:
+        value = value.replace("+0000", "-0000")
+
+    assert 110 < _parse_retry_after(value) <= 120
+
+
+@pytest.mark.parametrize("in_progress_values", [True, False])
+async def test_latest_energy_stats_are_complete(
+    hass: HomeAssistant,
+    fake_cloud: FakeRointeCloud,
+    freezer: FrozenDateTimeFactory,
+    in_progress_values: bool,
+) -> None:
+    """Test the latest energy stats are of the newest complete hour."""
+
+    freezer.move_to(dt_util.parse_datetime("2024-03-20 12:45:00-07:00"))
+    energy_day = fake_cloud.energy_day
+
+    def partial_energy_day(device_id: str, day: date) -> dict[str, Any]:
+        hours = energy_day(device_id, day)
+        if not in_progress_values:
+            del hours["120000"]["kw_h"]
+        return hours
+
+    fake_cloud.energy_day = partial_energy_day
+    session = async_get_clientsession(hass)
+    token_manager = RointeTokenManager(hass, session, "user@example.com", "password")
+    rointe_api = RointeAsyncAPI(session, token_manager)
+
+    response = await rointe_api.get_latest_energy_stats(device_id(0))
+
+    assert response.success
+    assert response.data.start == dt_util.parse_datetime("2024-03-20 11:00:00-07:00")
+    assert response.data.kwh == 0.25
+    assert fake_cloud.requests["energy"] == 1
+
+    token_manager.async_stop()
+
+
+@pytest.mark.parametrize(
+    ("now", "missing_hours", "expected_start", "requests"),
+    [
+        # The last complete hour has no values yet, the one before does.
+        ("2024-03-20 12:45:00", {"110000"}, "2024-03-20 10:00:00", 2),
+        # Today has no complete hour yet.
+        ("2024-03-20 00:45:00", set(), "2024-03-19 23:00:00", 2),
+    ],
+)
+async def test_latest_energy_stats_fallback(
+    hass: HomeAssistant,
+    fake_cloud: FakeRointeCloud,
+    freezer: FrozenDateTimeFactory,
+    now: str,
+    missing_hours: set[str],
+    expected_start: str,
+    requests: int,
+) -> None:
+    """Test earlier stats are read when the latest hours have none."""
+
+    freezer.move_to(dt_util.parse_datetime(f"{now}-07:00"))
+    energy_day = fake_cloud.energy_day
+
+    def partial_energy_day(device_id: str, day: date) -> dict[str, Any]:
+        hours = energy_day(device_id, day)
+        for hour in missing_hours & set(hours):
+            del hours[hour]["kw_h"]
+        return hours
+
+    fake_cloud.energy_day = partial_energy_day
+    session = async_get_clientsession(hass)
+    token_manager = RointeTokenManager(hass, session, "user@example.com", "password")
+    rointe_api = RointeAsyncAPI(session, token_manager)
+
+    response = await rointe_api.get_latest_energy_stats(device_id(0))
+
+    assert response.success
+    assert response.data.start == dt_util.parse_datetime(f"{expected_start}-07:00")
+    assert fake_cloud.requests["energy"] == requests
+
+    token_manager.async_stop()
@@ -0,0 +1,236 @@
+"""Tests for the Rointe Heaters authentication token manager."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.rointe.auth import RointeTokenManager
+from custom_components.rointe.const import (
+    AUTH_RETRY_MIN,
+    CONF_PASSWORD,
+    CONF_REFRESH_TOKEN,
+    DOMAIN,
+    TOKEN_REFRESH_MARGIN,
+)
+from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .fake_cloud import FakeRointeCloud
+
+
+def create_token_manager(
+    hass: HomeAssistant, refresh_token: str | None = None
+) -> RointeTokenManager:
+    """Return a token manager for the fake account."""
+
+    return RointeTokenManager(
+        hass,
+        async_get_clientsession(hass),
+        "user@example.com",
+        "password",
+        refresh_token=refresh_token,
+    )
+
+
+async def get_tokens(token_manager: RointeTokenManager, count: int = 10) -> list:
+    """Request the ID token from concurrent callers."""
+    return await asyncio.gather(
+        *(token_manager.async_get_auth_token() for _ in range(count))
+    )
+
+
+async def test_concurrent_callers_share_a_renewal(
+    hass: HomeAssistant, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test concurrent callers without a token share a single refresh."""
+
+    token_manager = create_token_manager(hass, refresh_token="refresh-token")
+
+    assert await get_tokens(token_manager) == ["id-token"] * 10
+    assert fake_cloud.requests == {"refresh": 1}
+
+    token_manager.async_stop()
+
+
+async def test_rejected_password_is_shared_and_cached(
+    hass: HomeAssistant, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test a rejected password is tried once and not retried."""
+
+    fake_cloud.errors["login"] = 400
+    token_manager = create_token_manager(hass)
+
+    assert await get_tokens(token_manager) == [None] * 10
+    assert token_manager.credentials_rejected
+    assert fake_cloud.requests == {"login": 1}
+
+    assert await token_manager.async_get_auth_token() is None
+    assert fake_cloud.requests == {"login": 1}
+
+    # A new password allows logging in again.
+    del fake_cloud.errors["login"]
+    token_manager.async_update_password("new password")
+
+    assert await token_manager.async_get_auth_token() == "id-token"
+    assert not token_manager.credentials_rejected
+
+    token_manager.async_stop()
+
+
+@pytest.mark.parametrize(
+    ("message", "rejected"),
+    [
+        ("INVALID_PASSWORD", True),
+        ("EMAIL_NOT_FOUND", True),
+        ("INVALID_LOGIN_CREDENTIALS", True),
+        (
+            "TOO_MANY_ATTEMPTS_TRY_LATER : Access to this account has been "
+            "temporarily disabled due to many failed login attempts.",
+            False,
+        ),
+        ("USER_DISABLED", False),
+    ],
+)
+async def test_only_credential_errors_reject_the_password(
+    hass: HomeAssistant,
+    fake_cloud: FakeRointeCloud,
+    freezer: FrozenDateTimeFactory,
+    message: str,
+    rejected: bool,
+) -> None:
+    """Test other login errors Firebase answers with a 400 are retried later."""
+
+    fake_cloud.errors["login"] = 400
+    fake_cloud.auth_errors["login"] = message
+    token_manager = create_token_manager(hass)
+
+    assert await token_manager.async_get_auth_token() is None
+    assert token_manager.credentials_rejected is rejected
+
+    del fake_cloud.errors["login"]
+    freezer.tick(AUTH_RETRY_MIN + timedelta(seconds=1))
+
+    token = await token_manager.async_get_auth_token()
+
+    assert token == (None if rejected else "id-token")
+    assert fake_cloud.requests == {"login": 1 if rejected else 2}
+
+    token_manager.async_stop()
+
+
+async def test_revoked_refresh_token_logs_in_once(
+    hass: HomeAssistant, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test concurrent callers with a revoked refresh token share one login."""
+
+    fake_cloud.errors["refresh"] = 400
+    token_manager = create_token_manager(hass, refresh_token="revoked")
+
+    assert await get_tokens(token_manager) == ["id-token"] * 10
+    assert fake_cloud.requests == {"refresh": 1, "login": 1}
+
+    token_manager.async_stop()
+
+
+async def test_failed_renewal_cooldown(
+    hass: HomeAssistant, fake_cloud: FakeRointeCloud, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test no renewal is attempted for a while after one failed."""
+
+    fake_cloud.errors["login"] = 503
+    token_manager = create_token_manager(hass)
+
+    assert await get_tokens(token_manager) == [None] * 10
+    assert await token_manager.async_get_auth_token() is None
+    assert fake_cloud.requests == {"login": 1}
+    assert not token_manager.credentials_rejected
+
+    del fake_cloud.errors["login"]
+    freezer.tick(AUTH_RETRY_MIN + timedelta(seconds=1))
+
+    assert await token_manager.async_get_auth_token() == "id-token"
+    assert fake_cloud.requests == {"login": 2}
+
+    token_manager.async_stop()
+
+
+async def test_scheduled_refresh_retries_with_backoff(
+    hass: HomeAssistant, fake_cloud: FakeRointeCloud, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test a failed proactive refresh is retried once the cooldown ends."""
+
+    token_manager = create_token_manager(hass)
+    assert await token_manager.async_get_auth_token() == "id-token"
+
+    fake_cloud.errors["refresh"] = 503
+    fake_cloud.requests.clear()
+
+    # The token is refreshed ahead of its expiry, but the cloud is down.
+    freezer.tick(timedelta(hours=1) - TOKEN_REFRESH_MARGIN + timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert fake_cloud.requests == {"refresh": 1}
+
+    # The token is still valid, so it's served while the refresh is retried.
+    assert await token_manager.async_get_auth_token() == "id-token"
+
+    del fake_cloud.errors["refresh"]
+    freezer.tick(AUTH_RETRY_MIN + timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert fake_cloud.requests == {"refresh": 2}
+    assert token_manager._token_is_fresh()
+
+    token_manager.async_stop()
+
+
+async def test_rejected_password_starts_reauth(
+    hass: HomeAssistant, fake_cloud: FakeRointeCloud, config_entry: MockConfigEntry
+) -> None:
+    """Test a rejected password asks for a new one and sets the entry up with it."""
+
+    fake_cloud.errors["login"] = 400
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.SETUP_ERROR
+
+    flows = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    assert len(flows) == 1
+    assert flows[0]["context"]["source"] == SOURCE_REAUTH
+    assert flows[0]["step_id"] == "reauth_confirm"
+
+    # Still rejected.
+    result = await hass.config_entries.flow.async_configure(
+        flows[0]["flow_id"], {CONF_PASSWORD: "wrong"}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_auth"}
+
+    del fake_cloud.errors["login"]
+
+    result = await hass.config_entries.flow.async_configure(
+        flows[0]["flow_id"], {CONF_PASSWORD: "new password"}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert config_entry.data[CONF_PASSWORD] == "new password"
+    assert config_entry.data[CONF_REFRESH_TOKEN] == "refresh-token"
+    assert config_entry.state is ConfigEntryState.LOADED
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -0,0 +1,165 @@
+"""Tests for the Rointe Heaters climate entities."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from freezegun import freeze_time
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.rointe.const import DEVICE_UNAVAILABLE_GRACE_PERIOD, DOMAIN
+from homeassistant.components.climate import (
+    ATTR_TEMPERATURE,
+    DOMAIN as CLIMATE_DOMAIN,
+    SERVICE_SET_TEMPERATURE,
+)
+from homeassistant.const import ATTR_ENTITY_ID, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .fake_cloud import FakeRointeCloud
+
+
+def climate_entity_id(hass: HomeAssistant, device_id: str) -> str:
+    """Return the climate entity of a device."""
+    return er.async_get(hass).async_get_entity_id(CLIMATE_DOMAIN, DOMAIN, device_id)
+
+
+async def set_temperature(hass: HomeAssistant, entity_id: str, temperature: float):
+    """Set the target temperature of a climate entity."""
+
+    await hass.services.async_call(
+        CLIMATE_DOMAIN,
+        SERVICE_SET_TEMPERATURE,
+        {ATTR_ENTITY_ID: entity_id, ATTR_TEMPERATURE: temperature},
+        blocking=True,
+    )
+
+
+async def test_set_temperature(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test setting the temperature writes it and re-reads only that radiator."""
+
+    device_id = fake_cloud.device_ids[0]
+    entity_id = climate_entity_id(hass, device_id)
+    fake_cloud.requests.clear()
+
+    await set_temperature(hass, entity_id, 22.4)
+
+    assert fake_cloud.documents[device_id]["data"]["temp"] == 22.5
+    assert hass.states.get(entity_id).attributes[ATTR_TEMPERATURE] == 22.5
+    assert fake_cloud.requests == {"patch": 1, "device_data": 1}
+
+
+async def test_rapid_commands_are_coalesced(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test commands in quick succession are sent as a single write of the last."""
+
+    device_id = fake_cloud.device_ids[0]
+    entity_id = climate_entity_id(hass, device_id)
+    fake_cloud.requests.clear()
+
+    calls = [
+        hass.async_create_task(set_temperature(hass, entity_id, temperature))
+        for temperature in (21.5, 22, 22.5)
+    ]
+    await asyncio.sleep(0.1)
+
+    # The last command is shown right away, before it's written.
+    assert hass.states.get(entity_id).attributes[ATTR_TEMPERATURE] == 22.5
+    assert fake_cloud.requests["patch"] == 0
+
+    await asyncio.gather(*calls)
+
+    assert fake_cloud.requests["patch"] == 1
+    assert fake_cloud.documents[device_id]["data"]["temp"] == 22.5
+
+
+async def test_commands_to_different_radiators_are_not_coalesced(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test coalescing only merges the commands of the same radiator."""
+
+    fake_cloud.requests.clear()
+
+    await asyncio.gather(
+        *(
+            set_temperature(hass, climate_entity_id(hass, device_id), 23)
+            for device_id in fake_cloud.device_ids
+        )
+    )
+
+    assert fake_cloud.requests["patch"] == len(fake_cloud.device_ids)
+
+    for document in fake_cloud.documents.values():
+        assert document["data"]["temp"] == 23
+
+
+async def test_failed_command(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test a command the cloud rejects raises and marks the radiator unavailable."""
+
+    entity_id = climate_entity_id(hass, fake_cloud.device_ids[0])
+    fake_cloud.errors["patch"] = 400
+
+    with pytest.raises(HomeAssistantError):
+        await set_temperature(hass, entity_id, 24)
+
+    await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+
+
+async def test_set_temperature_while_throttled(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test commands are still sent while the cloud throttles the polls."""
+
+    device_id = fake_cloud.device_ids[0]
+    entity_id = climate_entity_id(hass, device_id)
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    coordinator.device_manager.request_scheduler._throttle("get_devices", 120)
+
+    await set_temperature(hass, entity_id, 23)
+
+    assert fake_cloud.documents[device_id]["data"]["temp"] == 23
+    state = hass.states.get(entity_id)
+    assert state.state != STATE_UNAVAILABLE
+    assert state.attributes[ATTR_TEMPERATURE] == 23
+
+
+async def test_unreadable_radiator_grace_period(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test radiators the cloud can't read stay available for a grace period."""
+
+    entity_id = climate_entity_id(hass, fake_cloud.device_ids[0])
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    coordinator.device_manager.request_scheduler.retry_backoff = 0
+
+    for kind in ("devices", "device", "device_data"):
+        fake_cloud.errors[kind] = 503
+
+    # Don't reuse the bulk read of the last poll.
+    coordinator.device_manager.rointe_api._devices_fetched_at = None
+    await coordinator.async_refresh()
+
+    state = hass.states.get(entity_id)
+    assert state.state != STATE_UNAVAILABLE
+    assert state.attributes[ATTR_TEMPERATURE] == 20.0
+
+    with freeze_time(
+        dt_util.utcnow() + DEVICE_UNAVAILABLE_GRACE_PERIOD + timedelta(seconds=1),
+        tick=True,
+    ):
+        coordinator.device_manager.rointe_api._devices_fetched_at = None
+        await coordinator.async_refresh()
+
+    assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
@@ -0,0 +1,216 @@
+"""Tests for the Rointe Heaters data update coordinator."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from datetime import timedelta
+from functools import partial
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.rointe.const import DOMAIN
+from custom_components.rointe.coordinator import (
+    ROINTE_API_REFRESH_INTERVAL,
+    ROINTE_DEVICE_INFO_REFRESH_INTERVAL,
+    ROINTE_MAX_REFRESH_INTERVAL,
+    ROINTE_TRANSITION_REFRESH_INTERVAL,
+    RointeDataUpdateCoordinator,
+)
+from custom_components.rointe.scheduler import RointeRequestScheduler
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.util import dt as dt_util
+
+from .fake_cloud import FakeRointeCloud
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant,
+    fake_cloud: FakeRointeCloud,
+    config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> AsyncGenerator[RointeDataUpdateCoordinator, None]:
+    """Set up the integration with the clock frozen and return its coordinator."""
+
+    freezer.move_to(dt_util.parse_datetime("2024-03-20 12:20:00-07:00"))
+
+    # Without start jitter, polls don't wait for a clock that only moves on ticks.
+    with patch(
+        "custom_components.rointe.hub.RointeRequestScheduler",
+        partial(RointeRequestScheduler, jitter=0),
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    yield hass.data[DOMAIN][config_entry.entry_id]
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def poll(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    coordinator: RointeDataUpdateCoordinator,
+) -> timedelta:
+    """Wait for the next poll and return the interval set after it."""
+
+    freezer.tick(coordinator.update_interval)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    return coordinator.update_interval
+
+
+def stabilize(fake_cloud: FakeRointeCloud) -> None:
+    """Bring every radiator to its target temperature."""
+
+    for document in fake_cloud.documents.values():
+        document["data"]["temp_probe"] = document["data"]["temp"]
+
+
+async def test_polling_backs_off_while_stable(
+    hass: HomeAssistant,
+    fake_cloud: FakeRointeCloud,
+    freezer: FrozenDateTimeFactory,
+    coordinator: RointeDataUpdateCoordinator,
+) -> None:
+    """Test the interval doubles on every poll without changes, up to the maximum."""
+
+    stabilize(fake_cloud)
+    await poll(hass, freezer, coordinator)
+    intervals = [await poll(hass, freezer, coordinator) for _ in range(6)]
+
+    assert intervals == [
+        timedelta(seconds=30),
+        timedelta(minutes=1),
+        timedelta(minutes=2),
+        timedelta(minutes=4),
+        ROINTE_MAX_REFRESH_INTERVAL,
+        ROINTE_MAX_REFRESH_INTERVAL,
+    ]
+
+
+async def test_transitioning_device_caps_the_interval(
+    hass: HomeAssistant,
+    fake_cloud: FakeRointeCloud,
+    freezer: FrozenDateTimeFactory,
+    coordinator: RointeDataUpdateCoordinator,
+) -> None:
+    """Test polling stays at a minute while a radiator heats towards its target."""
+
+    stabilize(fake_cloud)
+    fake_cloud.documents[fake_cloud.device_ids[0]]["data"]["temp_probe"] = 17.0
+
+    intervals = [await poll(hass, freezer, coordinator) for _ in range(6)]
+
+    assert max(intervals) == ROINTE_TRANSITION_REFRESH_INTERVAL
+    assert intervals[-1] == ROINTE_TRANSITION_REFRESH_INTERVAL
+
+
+async def test_command_resets_the_interval(
+    hass: HomeAssistant,
+    fake_cloud: FakeRointeCloud,
+    freezer: FrozenDateTimeFactory,
+    coordinator: RointeDataUpdateCoordinator,
+) -> None:
+    """Test polling goes back to the fastest interval after a command."""
+
+    stabilize(fake_cloud)
+    for _ in range(7):
+        await poll(hass, freezer, coordinator)
+    assert coordinator.update_interval == ROINTE_MAX_REFRESH_INTERVAL
+
+    coordinator.async_note_command()
+
+    assert coordinator.update_interval == ROINTE_API_REFRESH_INTERVAL
+    # It stays there while the command activity window lasts.
+    assert await poll(hass, freezer, coordinator) == ROINTE_API_REFRESH_INTERVAL
+
+
+async def test_schedule_boundary_resets_the_interval(
+    hass: HomeAssistant,
+    fake_cloud: FakeRointeCloud,
+    freezer: FrozenDateTimeFactory,
+    coordinator: RointeDataUpdateCoordinator,
+) -> None:
+    """Test polling is fastest around a schedule change of a radiator in auto mode."""
+
+    stabilize(fake_cloud)
+    for _ in range(7):
+        await poll(hass, freezer, coordinator)
+    assert coordinator.update_interval == ROINTE_MAX_REFRESH_INTERVAL
+
+    # The radiator switches to eco at 13:00 on Wednesdays.
+    data = fake_cloud.documents[fake_cloud.device_ids[0]]["data"]
+    data["mode"] = "auto"
+    data["schedule"] = list(data["schedule"])
+    data["schedule"][2] = "C" * 13 + "E" * 11
+
+    freezer.move_to(dt_util.parse_datetime("2024-03-20 12:58:00-07:00"))
+    coordinator.update_interval = timedelta(seconds=1)
+
+    assert await poll(hass, freezer, coordinator) == ROINTE_API_REFRESH_INTERVAL
+
+
+async def test_device_info_is_read_on_its_own_tier(
+    hass: HomeAssistant,
+    fake_cloud: FakeRointeCloud,
+    freezer: FrozenDateTimeFactory,
+    coordinator: RointeDataUpdateCoordinator,
+) -> None:
+    """Test radiators read one by one get their whole document only when due."""
+
+    device_count = len(fake_cloud.device_ids)
+    fake_cloud.errors["devices"] = 400
+    fake_cloud.requests.clear()
+
+    await poll(hass, freezer, coordinator)
+
+    assert fake_cloud.requests["device_data"] == device_count
+    assert fake_cloud.requests["device"] == 0
+
+    fake_cloud.requests.clear()
+    freezer.tick(ROINTE_DEVICE_INFO_REFRESH_INTERVAL)
+    await poll(hass, freezer, coordinator)
+
+    assert fake_cloud.requests["device_data"] == 0
+    assert fake_cloud.requests["device"] == device_count
+
+
+async def test_only_changed_radiators_are_written(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test a refresh only writes the state of the entities of changed radiators."""
+
+    coordinator = hass.data[DOMAIN][init_integration.entry_id]
+    changed_device_id = fake_cloud.device_ids[1]
+    fake_cloud.documents[changed_device_id]["data"]["temp_probe"] = 23.5
+    # Don't reuse the bulk read of the last poll.
+    coordinator.device_manager.rointe_api._devices_fetched_at = None
+
+    with patch.object(Entity, "async_write_ha_state", autospec=True) as write_state:
+        await coordinator.async_refresh()
+
+    written = {call.args[0].entity_id for call in write_state.call_args_list}
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+
+    for device_id in fake_cloud.device_ids:
+        device = device_registry.async_get_device(identifiers={(DOMAIN, device_id)})
+        entity_ids = {
+            entry.entity_id
+            for entry in er.async_entries_for_device(entity_registry, device.id)
+        }
+
+        if device_id == changed_device_id:
+            assert entity_ids <= written
+        else:
+            assert not entity_ids & written
@@ -0,0 +1,253 @@
+"""Tests for the Rointe Heaters device manager."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import FrozenInstanceError
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.rointe.const import DOMAIN, RointeCommand
+from custom_components.rointe.device_manager import RointeDeviceManager
+from homeassistant.core import HomeAssistant
+
+from .fake_cloud import FakeRointeCloud
+
+
+def get_device_manager(
+    hass: HomeAssistant, entry: MockConfigEntry
+) -> RointeDeviceManager:
+    """Return the device manager of a loaded entry."""
+    return hass.data[DOMAIN][entry.entry_id].device_manager
+
+
+async def fast_poll(device_manager: RointeDeviceManager) -> None:
+    """Read the state of the devices."""
+
+    # Don't reuse the bulk read of the previous poll.
+    device_manager.rointe_api._devices_fetched_at = None
+
+    await device_manager.update(
+        refresh_energy=False, refresh_installation=False, full_read=False
+    )
+
+
+async def test_unchanged_devices_keep_their_state(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test devices whose payload didn't change don't publish a new state."""
+
+    device_manager = get_device_manager(hass, init_integration)
+    device_manager.pop_changed_device_ids()
+    states = dict(device_manager.device_states)
+
+    await fast_poll(device_manager)
+
+    assert device_manager.pop_changed_device_ids() == set()
+    assert all(
+        device_manager.device_states[device_id] is state
+        for device_id, state in states.items()
+    )
+
+
+async def test_sync_timestamps_are_not_changes(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test a payload differing only in its sync timestamps isn't a change."""
+
+    device_manager = get_device_manager(hass, init_integration)
+    device_manager.pop_changed_device_ids()
+
+    for document in fake_cloud.documents.values():
+        document["data"]["last_sync_datetime_app"] += 60000
+        document["data"]["last_sync_datetime_device"] += 60000
+
+    await fast_poll(device_manager)
+
+    assert device_manager.pop_changed_device_ids() == set()
+
+
+async def test_changed_device_publishes_a_new_state(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test only the device whose payload changed gets a new state version."""
+
+    device_manager = get_device_manager(hass, init_integration)
+    device_manager.pop_changed_device_ids()
+    device_id = fake_cloud.device_ids[1]
+    state = device_manager.device_states[device_id]
+
+    fake_cloud.documents[device_id]["data"]["temp_probe"] = 23.5
+
+    await fast_poll(device_manager)
+
+    assert device_manager.pop_changed_device_ids() == {device_id}
+
+    new_state = device_manager.device_states[device_id]
+    assert new_state.temp_probe == 23.5
+    assert new_state.version > state.version
+
+
+async def test_published_states_are_immutable(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test a command changes the device without altering its published state."""
+
+    device_manager = get_device_manager(hass, init_integration)
+    device = device_manager.rointe_devices[fake_cloud.device_ids[0]]
+    state = device_manager.device_states[device.id]
+
+    with pytest.raises(FrozenInstanceError):
+        state.temp = 25
+
+    command = device_manager.queue_command(device, RointeCommand.SET_TEMP, 25)
+
+    # The optimistic state is published as a new state.
+    assert device.temp == 25
+    assert state.temp == 20
+    assert device_manager.device_states[device.id].temp == 25
+
+    assert await command
+
+
+async def test_bulk_command_replaces_queued_commands(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test a queued command isn't sent after a bulk command overriding it."""
+
+    device_manager = get_device_manager(hass, init_integration)
+    devices = list(device_manager.rointe_devices.values())
+    fake_cloud.requests.clear()
+
+    queued = device_manager.queue_command(devices[0], RointeCommand.SET_TEMP, 25)
+    results = await device_manager.send_bulk_command(
+        devices, RointeCommand.SET_TEMP, 19
+    )
+
+    assert all(results.values())
+    assert await queued
+
+    await asyncio.sleep(0.1)
+
+    assert fake_cloud.requests == {"multi_patch": 1}
+    assert all(
+        document["data"]["temp"] == 19 for document in fake_cloud.documents.values()
+    )
+
+
+async def test_throttled_poll_keeps_bulk_reads_and_energy(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test a poll held back by throttling doesn't drop any state."""
+
+    device_manager = get_device_manager(hass, init_integration)
+    energy_data = {
+        device_id: device.energy_data
+        for device_id, device in device_manager.rointe_devices.items()
+    }
+    assert all(energy_data.values())
+
+    device_manager.request_scheduler._throttle("get_devices", 120)
+    fake_cloud.requests.clear()
+
+    await device_manager.update(
+        refresh_energy=True, refresh_installation=False, full_read=False
+    )
+
+    assert not fake_cloud.requests
+    assert device_manager._bulk_read
+    assert all(
+        device.energy_data is energy_data[device_id]
+        for device_id, device in device_manager.rointe_devices.items()
+    )
+
+
+async def test_devices_are_read_in_bulk(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test a poll reads all devices in a single request."""
+
+    device_manager = get_device_manager(hass, init_integration)
+    fake_cloud.requests.clear()
+
+    await fast_poll(device_manager)
+
+    assert fake_cloud.requests == {"devices": 1}
+
+
+async def test_rejected_bulk_read_falls_back_for_good(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test devices are read one by one once the cloud rejects the bulk query."""
+
+    device_manager = get_device_manager(hass, init_integration)
+    fake_cloud.errors["devices"] = 400
+    fake_cloud.requests.clear()
+
+    await fast_poll(device_manager)
+
+    assert fake_cloud.requests == {"devices": 1, "device_data": 3}
+    assert not device_manager._bulk_read
+
+    fake_cloud.requests.clear()
+
+    await fast_poll(device_manager)
+
+    assert fake_cloud.requests == {"device_data": 3}
+
+
+async def test_failed_bulk_read_falls_back_once(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test devices are read one by one only while the bulk read fails."""
+
+    device_manager = get_device_manager(hass, init_integration)
+    fake_cloud.errors["devices"] = 503
+    fake_cloud.requests.clear()
+
+    await fast_poll(device_manager)
+
+    assert fake_cloud.requests["device_data"] == 3
+    assert device_manager._bulk_read
+
+    del fake_cloud.errors["devices"]
+    fake_cloud.requests.clear()
+
+    await fast_poll(device_manager)
+
+    assert fake_cloud.requests == {"devices": 1}
+
+
+async def test_bulk_reads_are_shared(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test polls share recent bulk reads until a command is sent."""
+
+    rointe_api = get_device_manager(hass, init_integration).rointe_api
+    device_ids = fake_cloud.device_ids
+    rointe_api._devices_fetched_at = None
+    fake_cloud.requests.clear()
+
+    responses = await asyncio.gather(
+        rointe_api.get_devices(device_ids, shared=True),
+        rointe_api.get_devices(device_ids[:1], shared=True),
+    )
+
+    assert [set(response.data) for response in responses] == [
+        set(device_ids),
+        set(device_ids[:1]),
+    ]
+    assert (await rointe_api.get_devices(device_ids, shared=True)).success
+    assert fake_cloud.requests == {"devices": 1}
+
+    # Reads that aren't shared, like the refresh after a command, always reach
+    # the cloud.
+    assert (await rointe_api.get_devices(device_ids)).success
+    assert fake_cloud.requests == {"devices": 2}
+
+    await rointe_api.set_device_temp(
+        get_device_manager(hass, init_integration).rointe_devices[device_ids[0]], 22
+    )
+    assert (await rointe_api.get_devices(device_ids, shared=True)).success
+    assert fake_cloud.requests == {"devices": 3, "patch": 1}
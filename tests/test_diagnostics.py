@@ -0,0 +1,38 @@
+"""Tests for the Rointe Heaters diagnostics."""
+
+from __future__ import annotations
+
+import json
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.rointe.diagnostics import async_get_config_entry_diagnostics
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+
+from .fake_cloud import INSTALLATION_ID, LOCAL_ID, FakeRointeCloud
+
+
+async def test_diagnostics_are_redacted(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test the diagnostics don't contain the account or device identifiers."""
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, init_integration)
+
+    assert diagnostics["entry"]["data"] == {
+        key: REDACTED for key in init_integration.data
+    }
+    assert diagnostics["entry"]["unique_id"] == REDACTED
+    assert len(diagnostics["devices"]) == len(fake_cloud.device_ids)
+    assert diagnostics["devices"][0]["payload"]["data"]["temp"] == 20.0
+
+    dump = json.dumps(diagnostics, default=str)
+
+    for secret in (
+        INSTALLATION_ID,
+        LOCAL_ID,
+        "user@example.com",
+        *fake_cloud.device_ids,
+    ):
+        assert f'"{secret}"' not in dump
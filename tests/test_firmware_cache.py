@@ -0,0 +1,35 @@
+"""Tests for the Rointe Heaters firmware map cache."""
+
+from __future__ import annotations
+
+from rointesdk.model import RointeProduct
+
+from custom_components.rointe.api import RointeAsyncAPI
+from custom_components.rointe.auth import RointeTokenManager
+from custom_components.rointe.firmware_cache import RointeFirmwareCache
+from custom_components.rointe.scheduler import RointeRequestScheduler
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .fake_cloud import FakeRointeCloud
+
+
+async def test_refresh_goes_through_the_scheduler(
+    hass: HomeAssistant, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test the firmware map is fetched by the scheduler and held back with it."""
+
+    session = async_get_clientsession(hass)
+    token_manager = RointeTokenManager(hass, session, "user@example.com", "password")
+    scheduler = RointeRequestScheduler(jitter=0)
+    firmware_cache = RointeFirmwareCache(
+        hass, RointeAsyncAPI(session, token_manager), scheduler
+    )
+
+    firmware_map = await firmware_cache.async_get_firmware_map()
+
+    assert firmware_map[RointeProduct.RADIATOR_V2] == {"1.0": "1.1"}
+    assert scheduler.metrics.endpoints["get_latest_firmware"].requests == 1
+    assert fake_cloud.requests["firmware"] == 1
+
+    token_manager.async_stop()
@@ -0,0 +1,92 @@
+"""Tests for the Rointe Heaters account hub."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.rointe.const import (
+    CONF_ENERGY_REFRESH_INTERVAL,
+    CONF_FIRMWARE_CACHE_TTL,
+    CONF_INSTALLATION,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_STREAMING,
+    DOMAIN,
+)
+from custom_components.rointe.hub import async_acquire_hub, async_release_hub
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+
+def add_installation(
+    hass: HomeAssistant, config_entry: MockConfigEntry, installation_id: str
+) -> MockConfigEntry:
+    """Add an entry for another installation of the same account."""
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=installation_id,
+        data={**config_entry.data, CONF_INSTALLATION: installation_id},
+    )
+    entry.add_to_hass(hass)
+
+    return entry
+
+
+async def test_entries_of_an_account_share_its_hub(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test the entries of an account share a hub using the latest options."""
+
+    other_entry = add_installation(hass, config_entry, "installation-2")
+
+    hub = async_acquire_hub(hass, config_entry)
+    assert async_acquire_hub(hass, other_entry) is hub
+
+    # Reloading an entry with new options applies them to the shared hub.
+    async_release_hub(hass, other_entry)
+    hass.config_entries.async_update_entry(
+        other_entry,
+        options={CONF_FIRMWARE_CACHE_TTL: 6, CONF_MAX_CONCURRENT_REQUESTS: 2},
+    )
+
+    assert async_acquire_hub(hass, other_entry) is hub
+    assert hub.firmware_cache.ttl == timedelta(hours=6)
+    assert hub.request_scheduler.max_concurrent == 2
+
+    async_release_hub(hass, config_entry)
+    async_release_hub(hass, other_entry)
+
+    assert async_acquire_hub(hass, config_entry) is not hub
+    async_release_hub(hass, config_entry)
+
+
+async def test_options_flow_shares_account_options(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Test the hub options are saved to every entry of the account."""
+
+    other_entry = add_installation(hass, config_entry, "installation-2")
+    hass.config_entries.async_update_entry(
+        other_entry, options={CONF_ENERGY_REFRESH_INTERVAL: 30}
+    )
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_FIRMWARE_CACHE_TTL: 12,
+            CONF_ENERGY_REFRESH_INTERVAL: 5,
+            CONF_MAX_CONCURRENT_REQUESTS: 4,
+            CONF_STREAMING: True,
+        },
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert config_entry.options[CONF_MAX_CONCURRENT_REQUESTS] == 4
+    assert other_entry.options == {
+        CONF_ENERGY_REFRESH_INTERVAL: 30,
+        CONF_FIRMWARE_CACHE_TTL: 12,
+        CONF_MAX_CONCURRENT_REQUESTS: 4,
+    }
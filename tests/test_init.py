@@ -0,0 +1,97 @@
+"""Tests for the setup of the Rointe Heaters integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.rointe.const import DOMAIN
+from custom_components.rointe.snapshot import STORAGE_KEY, STORAGE_VERSION
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from .fake_cloud import FakeRointeCloud
+
+
+async def test_setup_and_unload(
+    hass: HomeAssistant, fake_cloud: FakeRointeCloud, config_entry: MockConfigEntry
+) -> None:
+    """Test the entry creates a climate entity per radiator and unloads."""
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.LOADED
+
+    entity_registry = er.async_get(hass)
+
+    for device_id in fake_cloud.device_ids:
+        entity_id = entity_registry.async_get_entity_id("climate", DOMAIN, device_id)
+        assert hass.states.get(entity_id).attributes["temperature"] == 20.0
+
+    # One login, then the devices are read in a single request.
+    assert fake_cloud.requests["login"] == 1
+    assert fake_cloud.requests["devices"] == 1
+    assert fake_cloud.requests["device"] == 0
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.NOT_LOADED
+
+
+async def test_setup_retries_when_cloud_is_down(
+    hass: HomeAssistant, fake_cloud: FakeRointeCloud, config_entry: MockConfigEntry
+) -> None:
+    """Test the entry setup is retried when the login fails."""
+
+    fake_cloud.errors["login"] = 503
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.SETUP_RETRY
+
+
+async def test_setup_from_snapshot(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    fake_cloud: FakeRointeCloud,
+    config_entry: MockConfigEntry,
+) -> None:
+    """Test a stored snapshot creates the entities while the cloud is down."""
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    snapshot = hass.data[DOMAIN][config_entry.entry_id].device_manager.snapshot()
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    hass_storage[f"{STORAGE_KEY}.{config_entry.entry_id}"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{STORAGE_KEY}.{config_entry.entry_id}",
+        "data": snapshot,
+    }
+    # The cloud no longer answers, and its radiators moved on.
+    for kind in ("login", "refresh", "installations", "devices", "device", "energy"):
+        fake_cloud.errors[kind] = 503
+    for document in fake_cloud.documents.values():
+        document["data"]["temp"] = 25.0
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.LOADED
+
+    entity_registry = er.async_get(hass)
+
+    for device_id in fake_cloud.device_ids:
+        entity_id = entity_registry.async_get_entity_id("climate", DOMAIN, device_id)
+        assert hass.states.get(entity_id).attributes["temperature"] == 20.0
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
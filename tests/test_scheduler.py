@@ -0,0 +1,184 @@
+"""Tests for the Rointe Heaters request scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+
+from rointesdk.rointe_api import ApiResponse
+
+from custom_components.rointe.scheduler import RointeRequestScheduler
+
+
+async def succeed() -> ApiResponse:
+    """Return a successful response."""
+    return ApiResponse(True, None, None)
+
+
+class GatedRequest:
+    """A request that completes once released, recording its order."""
+
+    def __init__(self, name: str, order: list[str]) -> None:
+        """Initialize the request."""
+        self.name = name
+        self.order = order
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> ApiResponse:
+        """Wait until released."""
+        self.order.append(self.name)
+        self.started.set()
+        await self.release.wait()
+        return ApiResponse(True, None, None)
+
+
+async def test_concurrency_is_bounded() -> None:
+    """Test no more than `max_concurrent` requests run at once."""
+
+    scheduler = RointeRequestScheduler(max_concurrent=2, jitter=0)
+    order: list[str] = []
+    requests = [GatedRequest(str(index), order) for index in range(3)]
+
+    tasks = [
+        asyncio.create_task(scheduler.run(request, "request")) for request in requests
+    ]
+    await asyncio.sleep(0.01)
+
+    assert order == ["0", "1"]
+
+    requests[0].release.set()
+    await requests[2].started.wait()
+
+    for request in requests:
+        request.release.set()
+
+    assert all(response.success for response in await asyncio.gather(*tasks))
+
+
+async def test_priority_requests_go_first() -> None:
+    """Test commands overtake the queued polls."""
+
+    scheduler = RointeRequestScheduler(max_concurrent=1, jitter=0)
+    order: list[str] = []
+    first = GatedRequest("first", order)
+    poll = GatedRequest("poll", order)
+    command = GatedRequest("command", order)
+
+    tasks = [asyncio.create_task(scheduler.run(first, "first"))]
+    await first.started.wait()
+
+    tasks.append(asyncio.create_task(scheduler.run(poll, "poll")))
+    await asyncio.sleep(0.01)
+    tasks.append(asyncio.create_task(scheduler.run(command, "command", priority=True)))
+    await asyncio.sleep(0.01)
+
+    for request in (first, poll, command):
+        request.release.set()
+
+    await asyncio.gather(*tasks)
+
+    assert order == ["first", "command", "poll"]
+
+
+async def test_cancelled_priority_request_releases_polls() -> None:
+    """Test a command cancelled while queued doesn't hold back the polls."""
+
+    scheduler = RointeRequestScheduler(jitter=0, rate=1, burst=1)
+
+    # Use up the only token, so the command waits for the bucket to refill.
+    await scheduler.run(succeed, "first")
+
+    command = asyncio.create_task(scheduler.run(succeed, "command", priority=True))
+    await asyncio.sleep(0.01)
+    poll = asyncio.create_task(scheduler.run(succeed, "poll"))
+    await asyncio.sleep(0.01)
+
+    command.cancel()
+
+    async with asyncio.timeout(3):
+        assert (await poll).success
+
+
+async def test_rate_limit() -> None:
+    """Test requests beyond the burst wait for the bucket to refill."""
+
+    scheduler = RointeRequestScheduler(jitter=0, rate=20, burst=2)
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+
+    await asyncio.gather(*(scheduler.run(succeed, "request") for _ in range(4)))
+
+    # Two requests over the burst, at 20 per second.
+    assert loop.time() - started_at >= 0.09
+
+
+async def test_timeout() -> None:
+    """Test a request taking too long resolves to a failed response."""
+
+    scheduler = RointeRequestScheduler(jitter=0, timeout=0.01)
+
+    async def hang() -> ApiResponse:
+        await asyncio.sleep(1)
+
+    response = await scheduler.run(hang, "get_device")
+
+    assert not response.success
+    assert response.error_message == "get_device timed out"
+
+
+async def test_transient_errors_are_retried() -> None:
+    """Test transient errors are retried, and other errors aren't."""
+
+    scheduler = RointeRequestScheduler(jitter=0, retry_backoff=0)
+    responses = [
+        ApiResponse(False, None, "get_device() returned 503"),
+        ApiResponse(True, {}, None),
+    ]
+
+    async def request() -> ApiResponse:
+        return responses.pop(0)
+
+    assert (await scheduler.run(request, "get_device", retries=1)).success
+
+    responses = [
+        ApiResponse(False, None, "get_device() returned 404"),
+        ApiResponse(True, {}, None),
+    ]
+
+    assert not (await scheduler.run(request, "get_device", retries=1)).success
+    assert len(responses) == 1
+
+
+async def test_throttled_requests_hold_back_the_next() -> None:
+    """Test requests aren't sent while the cloud throttles them."""
+
+    scheduler = RointeRequestScheduler(jitter=0)
+    sent: list[str] = []
+
+    async def throttled() -> ApiResponse:
+        sent.append("throttled")
+        return ApiResponse(False, 120, "get_device() returned 429")
+
+    async def request() -> ApiResponse:
+        sent.append("request")
+        return ApiResponse(True, None, None)
+
+    assert not (await scheduler.run(throttled, "get_device", retries=2)).success
+    assert 119 < scheduler.throttle_remaining <= 120
+
+    response = await scheduler.run(request, "get_device")
+
+    assert not response.success
+    assert response.error_message == "get_device held back while throttled"
+    assert sent == ["throttled"]
+    assert scheduler.throttled == 1
+
+
+async def test_priority_requests_are_sent_while_throttled() -> None:
+    """Test commands aren't held back while the cloud throttles requests."""
+
+    scheduler = RointeRequestScheduler(jitter=0)
+    scheduler._throttle("get_device", 120)
+
+    assert (await scheduler.run(succeed, "set_device_temp", priority=True)).success
+    assert not (await scheduler.run(succeed, "get_device")).success
@@ -0,0 +1,49 @@
+"""Tests for the Rointe Heaters services."""
+
+from __future__ import annotations
+
+import asyncio
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.rointe.const import DOMAIN
+from custom_components.rointe.services import SERVICE_SET_TEMPERATURE_BULK
+from homeassistant.components.climate import ATTR_TEMPERATURE
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+
+from .fake_cloud import FakeRointeCloud
+from .test_climate import climate_entity_id
+
+
+async def test_set_temperature_bulk(
+    hass: HomeAssistant, init_integration: MockConfigEntry, fake_cloud: FakeRointeCloud
+) -> None:
+    """Test a bulk command is shown right away, then written and read in bulk."""
+
+    entity_ids = [
+        climate_entity_id(hass, device_id) for device_id in fake_cloud.device_ids
+    ]
+    fake_cloud.requests.clear()
+    fake_cloud.latency = 0.05
+
+    call = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_TEMPERATURE_BULK,
+            {ATTR_ENTITY_ID: entity_ids, ATTR_TEMPERATURE: 24},
+            blocking=True,
+        )
+    )
+    await asyncio.sleep(0.01)
+
+    # The optimistic state is shown before the cloud is written.
+    assert not fake_cloud.requests
+    for entity_id in entity_ids:
+        assert hass.states.get(entity_id).attributes[ATTR_TEMPERATURE] == 24
+
+    await call
+
+    assert fake_cloud.requests == {"multi_patch": 1, "devices": 1}
+    for document in fake_cloud.documents.values():
+        assert document["data"]["temp"] == 24
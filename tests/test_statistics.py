@@ -0,0 +1,158 @@
+"""Tests for the Rointe Heaters energy statistics importer."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+from freezegun import freeze_time
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.rointe import statistics
+from custom_components.rointe.const import DOMAIN, STATISTICS_IMPORT_INTERVAL
+from custom_components.rointe.statistics import (
+    RointeStatisticsImporter,
+    energy_statistic_id,
+)
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .fake_cloud import FakeRointeCloud
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Recorder, enable_custom_integrations: None
+) -> None:
+    """Set up the recorder before enabling the custom integration."""
+
+
+async def get_statistics(hass: HomeAssistant, device_id: str) -> list[dict]:
+    """Return the hourly energy statistics of a device."""
+
+    statistic_id = energy_statistic_id(device_id)
+    stats = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        dt_util.utc_from_timestamp(0),
+        None,
+        {statistic_id},
+        "hour",
+        None,
+        {"state", "sum"},
+    )
+
+    return stats[statistic_id]
+
+
+def fail_energy_day(fake_cloud: FakeRointeCloud, day: date) -> None:
+    """Make the reads of a day of energy stats fail."""
+
+    get_energy = fake_cloud._get_energy
+
+    def failing_get_energy(url, data) -> tuple[int, Any]:
+        if url.path.endswith(f"{day:%Y/%m/%d}/energy.json"):
+            return 503, None
+        return get_energy(url, data)
+
+    fake_cloud._get_energy = failing_get_energy
+
+
+async def test_recent_hours_are_reimported(
+    hass: HomeAssistant,
+    fake_cloud: FakeRointeCloud,
+    config_entry: MockConfigEntry,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test late hours are corrected and days that can't be read are skipped."""
+
+    now = dt_util.parse_datetime("2024-03-20 12:45:00-07:00")
+    today = now.date()
+    monkeypatch.setattr(statistics, "STATISTICS_BACKFILL_DAYS", 2)
+    device_id = fake_cloud.device_ids[0]
+
+    # The clock keeps ticking, or the request scheduler would never wake up.
+    with freeze_time(now, tick=True):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        # The first import runs in the background.
+        await asyncio.gather(*config_entry._background_tasks)
+        await async_wait_recording_done(hass)
+
+        # Two days and the complete hours of today.
+        rows = await get_statistics(hass, device_id)
+        assert len(rows) == 60
+        assert rows[-1]["sum"] == pytest.approx(15.0)
+
+    # Today's consumption is corrected and yesterday can't be read.
+    energy_day = fake_cloud.energy_day
+
+    def corrected_energy_day(device_id: str, day: date) -> dict[str, Any]:
+        hours = energy_day(device_id, day)
+        if day == today:
+            for stats in hours.values():
+                stats["kw_h"] = 0.5
+        return hours
+
+    fake_cloud.energy_day = corrected_energy_day
+    fail_energy_day(fake_cloud, today - timedelta(days=1))
+
+    with freeze_time(now + STATISTICS_IMPORT_INTERVAL, tick=True):
+        await RointeStatisticsImporter(
+            hass, hass.data[DOMAIN][config_entry.entry_id].device_manager
+        ).async_import()
+        await async_wait_recording_done(hass)
+
+        rows = await get_statistics(hass, device_id)
+        assert len(rows) == 61
+        # Yesterday's hours are kept, and the 13 hours of today overwritten.
+        assert rows[47]["state"] == pytest.approx(0.25)
+        assert rows[47]["sum"] == pytest.approx(12.0)
+        assert rows[-1]["state"] == pytest.approx(0.5)
+        assert rows[-1]["sum"] == pytest.approx(18.5)
+
+        assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_import_stops_at_unreadable_day(
+    hass: HomeAssistant,
+    fake_cloud: FakeRointeCloud,
+    config_entry: MockConfigEntry,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a day never imported that can't be read is imported on the next run."""
+
+    now = dt_util.parse_datetime("2024-03-20 12:45:00-07:00")
+    monkeypatch.setattr(statistics, "STATISTICS_BACKFILL_DAYS", 2)
+    device_id = fake_cloud.device_ids[0]
+    get_energy = fake_cloud._get_energy
+    fail_energy_day(fake_cloud, now.date() - timedelta(days=1))
+
+    with freeze_time(now, tick=True):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await asyncio.gather(*config_entry._background_tasks)
+        await async_wait_recording_done(hass)
+
+        # Only the day before yesterday.
+        rows = await get_statistics(hass, device_id)
+        assert len(rows) == 24
+        assert rows[-1]["sum"] == pytest.approx(6.0)
+
+        fake_cloud._get_energy = get_energy
+
+        await RointeStatisticsImporter(
+            hass, hass.data[DOMAIN][config_entry.entry_id].device_manager
+        ).async_import()
+        await async_wait_recording_done(hass)
+
+        rows = await get_statistics(hass, device_id)
+        assert len(rows) == 60
+        assert rows[-1]["sum"] == pytest.approx(15.0)
+
+        assert await hass.config_entries.async_unload(config_entry.entry_id)
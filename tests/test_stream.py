@@ -0,0 +1,153 @@
+"""Tests for the Rointe Heaters device event stream."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+from rointesdk.settings import FIREBASE_DEFAULT_URL
+
+from custom_components.rointe.const import STREAM_MAX_DEVICES
+from custom_components.rointe.stream import RointeDeviceStream
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+DEVICE_ID = "device-0"
+STREAM_URL = f"{FIREBASE_DEFAULT_URL}/devices/{DEVICE_ID}/data.json"
+
+
+def sse(event: str, data: Any) -> bytes:
+    """Return a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+class StreamListener:
+    """Collect the events and connection changes of a stream."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the listener."""
+        self.events: list[tuple[str, str, str, Any]] = []
+        self.connection_changes: list[bool] = []
+        self.stream = RointeDeviceStream(
+            hass,
+            SimpleNamespace(
+                base_url=FIREBASE_DEFAULT_URL,
+                async_get_auth_token=AsyncMock(return_value="id-token"),
+            ),
+            self.on_event,
+            self.connection_changes.append,
+            session=async_get_clientsession(hass),
+        )
+
+    def on_event(self, device_id: str, event: str, path: str, data: Any) -> None:
+        """Record an event."""
+        self.events.append((device_id, event, path, data))
+
+
+async def test_events_are_forwarded(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test put and patch events are forwarded and keep-alives ignored."""
+
+    aioclient_mock.get(
+        STREAM_URL,
+        content=sse("put", {"path": "/", "data": {"temp": 20}})
+        + sse("keep-alive", None)
+        + sse("patch", {"path": "/", "data": {"temp": 21}}),
+    )
+    listener = StreamListener(hass)
+
+    listener.stream.async_track_devices([DEVICE_ID])
+    await asyncio.sleep(0.01)
+    listener.stream.async_stop()
+
+    assert listener.events == [
+        (DEVICE_ID, "put", "/", {"temp": 20}),
+        (DEVICE_ID, "patch", "/", {"temp": 21}),
+    ]
+    assert listener.connection_changes == [True, False]
+
+
+async def test_malformed_events_are_skipped(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test malformed events don't end the stream."""
+
+    aioclient_mock.get(
+        STREAM_URL,
+        content=b"event: put\ndata: \xff\xfe\n\n"
+        + b"event: put\ndata: {not json\n\n"
+        + sse("put", {"data": {"temp": 20}})
+        + sse("put", ["path", "data"])
+        + sse("patch", {"path": "/", "data": {"temp": 21}}),
+    )
+    listener = StreamListener(hass)
+
+    listener.stream.async_track_devices([DEVICE_ID])
+    await asyncio.sleep(0.01)
+    listener.stream.async_stop()
+
+    assert listener.events == [(DEVICE_ID, "patch", "/", {"temp": 21})]
+
+
+async def test_failing_event_reconnects(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test an event that can't be applied reopens the stream."""
+
+    aioclient_mock.get(STREAM_URL, content=sse("put", {"path": "/", "data": {}}))
+    listener = StreamListener(hass)
+
+    def fail(*args: Any) -> None:
+        raise KeyError("temp")
+
+    listener.stream._on_event = fail
+
+    with patch("custom_components.rointe.stream.STREAM_RETRY_MIN", 0.01):
+        listener.stream.async_track_devices([DEVICE_ID])
+        await asyncio.sleep(0.05)
+        listener.stream.async_stop()
+
+    assert aioclient_mock.call_count >= 2
+    assert listener.connection_changes[:2] == [True, False]
+
+
+async def test_too_many_devices_are_not_streamed(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+) -> None:
+    """Test installations with more than `STREAM_MAX_DEVICES` devices are polled."""
+
+    listener = StreamListener(hass)
+
+    listener.stream.async_track_devices(
+        [f"device-{index}" for index in range(STREAM_MAX_DEVICES + 1)]
+    )
+    await asyncio.sleep(0.01)
+
+    assert not listener.stream._tasks
+    assert not listener.stream.connected
+    assert aioclient_mock.call_count == 0
+
+
+async def test_streams_have_their_own_connections(hass: HomeAssistant) -> None:
+    """Test the streams don't use the connection pool of the shared session."""
+
+    stream = RointeDeviceStream(
+        hass, SimpleNamespace(), lambda *args: None, lambda connected: None
+    )
+    session = stream.session
+
+    assert session is not async_get_clientsession(hass)
+    assert session.connector is not async_get_clientsession(hass).connector
+    assert session.connector.limit == STREAM_MAX_DEVICES
+
+    stream.async_stop()
+    await hass.async_block_till_done()
+
+    assert session.closed